@@ -1,9 +1,19 @@
+import os
+import sys
 import matplotlib.pyplot as plt
 
-# Data for comparison
-instances = ['A-n32-k5', 'A-n45-k6', 'B-n50-k7']
-algorithm1 = [784, 1325, 2048]  # Total distance by Algorithm 1
-algorithm2 = [800, 1350, 2100]  # Total distance by Algorithm 2
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from template_code.benchmark import latest_results, solver_summaries
+
+# Data for comparison: benchmark results (python -m template_code.benchmark) of two solvers,
+# by default the latest results
+if len(sys.argv) not in (3, 4):
+    sys.exit("Usage: python Gap.py SOLVER1 SOLVER2 [RESULTS.json]")
+algorithm1_name, algorithm2_name = sys.argv[1:3]
+instances, (summary1, summary2) = solver_summaries(latest_results(sys.argv[3] if len(sys.argv) > 3 else None),
+                                                   [algorithm1_name, algorithm2_name])
+algorithm1 = [summary1[i]['cost_mean'] for i in instances]  # Total distance by Algorithm 1
+algorithm2 = [summary2[i]['cost_mean'] for i in instances]  # Total distance by Algorithm 2
 
 # Calculate Gap (%)
 gap_percentage = [
@@ -16,7 +26,7 @@ plt.figure(figsize=(8, 6))
 plt.plot(instances, gap_percentage, marker='o', linestyle='-', color='blue', label='Gap (%)')
 
 # Add titles and labels
-plt.title('Performance Gap Between Algorithms', fontsize=14)
+plt.title(f'Performance Gap Between Algorithms ({algorithm2_name} vs {algorithm1_name})', fontsize=14)
 plt.xlabel('Instances', fontsize=12)
 plt.ylabel('Gap (%)', fontsize=12)
 plt.grid(True, linestyle='--', alpha=0.6)
@@ -1,14 +1,24 @@
+import os
+import sys
 import matplotlib.pyplot as plt
 
-# Data for comparison
-instances = ['A-n32-k5', 'A-n45-k6', 'B-n50-k7']
-algorithm1 = [784, 1325, 2048]
-algorithm2 = [800, 1350, 2100]
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from template_code.benchmark import latest_results, solver_summaries
+
+# Data for comparison: benchmark results (python -m template_code.benchmark) of two solvers,
+# by default the latest results
+if len(sys.argv) not in (3, 4):
+    sys.exit("Usage: python comparaison.py SOLVER1 SOLVER2 [RESULTS.json]")
+algorithm1_name, algorithm2_name = sys.argv[1:3]
+instances, (summary1, summary2) = solver_summaries(latest_results(sys.argv[3] if len(sys.argv) > 3 else None),
+                                                   [algorithm1_name, algorithm2_name])
+algorithm1 = [summary1[i]['cost_mean'] for i in instances]
+algorithm2 = [summary2[i]['cost_mean'] for i in instances]
 
 # Bar chart for Total Distance
 x = range(len(instances))
-plt.bar(x, algorithm1, width=0.4, label='Algorithm 1', color='blue', align='center')
-plt.bar(x, algorithm2, width=0.4, label='Algorithm 2', color='orange', align='edge')
+plt.bar(x, algorithm1, width=0.4, label=algorithm1_name, color='blue', align='center')
+plt.bar(x, algorithm2, width=0.4, label=algorithm2_name, color='orange', align='edge')
 
 # Formatting
 plt.xlabel('Instances')
@@ -1,13 +1,23 @@
+import os
+import sys
 import matplotlib.pyplot as plt
 
-# Data for comparison
-instances = ['F-n45-k4', 'F-n72-k4', 'F-n135-k7']
-algorithm1_times = [44, 71, 134]  # Execution times for Algorithm 1
-algorithm2_times = [4, 4, 7]      # Execution times for Algorithm 2
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from template_code.benchmark import latest_results, solver_summaries
+
+# Data for comparison: benchmark results (python -m template_code.benchmark) of two solvers,
+# by default the latest results
+if len(sys.argv) not in (3, 4):
+    sys.exit("Usage: python extime.py SOLVER1 SOLVER2 [RESULTS.json]")
+algorithm1_name, algorithm2_name = sys.argv[1:3]
+instances, (summary1, summary2) = solver_summaries(latest_results(sys.argv[3] if len(sys.argv) > 3 else None),
+                                                   [algorithm1_name, algorithm2_name])
+algorithm1_times = [summary1[i]['runtime_mean'] * 1000 for i in instances]  # Execution times for Algorithm 1
+algorithm2_times = [summary2[i]['runtime_mean'] * 1000 for i in instances]  # Execution times for Algorithm 2
 
 # Plotting a Box Plot
 plt.figure(figsize=(8, 6))
-plt.boxplot([algorithm1_times, algorithm2_times], labels=['Algorithm 1', 'Algorithm 2'], patch_artist=True,
+plt.boxplot([algorithm1_times, algorithm2_times], labels=[algorithm1_name, algorithm2_name], patch_artist=True,
             boxprops=dict(facecolor='lightblue', color='blue'),
             medianprops=dict(color='red', linewidth=1.5))
 
@@ -25,8 +35,8 @@ x = range(len(instances))  # X-axis positions
 bar_width = 0.35
 
 plt.figure(figsize=(8, 6))
-plt.bar(x, algorithm1_times, width=bar_width, label='Algorithm 1', color='lightblue')
-plt.bar([i + bar_width for i in x], algorithm2_times, width=bar_width, label='Algorithm 2', color='lightgreen')
+plt.bar(x, algorithm1_times, width=bar_width, label=algorithm1_name, color='lightblue')
+plt.bar([i + bar_width for i in x], algorithm2_times, width=bar_width, label=algorithm2_name, color='lightgreen')
 
 # Add titles, labels, and legend
 plt.title('Execution Time Comparison Between Algorithms', fontsize=14)
@@ -35,20 +35,16 @@ nodes = load_vrp_instance(file_path)
 print("Coordonnées des nœuds :", nodes)
 
 
-import math
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from template_code.distance_matrix import compute_distance_matrix
+from template_code.spatial_index import NearestNeighborIndex
 
 def calculate_distance_matrix(nodes):
-    num_nodes = len(nodes)
-    distance_matrix = [[0] * num_nodes for _ in range(num_nodes)]
-    
-    for i in range(num_nodes):
-        for j in range(num_nodes):
-            if i != j:
-                x1, y1 = nodes[i][1], nodes[i][2]
-                x2, y2 = nodes[j][1], nodes[j][2]
-                distance_matrix[i][j] = math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
-    
-    return distance_matrix
+    # Matrice vectorisée partagée avec les autres solveurs
+    return compute_distance_matrix([(x, y) for _, x, y in nodes])
 
 # Example usage
 distance_matrix = calculate_distance_matrix(nodes)
@@ -74,34 +70,31 @@ plot_nodes(nodes)
 
 def nearest_neighbor(nodes, distance_matrix, capacity, demands):
     num_nodes = len(nodes)
-    visited = [False] * num_nodes
     routes = []
     depot = 0
-    visited[depot] = True
+    # Listes de voisins triées avec suppression paresseuse des nœuds visités
+    index = NearestNeighborIndex(distance_matrix, range(1, num_nodes), demands)
 
-    while not all(visited):
+    while len(index):
         current_route = []
         current_capacity = 0
         current_node = depot
 
         while True:
             current_route.append(current_node)
-            visited[current_node] = True
-            next_node = None
-            min_distance = float('inf')
-
-            for i in range(num_nodes):
-                if not visited[i] and current_capacity + demands[i] <= capacity:
-                    if distance_matrix[current_node][i] < min_distance:
-                        min_distance = distance_matrix[current_node][i]
-                        next_node = i
+            next_node = index.nearest_feasible(current_node, capacity - current_capacity)
 
             if next_node is None:  # No valid next node
                 break
 
+            index.remove(next_node)
             current_node = next_node
             current_capacity += demands[next_node]
 
+        if len(current_route) == 1:
+            # An empty vehicle cannot serve any remaining customer
+            unserved = [node for node in range(1, num_nodes) if node in index]
+            raise ValueError(f"Demand of customers {unserved} exceeds the vehicle capacity {capacity}.")
         current_route.append(depot)  # Return to the depot
         routes.append(current_route)
 
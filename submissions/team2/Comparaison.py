@@ -2,6 +2,9 @@ import numpy as np
 import matplotlib.pyplot as plt
 import pickle
 import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from template_code.convergence import load_trace
 
 
 def plot_simple_results(results):
@@ -26,6 +29,29 @@ def plot_simple_results(results):
 
 
 
+def plot_convergence(traces, x_axis='iteration'):
+    """
+    Trace les courbes de convergence (coût courant et meilleur coût) enregistrées par les solveurs.
+    `traces` associe un nom d'approche à une ConvergenceTrace, à son tableau (to_array())
+    ou à un fichier CSV/Parquet exporté ; `x_axis` vaut 'iteration' ou 'elapsed'.
+    """
+    plt.figure(figsize=(10, 6))
+    for label, trace in traces.items():
+        if isinstance(trace, str):
+            data = load_trace(trace)
+        elif hasattr(trace, 'to_array'):
+            data = trace.to_array()
+        else:
+            data = trace
+        line, = plt.plot(data[x_axis], data['best_cost'], label=f"{label} (meilleur)")
+        plt.plot(data[x_axis], data['current_cost'], color=line.get_color(), alpha=0.3, label=f"{label} (courant)")
+    plt.title("Convergence des approches")
+    plt.xlabel("Itération" if x_axis == 'iteration' else "Temps écoulé (s)")
+    plt.ylabel("Coût")
+    plt.grid(True)
+    plt.legend()
+    plt.show()
+
 # Fonction pour générer les graphiques à partir de quatre dictionnaires
 def generate_plots(taboue_results, recuit_results, locale_results, gloutonne_results):
     # Liste des approches
@@ -1,5 +1,13 @@
 import math
-import random
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from template_code.constructors import clarke_wright_savings, cluster_routes, sweep_routes
+from template_code.distance_matrix import node_coordinates
+from template_code.intra_route import optimize_routes
+from template_code.profiling import phase
+from template_code.rng import make_rng
+from template_code.spatial_index import NearestNeighborIndex
 
 # Calcul de la distance entre deux nœuds
 def calculate_distance(node1, node2):
@@ -10,56 +18,85 @@ def calculate_total_cost(routes, distance_matrix, node_index_map):
     cost = 0
     depot_index = node_index_map[-1]  
     for route in routes:
-        cost += distance_matrix[depot_index][node_index_map[route[0]]]  
+        cost += distance_matrix[depot_index, node_index_map[route[0]]]  
         for i in range(len(route) - 1):  
-            cost += distance_matrix[node_index_map[route[i]]][node_index_map[route[i + 1]]]
-        cost += distance_matrix[node_index_map[route[-1]]][depot_index]  
+            cost += distance_matrix[node_index_map[route[i]], node_index_map[route[i + 1]]]
+        cost += distance_matrix[node_index_map[route[-1]], depot_index]  
     return cost
 
 # Création de la solution initiale
 def create_initial_solution(demands, capacity, distance_matrix, node_index_map):
     routes = [] 
-    unserved_customers = list(demands.keys()) 
     depot_index = node_index_map[-1]  
+    # Listes de voisins triées avec suppression paresseuse des clients servis
+    customers = {node_index_map[customer]: customer for customer in demands}
+    index = NearestNeighborIndex(distance_matrix, customers, 
+                                 {node: demands[customer] for node, customer in customers.items()})
     current_route = []  
     current_load = 0  
-    while unserved_customers:
+    while len(index):
         current_route = []
         current_load = 0
         current_node = depot_index 
-        while unserved_customers:
-            nearest_customer = None
-            min_distance = float('inf')
-            for customer in unserved_customers:
-                customer_index = node_index_map[customer]
-                if current_load + demands[customer] <= capacity:
-                    dist = distance_matrix[current_node][customer_index]
-                    if dist < min_distance:
-                        min_distance = dist
-                        nearest_customer = customer
-            if nearest_customer is not None:
+        while len(index):
+            nearest_index = index.nearest_feasible(current_node, capacity - current_load)
+            if nearest_index is not None:
+                nearest_customer = customers[nearest_index]
                 current_route.append(nearest_customer)
                 current_load += demands[nearest_customer]
-                unserved_customers.remove(nearest_customer)
-                current_node = node_index_map[nearest_customer]
+                index.remove(nearest_index)
+                current_node = nearest_index
             else:
                 break  
         if current_route:
             routes.append(current_route)
+        else:
+            break
     return routes
 
-# Fonction de génération des voisins d'une solution
-def neighborhood_solution(routes, demands, capacity):
+# Méthodes de construction de la solution initiale
+INITIAL_SOLUTIONS = ("nearest", "savings", "sweep", "kmeans")
+
+# Solution initiale selon la méthode choisie : plus proche voisin, économies de Clarke-Wright,
+# balayage angulaire ou k-means capacitaire (ces deux dernières ont besoin des coordonnées)
+def build_initial_solution(method, demands, capacity, distance_matrix, node_index_map, node_coords=None):
+    if method == "nearest":
+        return create_initial_solution(demands, capacity, distance_matrix, node_index_map)
+    if method == "savings":
+        return clarke_wright_savings(distance_matrix, demands, capacity, depot=node_index_map[-1],
+                                     customers=[node_index_map[customer] for customer in demands])
+    if method in ("sweep", "kmeans"):
+        if node_coords is None:
+            raise ValueError(f"La méthode {method!r} nécessite les coordonnées des nœuds (node_coords)")
+        constructor = sweep_routes if method == "sweep" else cluster_routes
+        return constructor(node_coordinates(node_coords), demands, capacity, depot=node_index_map[-1],
+                           customers=[node_index_map[customer] for customer in demands])
+    raise ValueError(f"Méthode de construction inconnue : {method!r} (attendu : {INITIAL_SOLUTIONS})")
+
+# Post-optimisation : ordre de visite de chaque route amélioré par 2-opt et Or-opt (charges inchangées)
+def post_optimization(solution, distance_matrix, depot_index, budget=None):
+    with phase("post-optimization"):
+        solution, cost = optimize_routes(solution, distance_matrix, depot_index)
+    if budget is not None:
+        budget.improve(solution, cost)
+    return solution, cost
 
+# Fonction de génération des voisins d'une solution
+def neighborhood_solution(routes, demands, capacity, size=30, max_attempts=None, rng=None):
+    # Générateur explicite (graine, random.Random ou numpy Generator), module random global par défaut
+    rng = make_rng(rng)
     solutions = set()  
+    # Limite de tirages : évite une boucle infinie si le voisinage compte moins de `size` solutions
+    attempts = max_attempts if max_attempts is not None else 20 * size
 
-    while len(solutions) < 30:  
+    while len(solutions) < size and attempts > 0:  
+        attempts -= 1
         new_routes = [route.copy() for route in routes] 
-        route1, route2 = random.sample(new_routes, 2)  
+        route1, route2 = rng.sample(new_routes, 2)  
 
         if route1 and route2:  
-            node1 = random.choice(route1)  
-            node2 = random.choice(route2)  
+            node1 = rng.choice(route1)  
+            node2 = rng.choice(route2)  
 
             load_route1 = sum(demands[node] for node in route1)
             load_route2 = sum(demands[node] for node in route2)
@@ -1,11 +1,12 @@
-import math
 import os
 import sys
 from read_instances import read_instance
 from verify_solution import verify_solution
-from verify_solution import euclidean_distance
+from constructors import cluster_routes, sweep_routes
+from distance_matrix import get_distance_matrix, node_coordinates
+from spatial_index import NearestNeighborIndex
 
-def greedy_cvrp(nodes, demands, capacity):
+def greedy_cvrp(nodes, demands, capacity, distance_matrix=None):
     """
     Solves the CVRP using a greedy heuristic approach.
 
@@ -13,6 +14,8 @@ def greedy_cvrp(nodes, demands, capacity):
         nodes (dict): Node coordinates as {node_id: (x, y)}.
         demands (dict): Node demands as {node_id: demand}.
         capacity (int): Vehicle capacity.
+        distance_matrix (numpy.ndarray): Matrix indexed by node ID, looked up
+            from `nodes` when omitted.
 
     Returns:
         list: Routes for each vehicle.
@@ -20,23 +23,19 @@ def greedy_cvrp(nodes, demands, capacity):
     unvisited = set(demands.keys()) - {0}  # Exclude the depot (node 0)
     routes = []
     depot = 0
+    if distance_matrix is None:
+        distance_matrix = get_distance_matrix({"nodes": nodes})
+    # Sorted neighbor lists with lazy deletion of visited nodes
+    index = NearestNeighborIndex(distance_matrix, sorted(unvisited), demands)
 
-    while unvisited:
+    while len(index):
         current_capacity = capacity
         current_route = []
         current_node = depot
 
-        while unvisited:
+        while len(index):
             # Find the closest unvisited node that fits within the remaining capacity
-            next_node = None
-            min_distance = float("inf")
-
-            for node in unvisited:
-                if demands[node] <= current_capacity:
-                    distance = euclidean_distance(nodes[current_node], nodes[node])
-                    if distance < min_distance:
-                        min_distance = distance
-                        next_node = node
+            next_node = index.nearest_feasible(current_node, current_capacity)
 
             if not next_node:  # No more nodes can be added to this route
                 break
@@ -44,7 +43,7 @@ def greedy_cvrp(nodes, demands, capacity):
             # Add the selected node to the route
             current_route.append(next_node)
             current_capacity -= demands[next_node]
-            unvisited.remove(next_node)
+            index.remove(next_node)
             current_node = next_node
 
         routes.append(current_route)
@@ -52,25 +51,61 @@ def greedy_cvrp(nodes, demands, capacity):
     return routes
 
 
-def calculate_cost(solution, nodes):
+def sweep_cvrp(nodes, demands, capacity):
+    """
+    Solves the CVRP with the sweep heuristic (polar angle around the depot, node 0).
+
+    Args:
+        nodes (dict): Node coordinates as {node_id: (x, y)}.
+        demands (dict): Node demands as {node_id: demand}.
+        capacity (int): Vehicle capacity.
+
+    Returns:
+        list: Routes for each vehicle.
+    """
+    customers = sorted(set(demands.keys()) - {0})
+    return sweep_routes(node_coordinates(nodes), demands, capacity, depot=0, customers=customers)
+
+
+def cluster_cvrp(nodes, demands, capacity):
+    """
+    Solves the CVRP cluster-first route-second, with capacitated k-means clusters.
+
+    Args:
+        nodes (dict): Node coordinates as {node_id: (x, y)}.
+        demands (dict): Node demands as {node_id: demand}.
+        capacity (int): Vehicle capacity.
+
+    Returns:
+        list: Routes for each vehicle.
+    """
+    customers = sorted(set(demands.keys()) - {0})
+    return cluster_routes(node_coordinates(nodes), demands, capacity, depot=0, customers=customers)
+
+
+def calculate_cost(solution, nodes, distance_matrix=None):
     """
     Calculates the total cost of a CVRP solution.
 
     Args:
         solution (list): List of routes.
         nodes (dict): Node coordinates.
+        distance_matrix (numpy.ndarray): Matrix indexed by node ID, looked up
+            from `nodes` when omitted.
 
     Returns:
         float: Total cost of the solution.
     """
     cost = 0
     depot = 0
+    if distance_matrix is None:
+        distance_matrix = get_distance_matrix({"nodes": nodes})
     for route in solution:
         prev_node = depot
         for node in route:
-            cost += euclidean_distance(nodes[prev_node], nodes[node])
+            cost += distance_matrix[prev_node, node]
             prev_node = node
-        cost += euclidean_distance(nodes[prev_node], nodes[depot])
+        cost += distance_matrix[prev_node, depot]
     return cost
 
 
@@ -101,8 +136,9 @@ if __name__ == "__main__":
     capacity = instance_data["capacity"]
 
     # Solve the CVRP using the greedy heuristic
-    routes = greedy_cvrp(nodes, demands, capacity)
-    cost = calculate_cost(routes, nodes)
+    distance_matrix = get_distance_matrix(instance_data)
+    routes = greedy_cvrp(nodes, demands, capacity, distance_matrix)
+    cost = calculate_cost(routes, nodes, distance_matrix)
 
     # Verify the solution
     is_feasible, violations, details = verify_solution(instance_data, routes)
@@ -1,13 +1,11 @@
 import os
-import random
 import sys
-import statistics
-import time
+from functools import partial
 
 # Ajout explicite du chemin du dossier 'template_code'
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../template_code')))
-from read_instances import read_instance
-from verify_solution import verify_solution
+from distance_matrix import get_distance_matrix
+from parallel_evaluation import evaluate, find_instances
 
 # Extraction des routes et coût optimal
 def parse_solution_file(solution_path):
@@ -51,185 +49,72 @@ def calculate_proximity(optimal_cost, generated_cost):
     return proximity
 
 
-def evaluate_algorithm(data_path, tabu_search_fn, solution_path, iterations=100, tabu_tenures=[5, 10, 20]):
-    results = {}
-    print(f"Evaluating files in directory: {data_path}")
-
-    for root, dirs, files in os.walk(data_path):  
-        print(f"Checking directory: {root}")
-        print(f"Files found: {files}")
-        
-        for filename in files:
-            if filename.endswith('.vrp'):
-                instance_path = os.path.join(root, filename)
-                solution_file = instance_path.replace('.vrp', '.sol')
-                print(f"Processing instance file: {filename}")
-
-                try:
-                    # Lecture des données de l'instance
-                    instance_data = read_instance(instance_path)
-                    nodes, demands, capacity = instance_data["nodes"], instance_data["demands"], instance_data["capacity"]
-                    depot_coords = nodes[1]  # Supposons que le dépôt est le nœud 1
-                    print(f"Instance data loaded for {filename}")
-                    
-                    # Chargement de la solution optimale
-                    optimal_routes, optimal_cost = parse_solution_file(solution_file)
-                    print(f"Optimal cost loaded: {optimal_cost}")
-                    
-                except Exception as e:
-                    print(f"Error reading instance {filename}: {e}")
-                    continue
-
-                instance_results = {'tabu_tenures': {}}
-                for tenure in tabu_tenures:
-                    costs = []
-                    valid_solutions = 0
-                    exec_times = []
-                    proximities = []
-                    total_simulations = 5
-
-                    for _ in range(total_simulations):
-                        
-                            print(f"Running tabu_search with tenure={tenure} for {filename}")
-                            
-                            start_time = time.time()
-
-                            best_solution, best_cost = tabu_search_fn(
-                                nodes, demands, capacity, iterations, tenure, depot_coords
-                            )
-                            
-                            exec_time = time.time() - start_time
-                            print(f"Best Solution: {best_solution}, Best Cost: {best_cost}")
-
-                            proximity = calculate_proximity(optimal_cost, best_cost)
-                            proximities.append(proximity)
-                            print(f"Proximity to optimal solution: {proximity:.2f}%")
-
-                            # Vérification de la validité de la solution
-                            is_valid, total_cost, message = verify_solution(
-                                {'nodes': nodes, 'demands': demands, 'capacity': capacity},
-                                best_solution
-                            )
-                            print(f"Solution validity: {is_valid}")
-                            print(f"Verification message: {message}")
-                            print(f"Total cost after verification: {total_cost}")
+def run_tabu_search(tabu_search_fn, iterations, instance_data, tenure, rng=None):
+    """
+    Adapte la recherche tabou à l'interface solver(instance_data, parameter) du banc parallèle.
+    Le dépôt est le nœud 1 et les coordonnées sont copiées pour ne pas modifier l'instance partagée.
+    La matrice de l'instance, construite une fois et partagée avec les processus, est réutilisée.
+    `rng` est le flux aléatoire propre à l'exécution, fourni par le banc.
+    """
+    nodes = instance_data["nodes"]
+    return tabu_search_fn(dict(nodes), instance_data["demands"], instance_data["capacity"], iterations, tenure, nodes[1],
+                          rng=rng, distance_matrix=get_distance_matrix(instance_data), depot_node=1)
 
-                            if is_valid:
-                                costs.append(total_cost)
-                                valid_solutions += 1
-                            else:
-                                print(f"Invalid solution at iteration {_ + 1}, message: {message}")
 
-                            exec_times.append(exec_time)
-                    if costs:
-                        initial_cost = costs[0]
-                        instance_results['tabu_tenures'][tenure] = {
-                            'average_cost': statistics.mean(costs),
-                            'min_cost': min(costs),
-                            'max_cost': max(costs),
-                            'valid_percentage': (valid_solutions / total_simulations) * 100,
-                            'feasibility_rate': (valid_solutions / total_simulations) * 100,
-                            'average_execution_time': statistics.mean(exec_times),
-                            'average_proximity': statistics.mean(proximities),
-                            'diversity': statistics.variance(costs) if len(costs) > 1 else 0,
-                            'convergence_rate': (initial_cost - min(costs)) / initial_cost * 100
-                        }
-                    else:
-                        print(f"No valid solutions recorded for {filename} with tenure={tenure}. Valid Solutions: {valid_solutions}/{total_simulations}")
+def evaluate_algorithm(data_path, tabu_search_fn, solution_path, iterations=100, tabu_tenures=[5, 10, 20], workers=None):
+    """
+    Évalue la recherche tabou sur toutes les instances d'un répertoire (5 simulations par tenure).
+    Les exécutions (instance, tenure, graine) sont réparties sur `workers` processus.
+    Les statistiques de coût ne portent que sur les solutions valides (coût recalculé par
+    verify_solution) ; une tenure sans solution valide n'apparaît pas dans les résultats.
+    """
+    print(f"Evaluating files in directory: {data_path}")
+    total_simulations = 5
+    metrics = evaluate(
+        find_instances(data_path), partial(run_tabu_search, tabu_search_fn, iterations),
+        tabu_tenures, total_simulations=total_simulations, workers=workers, valid_only=True
+    )
 
-                results[filename] = instance_results
+    results = {}
+    for filename, by_tenure in metrics.items():
+        instance_results = {'tabu_tenures': {}}
+        for tenure, tenure_metrics in by_tenure.items():
+            if tenure_metrics is None:
+                print(f"No valid solutions recorded for {filename} with tenure={tenure}.")
+                continue
+            instance_results['tabu_tenures'][tenure] = tenure_metrics
+        results[filename] = instance_results
 
     print("Final evaluation results:", results)
     return results
 
 
-def evaluate_algorithm_for_single_instance(instance_path, tabu_search_fn, solution_path, iterations=100, tabu_tenures=[5, 10, 20]):
+def evaluate_algorithm_for_single_instance(instance_path, tabu_search_fn, solution_path, iterations=100, tabu_tenures=[5, 10, 20], workers=None):
     """
     Évalue l'algorithme de recherche tabou sur une seule instance et ses paramètres.
+    Le coût optimal est lu dans le fichier solution_path.
     """
-    results = {}
     filename = os.path.basename(instance_path)
     print(f"Processing instance file: {filename}")
 
-    try:
-        # Lecture des données de l'instance
-        instance_data = read_instance(instance_path)
-        nodes, demands, capacity = instance_data["nodes"], instance_data["demands"], instance_data["capacity"]
-        print(f"Instance data loaded for {filename}")
-        
-        # Chargement de la solution optimale
-        optimal_routes, optimal_cost = parse_solution_file(solution_path)
-        print(f"Optimal cost loaded: {optimal_cost}")
-        
-    except Exception as e:
-        print(f"Error reading instance {instance_path}: {e}")
-        return {}
+    total_simulations = 5  # Total de simulations pour chaque tenure
+    metrics = evaluate(
+        [instance_path], partial(run_tabu_search, tabu_search_fn, iterations),
+        tabu_tenures, total_simulations=total_simulations, workers=workers,
+        optimal_costs={instance_path: load_optimal_solution(solution_path)}
+    )
 
     # Initialisation des résultats de l'instance
     instance_results = {
         'tabu_tenures': {},
     }
-
-    for tenure in tabu_tenures:
-        costs = []
-        valid_solutions = 0
-        exec_times = []  # Liste pour stocker les temps d'exécution
-        proximities = []  # Liste pour stocker la proximité
-        total_simulations = 5  # Total de simulations pour chaque tenure
-
-        for _ in range(total_simulations):  # Nombre de simulations par paramètre
-            try:
-                print(f"Running tabu_search with tenure={tenure} for {filename}")
-                
-                # Mesure du temps d'exécution
-                start_time = time.time()
-
-                best_solution, best_cost = tabu_search_fn(
-                    nodes, demands, capacity, iterations, tenure
-                )
-                
-                exec_time = time.time() - start_time  
-
-                print(f"Best Solution: {best_solution}, Best Cost: {best_cost}")
-
-                # Calcul de la proximité de la solution par rapport à la solution optimale
-                proximity = calculate_proximity(optimal_cost, best_cost)
-                proximities.append(proximity)
-                print(f"Proximity to optimal solution: {proximity:.2f}%")
-
-                # Validation de la solution
-                is_valid, _, _ = verify_solution(
-                    {'nodes': nodes, 'demands': demands, 'capacity': capacity},
-                    best_solution
-                )
-                print(f"Solution validity: {is_valid}")
-                costs.append(best_cost)
-                exec_times.append(exec_time)
-
-                if is_valid:
-                    valid_solutions += 1
-            except Exception as e:
-                print(f"Error during tabu_search or validation for {filename}, tenure={tenure}: {e}")
-                continue
-        
-        if costs:
-            # Calcul de l'indicateur de diversité et convergence
-            initial_cost = costs[0]  # Vous pouvez définir le coût initial comme le premier coût obtenu
-            instance_results['tabu_tenures'][tenure] = {
-                'average_cost': statistics.mean(costs),
-                'min_cost': min(costs),
-                'max_cost': max(costs),
-                'valid_percentage': (valid_solutions / total_simulations) * 100,
-                'feasibility_rate': (valid_solutions / total_simulations) * 100,
-                'average_execution_time': statistics.mean(exec_times),
-                'average_proximity': statistics.mean(proximities),
-                'diversity': statistics.variance(costs) if len(costs) > 1 else 0,
-                'convergence_rate': (initial_cost - min(costs)) / initial_cost * 100  # Taux de convergence
-            }
-        else:
+    for tenure, tenure_metrics in metrics.get(filename, {}).items():
+        if tenure_metrics is None:
             print(f"No costs recorded for {filename} with tenure={tenure}")
+            continue
+        instance_results['tabu_tenures'][tenure] = tenure_metrics
 
-    results[instance_path] = instance_results
+    results = {instance_path: instance_results}
 
     print("Final evaluation results:", results)
     return results
@@ -1,12 +1,10 @@
 import os
-import random
-import statistics
-import time
-from functions import parse_vrp_file
+from functools import partial
 from rechercheLocaleImpl import local_search
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
-from template_code.verify_solution import verify_solution
+from template_code.distance_matrix import get_distance_matrix
+from template_code.parallel_evaluation import evaluate, find_instances
 
 # Extraction des routes et coût optimal
 def parse_solution_file(solution_path):
@@ -44,110 +42,37 @@ def calculate_proximity(optimal_cost, generated_cost):
     proximity = (abs(optimal_cost - generated_cost) / optimal_cost) * 100
     return proximity
 
-# Évaluation de l'algorithme de recherche locale
-def evaluate_local_search(data_path, solution_path, max_iterations=100, num_simulations=5):
-    results = {}
-    print(f"Evaluating files in directory: {data_path}")
-    
-    # Parcours de toutes les instances dans le répertoire
-    for root, dirs, files in os.walk(data_path):  
-        print(f"Checking directory: {root}")
-        print(f"Files found: {files}")
-        
-        for filename in files:
-            if filename.endswith('.vrp'):
-                instance_path = os.path.join(root, filename)
-                solution_file = instance_path.replace('.vrp', '.sol')
-                print(f"Processing instance file: {filename}")
-
-                try:
-                    # Lecture des données de l'instance
-                    node_coords, demands, capacity, depot_coords = parse_vrp_file(instance_path)
-                    print(f"Instance data loaded for {filename}")
-                    
-                    # Chargement de la solution optimale
-                    optimal_routes, optimal_cost = parse_solution_file(solution_file)
-                    print(f"Optimal cost loaded: {optimal_cost}")
-                    
-                except Exception as e:
-                    print(f"Error reading instance {filename}: {e}")
-                    continue
-
-                # Initialisation des résultats de l'instance
-                instance_results = {
-                    'local_search': {
-                        'costs': [],
-                        'exec_times': [],
-                        'proximities': [],
-                        'valid_solutions': 0,
-                        
-                    }
-                }
-
-                for _ in range(num_simulations):  # Nombre de simulations par instance
-                    try:
-                        print(f"Running local_search for {filename}")
-                        
-                        # Mesure du temps d'exécution
-                        start_time = time.time()
-
-                        # Exécution de la recherche locale
-                        best_solution, best_cost = local_search(node_coords, demands, capacity, max_iterations, depot_coords)
-                        
-                        exec_time = time.time() - start_time  
-
-                        print(f"Best Solution: {best_solution}, Best Cost: {best_cost}")
-
-                        # Calcul de la proximité de la solution par rapport à la solution optimale
-                        proximity = calculate_proximity(optimal_cost, best_cost)
-                        print(f"Proximity to optimal solution: {proximity:.2f}%")
-
-                        # Enregistrement des résultats
-                        instance_results['local_search']['costs'].append(best_cost)
-                        instance_results['local_search']['exec_times'].append(exec_time)
-                        instance_results['local_search']['proximities'].append(proximity)
-
-                        # Validation de la solution
-                        is_valid, _, _ = verify_solution(
-                                {'nodes': node_coords, 'demands': demands, 'capacity': capacity},
-                                best_solution
-                            )
-                        print(f"Solution validity: {is_valid}")
-                            
-
-                        if is_valid:
-                                valid_solutions += 1
+def run_local_search(max_iterations, instance_data, parameter, rng=None):
+    """
+    Adapte la recherche locale à l'interface solver(instance_data, parameter) du banc parallèle.
+    Le dépôt est le nœud 1 et les coordonnées sont copiées pour ne pas modifier l'instance partagée.
+    La matrice de l'instance, construite une fois et partagée avec les processus, est réutilisée.
+    """
+    nodes = instance_data["nodes"]
+    return local_search(dict(nodes), instance_data["demands"], instance_data["capacity"], max_iterations, nodes[1],
+                        rng=rng, distance_matrix=get_distance_matrix(instance_data), depot_node=1)
 
-                    except Exception as e:
-                        print(f"Error during local_search for {filename}: {e}")
-                        continue
-                
-                # Calcul des métriques pour l'instance
-                if instance_results['local_search']['costs']:
-                    costs = instance_results['local_search']['costs']
-                    initial_cost = costs[0]
-                    min_cost = min(costs)
-                    max_cost = max(costs)
-                    average_cost = statistics.mean(costs)
-                    average_exec_time = statistics.mean(instance_results['local_search']['exec_times'])
-                    average_proximity = statistics.mean(instance_results['local_search']['proximities'])
-                    valid_percentage = (instance_results['local_search']['valid_solutions'] / num_simulations) * 100
-                    diversity = statistics.variance(costs) if len(costs) > 1 else 0
-                    convergence_rate = ((initial_cost - min_cost) / initial_cost * 100) if initial_cost != 0 else 0
 
-                    # Enregistrement des métriques
-                    instance_results['local_search']['average_cost'] = average_cost
-                    instance_results['local_search']['min_cost'] = min_cost
-                    instance_results['local_search']['max_cost'] = max_cost
-                    instance_results['local_search']['average_exec_time'] = average_exec_time
-                    instance_results['local_search']['average_proximity'] = average_proximity
-                    instance_results['local_search']['valid_percentage'] = valid_percentage
-                    instance_results['local_search']['diversity'] = diversity
-                    instance_results['local_search']['convergence_rate'] = convergence_rate
-                else:
-                    print(f"No costs recorded for {filename}")
+# Évaluation de l'algorithme de recherche locale
+def evaluate_local_search(data_path, solution_path, max_iterations=100, num_simulations=5, workers=None):
+    """
+    Évalue la recherche locale sur toutes les instances d'un répertoire.
+    Les exécutions (instance, graine) sont réparties sur `workers` processus.
+    """
+    print(f"Evaluating files in directory: {data_path}")
+    metrics = evaluate(
+        find_instances(data_path), partial(run_local_search, max_iterations),
+        ['local_search'], total_simulations=num_simulations, workers=workers
+    )
 
-                results[filename] = instance_results
+    results = {}
+    for filename, by_algorithm in metrics.items():
+        local_metrics = by_algorithm['local_search']
+        if local_metrics is None:
+            print(f"No costs recorded for {filename}")
+            continue
+        local_metrics['average_exec_time'] = local_metrics['average_execution_time']
+        results[filename] = {'local_search': local_metrics}
 
     print("Final evaluation results:", results)
     return results
@@ -1,65 +1,124 @@
-from functions import calculate_distance, calculate_total_cost, create_initial_solution, neighborhood_solution, parse_vrp_file , print_solution
+from functions import build_initial_solution, neighborhood_solution, post_optimization, print_solution
 import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 from template_code.read_instances import read_instance
 from template_code.verify_solution import verify_solution
+from template_code.distance_matrix import get_distance_matrix
+from template_code.budget import iteration_range
+from template_code.batch_scoring import best_candidate, demand_vector
+from template_code.moves import RouteState
+from template_code.profiling import phase
+from template_code.rng import make_rng
+from template_code.spatial_index import nearest_neighbor_lists
 # Recherche Locale
-def local_search(node_coords, demands, capacity, max_iterations, depot_coords):
-    nodes = list(node_coords.keys())  
-    nodes.append(-1)  # Ajout du dépôt
-    node_coords[-1] = depot_coords
-    node_index_map = {node: idx for idx, node in enumerate(nodes)}
-    # Création de la matrice des distances
-    distance_matrix = [[calculate_distance(node_coords[nodes[i]], node_coords[nodes[j]]) 
-                        if nodes[i] != -1 and nodes[j] != -1 else
-                        calculate_distance(depot_coords, node_coords[nodes[j]]) if nodes[i] == -1 else
-                        calculate_distance(node_coords[nodes[i]], depot_coords)
-                        for j in range(len(nodes))] for i in range(len(nodes))]
+def local_search(node_coords, demands, capacity, max_iterations, depot_coords, granular_k=None, batch_size=None, budget=None, trace=None, rng=None, initial="nearest", post_optimize=False, distance_matrix=None, depot_node=None):
+    # Budget optionnel (temps et/ou nombre d'évaluations) : la meilleure solution reste disponible à tout moment
+    if budget is not None:
+        budget.start()
+    # Trace de convergence optionnelle (ConvergenceTrace), sans coût si désactivée
+    if trace is not None:
+        trace.start()
+    # Générateur explicite (graine, random.Random ou numpy Generator) pour des exécutions reproductibles
+    rng = make_rng(rng)
+    node_coords[-1] = depot_coords  # Ajout du dépôt
+    node_index_map = {node: node for node in node_coords}
+    if distance_matrix is None:
+        # Matrice des distances partagée (indexée par identifiant de nœud, le dépôt -1 est la dernière ligne)
+        with phase("matrix"):
+            distance_matrix = get_distance_matrix({"nodes": node_coords})
+    else:
+        # Matrice de l'instance fournie par l'appelant (p. ex. partagée entre processus) :
+        # le dépôt -1 est un alias du nœud depot_node, situé aux coordonnées du dépôt
+        node_index_map[-1] = depot_node
     
-    # Générer une solution initiale
-    initial_solution = create_initial_solution(demands, capacity, distance_matrix,node_index_map)
-    best_solution = initial_solution
-    best_cost = calculate_total_cost(best_solution, distance_matrix,node_index_map)
-    
-    # Recherche locale
-    for iteration in range(max_iterations):
-        # Générer des voisins
-        neighbors = neighborhood_solution(best_solution, demands, capacity)
-        
-        # Trouver le meilleur voisin
-        best_candidate = None
-        best_candidate_cost = float('inf')
-        
-        for candidate in neighbors:
-            cost = calculate_total_cost(candidate, distance_matrix,node_index_map)
-            if cost < best_candidate_cost:
-                best_candidate = candidate
-                best_candidate_cost = cost
-        
-        # Mettre à jour la meilleure solution si un meilleur voisin est trouvé
-        if best_candidate_cost < best_cost:
-            best_solution = best_candidate
-            best_cost = best_candidate_cost
-            
-            
-           
-        else:
-            # Si aucun meilleur voisin n'est trouvé, arrêter la recherche
-            
-            break
+    # Générer une solution initiale (voir INITIAL_SOLUTIONS dans functions)
+    with phase("construction"):
+        initial_solution = build_initial_solution(initial, demands, capacity, distance_matrix, node_index_map,
+                                                  node_coords)
+    depot_index = node_index_map[-1]
+
+    if batch_size:
+        best_solution, best_cost = batch_local_search(initial_solution, demands, capacity, max_iterations,
+                                                      distance_matrix, depot_index, batch_size, budget, trace, rng)
+        if post_optimize:
+            best_solution, best_cost = post_optimization(best_solution, distance_matrix, depot_index, budget)
+        return best_solution, best_cost
     
+    # Recherche locale par mouvements évalués en delta (sans construire les voisins)
+    # Voisinage granulaire : mouvements limités aux granular_k plus proches voisins de chaque client
+    neighbors = nearest_neighbor_lists(distance_matrix, demands, granular_k) if granular_k else None
+    state = RouteState(initial_solution, distance_matrix, demands, capacity, depot=depot_index, neighbors=neighbors)
+    if budget is not None:
+        budget.improve(state.to_routes(), state.total_cost)
+    with phase("improvement"):
+        for iteration in iteration_range(max_iterations, budget):
+            # Générer et évaluer des mouvements voisins
+            moves = state.sample_moves(30, rng=rng)
+            if not moves:
+                break
+            if budget is not None and budget.spend(len(moves)):
+                break
+
+            # Trouver le meilleur mouvement
+            best_delta, best_move = min(moves, key=lambda scored: scored[0])
+            if trace is not None:
+                cost = state.total_cost + min(best_delta, 0.0)
+                trace.record(iteration, cost, cost, accepted=best_delta < -1e-9)
+
+            # Appliquer le mouvement s'il améliore la solution
+            if best_delta < -1e-9:
+                state.apply(best_move)
+                if budget is not None:
+                    budget.improve(state.to_routes(), state.total_cost)
+            else:
+                # Si aucun meilleur voisin n'est trouvé, arrêter la recherche
+                break
+
+    best_solution = state.to_routes()
+    best_cost = state.total_cost
+    if post_optimize:
+        best_solution, best_cost = post_optimization(best_solution, distance_matrix, depot_index, budget)
     return best_solution, best_cost
-# Chargement des données
-filename = "../../data/A/A-n32-k5.vrp"
-node_coords, demands, capacity, depot_coords = parse_vrp_file(filename)
-# Paramètres
-max_iterations = 100
 
-# Résolution avec recherche locale
-best_solution, best_cost = local_search(node_coords, demands, capacity, max_iterations, depot_coords)
-# Affichage des résultats
-print_solution(best_solution, best_cost)
+# Recherche locale sur des voisinages de solutions complètes, évalués en lot
+def batch_local_search(initial_solution, demands, capacity, max_iterations, distance_matrix, depot_index, batch_size,
+                       budget=None, trace=None, rng=None):
+    demand_array = demand_vector(demands, len(distance_matrix))
+    current_solution = initial_solution
+    current_cost = best_candidate([current_solution], distance_matrix, demand_array, float('inf'), depot_index)[1]
+    if budget is not None:
+        budget.improve(current_solution, current_cost)
+    with phase("improvement"):
+        for iteration in iteration_range(max_iterations, budget):
+            # Générer batch_size voisins et les évaluer en une seule opération NumPy
+            neighbors = neighborhood_solution(current_solution, demands, capacity, batch_size, rng=rng)
+            index, cost = best_candidate(neighbors, distance_matrix, demand_array, capacity, depot_index)
+            if budget is not None and budget.spend(len(neighbors)):
+                break
+            if trace is not None:
+                improved = index is not None and cost < current_cost - 1e-9
+                trace.record(iteration, cost if improved else current_cost, cost if improved else current_cost,
+                             accepted=improved)
 
+            # Appliquer le meilleur voisin s'il améliore la solution, sinon arrêter
+            if index is None or cost >= current_cost - 1e-9:
+                break
+            current_solution, current_cost = neighbors[index], cost
+            if budget is not None:
+                budget.improve(current_solution, current_cost)
 
+    return current_solution, current_cost
+if __name__ == "__main__":
+    # Chargement des données
+    filename = "../../data/A/A-n32-k5.vrp"
+    instance_data = read_instance(filename)
+    node_coords, demands, capacity = instance_data["nodes"], instance_data["demands"], instance_data["capacity"]
+    depot_coords = node_coords[1]
+    # Paramètres
+    max_iterations = 100
 
+    # Résolution avec recherche locale
+    best_solution, best_cost = local_search(node_coords, demands, capacity, max_iterations, depot_coords)
+    # Affichage des résultats
+    print_solution(best_solution, best_cost)
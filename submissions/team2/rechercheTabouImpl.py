@@ -1,58 +1,227 @@
-from functions import calculate_distance, calculate_total_cost, create_initial_solution, neighborhood_solution, print_solution
+import multiprocessing
+import os
+import queue
+import sys
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from functions import INITIAL_SOLUTIONS, build_initial_solution, post_optimization, print_solution
+from template_code.budget import SearchBudget, iteration_range
+from template_code.distance_matrix import get_distance_matrix
+from template_code.moves import RouteState
+from template_code.profiling import phase
+from template_code.rng import make_rng, spawn_seeds
+from template_code.shared_instance import SharedInstance, neighbor_lists
+from template_code.spatial_index import nearest_neighbor_lists
+from template_code.tabu_memory import TabuMemory, solution_hash, update_hash
 # from rechTabouEvaluation import parse_solution_file
 
 # Recherche Tabou
-def tabu_search(node_coords, demands, capacity, max_iterations, tabu_tenure, depot_coords):
-    nodes = list(node_coords.keys())  
-    nodes.append(-1)  
+def tabu_search(node_coords, demands, capacity, max_iterations, tabu_tenure, depot_coords, detect_cycles=False, granular_k=None, budget=None, trace=None, rng=None, initial="nearest", post_optimize=False, migrate=None, migration_interval=50, distance_matrix=None, depot_node=None, neighbors=None):
+    # Migration optionnelle (modèle en îles) : toutes les migration_interval itérations,
+    # migrate(best_solution, best_cost) publie la meilleure solution et renvoie (solution, coût) reçue ou None
+    # Budget optionnel (temps et/ou nombre d'évaluations) : la meilleure solution reste disponible à tout moment
+    if budget is not None:
+        budget.start()
+    # Trace de convergence optionnelle (ConvergenceTrace), sans coût si désactivée
+    if trace is not None:
+        trace.start()
+    # Générateur explicite (graine, random.Random ou numpy Generator) pour des exécutions reproductibles
+    rng = make_rng(rng)
     node_coords[-1] = depot_coords
     
-    node_index_map = {node: idx for idx, node in enumerate(nodes)}
+    node_index_map = {node: node for node in node_coords}
+    if distance_matrix is None:
+        # Matrice des distances partagée (indexée par identifiant de nœud, le dépôt -1 est la dernière ligne)
+        with phase("matrix"):
+            distance_matrix = get_distance_matrix({"nodes": node_coords})
+    else:
+        # Matrice de l'instance fournie par l'appelant (p. ex. partagée entre processus) :
+        # le dépôt -1 est un alias du nœud depot_node, situé aux coordonnées du dépôt
+        node_index_map[-1] = depot_node
+    depot_index = node_index_map[-1]
     
-    # Création de la matrice des distances
-    distance_matrix = [[calculate_distance(node_coords[nodes[i]], node_coords[nodes[j]]) 
-                        if nodes[i] != -1 and nodes[j] != -1 else
-                        calculate_distance(depot_coords, node_coords[nodes[j]]) if nodes[i] == -1 else
-                        calculate_distance(node_coords[nodes[i]], depot_coords)
-                        for j in range(len(nodes))] for i in range(len(nodes))]
+    # Générer une solution initiale (voir INITIAL_SOLUTIONS dans functions)
+    with phase("construction"):
+        initial_solution = build_initial_solution(initial, demands, capacity, distance_matrix, node_index_map,
+                                                  node_coords)
+    # Voisinage granulaire : mouvements limités aux granular_k plus proches voisins de chaque client
+    # (listes fournies par l'appelant, p. ex. partagées entre processus, ou calculées ici)
+    if neighbors is None and granular_k:
+        neighbors = nearest_neighbor_lists(distance_matrix, demands, granular_k)
+    state = RouteState(initial_solution, distance_matrix, demands, capacity, depot=depot_index, neighbors=neighbors)
+    best_solution = state.to_routes()
+    best_cost = state.total_cost
+    if budget is not None:
+        budget.improve(best_solution, best_cost)
     
-    # Générer une solution initiale
-    initial_solution = create_initial_solution(demands, capacity , distance_matrix, node_index_map)
-    best_solution = initial_solution
-    best_cost = calculate_total_cost(best_solution, distance_matrix, node_index_map)
-    
-    # Liste Tabou et suivi des itérations
-    tabu_list = []
-    tabu_iterations = {}
+    # Mémoire tabou par attributs (arêtes retirées et ajoutées par le mouvement) avec expiration,
+    # et hachage de Zobrist des solutions pour la détection de cycles si demandé
+    memory = TabuMemory(tabu_tenure, track_solutions=detect_cycles)
+    current_hash = solution_hash(state.routes, depot_index) if detect_cycles else 0
+    memory.visit(current_hash, 0)
+
+    with phase("improvement"):
+        for iteration in iteration_range(max_iterations, budget):
+            if migrate is not None and iteration and iteration % migration_interval == 0:
+                incoming = migrate(best_solution, best_cost)
+                # Diversification : repartir de la solution reçue si elle est meilleure que la solution courante
+                if incoming is not None and incoming[1] < state.total_cost - 1e-9:
+                    state = RouteState(incoming[0], distance_matrix, demands, capacity, depot=depot_index,
+                                       neighbors=neighbors)
+                    if detect_cycles:
+                        current_hash = solution_hash(state.routes, depot_index)
+                    if state.total_cost < best_cost - 1e-9:
+                        best_solution = state.to_routes()
+                        best_cost = state.total_cost
+                        if budget is not None:
+                            budget.improve(best_solution, best_cost)
+            # Mouvements voisins évalués en delta, du plus au moins améliorant
+            moves = sorted(state.sample_moves(30, rng=rng), key=lambda scored: scored[0])
+            if budget is not None and budget.spend(len(moves)):
+                break
+            current_cost = state.total_cost
+
+            best_move = None
+            for delta, move in moves:
+                # Critère d'aspiration : un mouvement tabou est accepté s'il bat la meilleure solution
+                attributes = state.move_attributes(move)
+                if not memory.is_admissible(attributes, iteration, current_cost + delta, best_cost - 1e-9):
+                    continue
+                if detect_cycles:
+                    candidate_hash = update_hash(current_hash, *state.changed_edges(move))
+                    if memory.is_cycle(candidate_hash, iteration):
+                        continue
+                    current_hash = candidate_hash
+                best_move = move
+                break
+
+            # Vérification pour éviter l'erreur 'NoneType'
+            if best_move is None:
+                if trace is not None:
+                    trace.record(iteration, current_cost, best_cost, tabu_tenure, accepted=False)
+                continue
 
-    for iteration in range(max_iterations):
-        neighborhood = []
+            memory.add(attributes, iteration)
+            state.apply(best_move)
+            memory.visit(current_hash, iteration)
+
+            if state.total_cost < best_cost - 1e-9:
+                best_solution = state.to_routes()
+                best_cost = state.total_cost
+                if budget is not None:
+                    budget.improve(best_solution, best_cost)
+            if trace is not None:
+                trace.record(iteration, state.total_cost, best_cost, tabu_tenure)
+
+    # Post-optimisation optionnelle de l'ordre de visite de chaque route (2-opt et Or-opt)
+    if post_optimize:
+        best_solution, best_cost = post_optimization(best_solution, distance_matrix, depot_index, budget)
+    return best_solution, best_cost
 
-        neighbors = neighborhood_solution(best_solution, demands, capacity)
-        neighborhood.extend(neighbors)
+# Île du modèle parallèle : une recherche tabou qui échange son élite avec l'île suivante de l'anneau
+def _run_island(index, shared_instance, demands, capacity, max_iterations, tabu_tenure, depot_coords, depot_node,
+                initial, migration_interval, granular_k, deadline, max_evaluations, seed, inbox, outbox, results):
+    # Les migrants non lus à la fin ne doivent pas bloquer la fin du processus
+    outbox.cancel_join_thread()
 
-        best_candidate = None
-        best_candidate_cost = float('inf')
+    def migrate(best_solution, best_cost):
+        try:
+            outbox.put_nowait((best_solution, best_cost))
+        except queue.Full:
+            pass
+        received = None
+        while True:
+            try:
+                candidate = inbox.get_nowait()
+            except queue.Empty:
+                return received
+            if received is None or candidate[1] < received[1]:
+                received = candidate
 
-        for candidate in neighborhood:
-            cost = calculate_total_cost(candidate, distance_matrix, node_index_map)
-            if (candidate not in tabu_list or iteration - tabu_iterations.get(tuple(map(tuple, candidate)), 0) > tabu_tenure) and cost < best_candidate_cost:
-                best_candidate = candidate
-                best_candidate_cost = cost
+    try:
+        # Matrice des distances et listes de voisins lues en mémoire partagée (sans copie)
+        instance = shared_instance.attach()
+        node_coords = dict(instance["nodes"])
+        neighbors = neighbor_lists(instance["neighbor_array"], demands) if granular_k else None
+        # Budget de l'île : temps restant jusqu'à l'échéance commune (horloge murale) et part des évaluations
+        budget = None
+        if deadline is not None or max_evaluations is not None:
+            time_limit = max(0.0, deadline - time.time()) if deadline is not None else None
+            budget = SearchBudget(time_limit=time_limit, max_evaluations=max_evaluations)
+        solution, cost = tabu_search(node_coords, demands, capacity, max_iterations, tabu_tenure, depot_coords,
+                                     granular_k=granular_k, budget=budget, rng=seed, initial=initial,
+                                     migrate=migrate, migration_interval=migration_interval,
+                                     distance_matrix=instance["distance_matrix"], depot_node=depot_node,
+                                     neighbors=neighbors)
+        results.put((index, solution, cost, None, budget.stats() if budget is not None else None))
+    except Exception as error:
+        results.put((index, None, float('inf'), repr(error), None))
 
-        # Vérification pour éviter l'erreur 'NoneType'
-        if best_candidate is not None and best_candidate_cost < best_cost:
-            best_solution = best_candidate
-            best_cost = best_candidate_cost
+# Recherche tabou en îles : une île par processus, avec des durées tabou (5/10/20 par défaut), des graines
+# et des solutions initiales différentes ; les meilleures solutions migrent en anneau toutes les migration_interval itérations
+def island_tabu_search(node_coords, demands, capacity, max_iterations, depot_coords, tenures=(5, 10, 20),
+                       num_islands=None, migration_interval=50, granular_k=None, budget=None, rng=None,
+                       distance_matrix=None, depot_node=None):
+    if budget is not None:
+        budget.start()
+    rng = make_rng(rng)
+    num_islands = num_islands or len(tenures)
+    seeds = spawn_seeds(rng.getrandbits(63), num_islands)
+    # Échéance commune en temps mural (comptée depuis l'appel, lancement des processus inclus)
+    # et nombre d'évaluations réparti entre les îles
+    remaining = budget.remaining if budget is not None else None
+    deadline = time.time() + remaining if remaining is not None else None
+    max_evaluations = None
+    if budget is not None and budget.max_evaluations is not None:
+        max_evaluations = max(1, budget.max_evaluations // num_islands)
+    if max_iterations is None and deadline is None and max_evaluations is None:
+        raise ValueError("max_iterations=None requires a budget with a time or evaluation limit.")
 
-  
-            tabu_list.append(best_candidate)
-            tabu_iterations[tuple(map(tuple, best_candidate))] = iteration
+    # Coordonnées, matrice des distances et listes de voisins partagées par toutes les îles ;
+    # sans matrice fournie (voir tabu_search), celle des coordonnées avec le dépôt -1
+    node_coords = dict(node_coords)
+    if distance_matrix is None:
+        node_coords[-1] = depot_coords
+        distance_matrix, depot_node = get_distance_matrix({"nodes": node_coords}), -1
+    shared_instance = SharedInstance({"nodes": node_coords}, distance_matrix, neighbor_k=granular_k,
+                                     customers=list(demands))
 
- 
-            if len(tabu_list) > tabu_tenure:
-                tabu_list.pop(0)
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue(maxsize=num_islands) for _ in range(num_islands)]
+    results = context.Queue()
+    processes = [
+        context.Process(target=_run_island,
+                        args=(index, shared_instance, demands, capacity, max_iterations, tenures[index % len(tenures)],
+                              depot_coords, depot_node, INITIAL_SOLUTIONS[index % len(INITIAL_SOLUTIONS)], migration_interval,
+                              granular_k, deadline, max_evaluations, seeds[index], inboxes[index],
+                              inboxes[(index + 1) % num_islands], results))
+        for index in range(num_islands)
+    ]
+    try:
+        for process in processes:
+            process.start()
+        outcomes = []
+        while len(outcomes) < num_islands:
+            try:
+                outcomes.append(results.get(timeout=1))
+            except queue.Empty:
+                # Une île arrêtée brutalement (sans résultat) ne doit pas bloquer l'attente
+                if not any(process.is_alive() for process in processes) and results.empty():
+                    raise RuntimeError("Une île de la recherche tabou s'est arrêtée sans résultat")
+        for process in processes:
+            process.join()
+    finally:
+        shared_instance.close()
 
+    errors = [f"île {index} : {error}" for index, _, _, error, _ in outcomes if error is not None]
+    if errors:
+        raise RuntimeError("Échec de la recherche tabou en îles (" + "; ".join(errors) + ")")
+    _, best_solution, best_cost, _, _ = min(outcomes, key=lambda outcome: outcome[2])
+    if budget is not None:
+        # Itérations et évaluations dépensées par toutes les îles
+        for _, _, _, _, stats in outcomes:
+            budget.absorb(stats)
+        budget.improve(best_solution, best_cost)
     return best_solution, best_cost
 
 # filename = '../../data/A/A-n32-k5.vrp'  
@@ -0,0 +1,276 @@
+import math
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from recuitSimuleImpl import generate_initial_solution, perturbation_move
+from template_code.moves import RouteState
+from template_code.read_instances import read_instance
+from template_code.rng import make_rng, spawn_seeds
+from template_code.shared_instance import SharedInstance, neighbor_lists
+from template_code.verify_solution import verify_solution
+
+
+def temperature_ladder(initial_temp, final_temp, num_chains):
+    """Geometric temperatures from `initial_temp` (chain 0) down to `final_temp` (last chain)."""
+    if num_chains == 1:
+        return [final_temp]
+    ratio = (final_temp / initial_temp) ** (1 / (num_chains - 1))
+    return [initial_temp * ratio ** index for index in range(num_chains)]
+
+
+def encode_routes(routes, width, depot=0):
+    """Writes routes as a depot-separated giant tour padded with the depot (see batch_scoring.pack_tours)."""
+    row = np.full(width, depot, dtype=np.int32)
+    tour = [depot]
+    for route in routes:
+        tour.extend(route)
+        tour.append(depot)
+    row[:len(tour)] = tour
+    return row
+
+
+def decode_routes(row, depot=0):
+    """Reads back the routes of a depot-separated giant tour."""
+    routes, route = [], []
+    for node in row.tolist():
+        if node == depot:
+            if route:
+                routes.append(route)
+            route = []
+        else:
+            route.append(node)
+    return routes
+
+
+class ChainExchange:
+    """
+    Shared-memory blocks through which the chains publish their states.
+
+    Row `k` of `states` holds the current solution of chain k (encoded with
+    `encode_routes`) and `costs[k]` its cost; `best_states`/`best_costs` hold the
+    best solution each chain has seen, so the global best is read by the parent
+    without any locking. `evaluations[k]` counts the moves evaluated by chain k.
+    `stop` is set by chain 0 to the index of the reached limit in `STOP_REASONS`.
+    """
+
+    STOP_REASONS = (None, "time", "evaluations")
+
+    def __init__(self, num_chains, width, names=None):
+        int_size = (2 * num_chains * width + 1) * np.dtype(np.int32).itemsize
+        float_size = 2 * num_chains * np.dtype(np.float64).itemsize
+        count_size = num_chains * np.dtype(np.int64).itemsize
+        self.owner = names is None
+        if self.owner:
+            self._blocks = (shared_memory.SharedMemory(create=True, size=int_size),
+                            shared_memory.SharedMemory(create=True, size=float_size),
+                            shared_memory.SharedMemory(create=True, size=count_size))
+        else:
+            self._blocks = tuple(shared_memory.SharedMemory(name=name) for name in names)
+        integers = np.ndarray((2 * num_chains * width + 1,), dtype=np.int32, buffer=self._blocks[0].buf)
+        floats = np.ndarray((2 * num_chains,), dtype=np.float64, buffer=self._blocks[1].buf)
+        self.states = integers[:num_chains * width].reshape(num_chains, width)
+        self.best_states = integers[num_chains * width:-1].reshape(num_chains, width)
+        self.stop = integers[-1:]
+        self.costs = floats[:num_chains]
+        self.best_costs = floats[num_chains:]
+        self.evaluations = np.ndarray((num_chains,), dtype=np.int64, buffer=self._blocks[2].buf)
+        if self.owner:
+            integers[:] = 0
+            floats[:] = np.inf
+            self.evaluations[:] = 0
+
+    @property
+    def names(self):
+        return tuple(block.name for block in self._blocks)
+
+    def close(self):
+        """Releases the views, and the blocks themselves in the creating process."""
+        self.states = self.best_states = self.stop = self.costs = self.best_costs = self.evaluations = None
+        for block in self._blocks:
+            block.close()
+            if self.owner:
+                block.unlink()
+
+
+def exchange_pairs(costs, temperatures, round_index, exchange_seed):
+    """
+    Replica-exchange decisions of one round: chains k and k + 1 (k even on even
+    rounds, odd on odd rounds) swap states with probability
+    min(1, exp((1/T_k - 1/T_k+1) * (E_k - E_k+1))).
+
+    Every chain computes the same decisions from the shared costs and a random
+    stream derived from `exchange_seed` and the round, so no coordinator is needed.
+
+    Returns:
+        dict: {chain: partner} for the accepted swaps.
+    """
+    rng = random.Random(exchange_seed * 1000003 + round_index)
+    partners = {}
+    for first in range(round_index % 2, len(temperatures) - 1, 2):
+        second = first + 1
+        exponent = (1 / temperatures[first] - 1 / temperatures[second]) * (costs[first] - costs[second])
+        if exponent >= 0 or rng.random() < math.exp(exponent):
+            partners[first], partners[second] = second, first
+    return partners
+
+
+def _run_chain(index, shared_instance, temperatures, iterations_per_exchange, max_exchanges, deadline,
+               max_evaluations, granular_k, seed, exchange_seed, names, width, barrier):
+    """
+    Body of one chain process: annealing at a fixed temperature between two exchanges.
+    `deadline` is the wall-clock (time.time) end of the caller's budget, shared by all chains.
+    """
+    exchange = ChainExchange(len(temperatures), width, names)
+    try:
+        # Instance arrays and distance matrix read from shared memory, without copy
+        instance_data = shared_instance.attach()
+        rng = make_rng(seed)
+        demands = instance_data["demands"]
+        capacity = instance_data["capacity"]
+        num_vehicles = instance_data["trucks"]
+        distance_matrix = instance_data["distance_matrix"]
+        current_solution = generate_initial_solution(len(demands) - 1, num_vehicles, capacity, demands,
+                                                     distance_matrix, rng)
+        neighbors = None
+        if granular_k:
+            # Candidate lists computed once by the parent, read from shared memory
+            customers = [node for route in current_solution for node in route]
+            neighbors = neighbor_lists(instance_data["neighbor_array"], customers)
+        state = RouteState(current_solution, distance_matrix, demands, capacity, neighbors=neighbors)
+        temperature = temperatures[index]
+        best_cost = state.total_cost if state.overloaded == 0 else float('inf')
+        exchange.best_states[index] = encode_routes(state.routes, width)
+        exchange.best_costs[index] = best_cost
+        evaluations = 0
+
+        for round_index in range(max_exchanges):
+            for _ in range(iterations_per_exchange):
+                evaluations += 1
+                move = perturbation_move(state, rng)
+                if move is None or not state.keeps_feasible(move):
+                    continue
+                cost_diff = state.delta(move)
+                if cost_diff < 0 or rng.random() < math.exp(-cost_diff / temperature):
+                    state.apply(move)
+                    if state.overloaded == 0 and state.total_cost < best_cost - 1e-9:
+                        best_cost = state.total_cost
+                        exchange.best_states[index] = encode_routes(state.routes, width)
+                        exchange.best_costs[index] = best_cost
+
+            # Publish the state, then read the partner's one once every chain has published.
+            exchange.states[index] = encode_routes(state.routes, width)
+            exchange.costs[index] = state.total_cost if state.overloaded == 0 else float('inf')
+            exchange.evaluations[index] = evaluations
+            barrier.wait()
+            partner = exchange_pairs(exchange.costs.tolist(), temperatures, round_index, exchange_seed).get(index)
+            if partner is not None:
+                partner_routes = decode_routes(exchange.states[partner])
+            if index == 0:
+                if deadline is not None and time.time() >= deadline:
+                    exchange.stop[0] = ChainExchange.STOP_REASONS.index("time")
+                elif max_evaluations is not None and int(exchange.evaluations.sum()) >= max_evaluations:
+                    exchange.stop[0] = ChainExchange.STOP_REASONS.index("evaluations")
+            barrier.wait()
+            if partner is not None:
+                state = RouteState(partner_routes, distance_matrix, demands, capacity, neighbors=neighbors)
+            if exchange.stop[0]:
+                break
+    except threading.BrokenBarrierError:
+        pass  # Another chain failed, its exception is reported by the parent.
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        exchange.close()
+
+
+def parallel_tempering(instance_data, initial_temp, final_temp, num_chains=None, iterations_per_exchange=100,
+                       max_exchanges=100, granular_k=None, budget=None, rng=None):
+    """
+    Solves CVRP with parallel tempering: `num_chains` annealing chains at fixed
+    temperatures between `initial_temp` and `final_temp` run in worker processes
+    and periodically exchange their states through shared memory, so the hot
+    chains explore and the cold ones refine the best states found.
+
+    Every `iterations_per_exchange` iterations the chains publish their states,
+    neighbouring temperatures swap them with the replica-exchange (Metropolis)
+    criterion, and the search stops after `max_exchanges` rounds or, with a
+    `budget` (SearchBudget), once its time or evaluation limit is reached (checked
+    at each exchange, from the start of the call). The global best is the best of
+    the per-chain bests, and the moves evaluated by all chains are added to the budget.
+    `rng` is a seed, random.Random or numpy Generator: each chain gets its own child stream.
+    """
+    rng = make_rng(rng)
+    if budget is not None:
+        budget.start()
+    num_chains = num_chains or os.cpu_count() or 1
+    temperatures = temperature_ladder(initial_temp, final_temp, num_chains)
+    base_seed = rng.getrandbits(63)
+    seeds = spawn_seeds(base_seed, num_chains)
+    remaining = budget.remaining if budget is not None else None
+    deadline = time.time() + remaining if remaining is not None else None
+    max_evaluations = budget.max_evaluations if budget is not None else None
+
+    # Every route holds at least one customer, so a tour has at most 2 * customers + 1 entries.
+    width = 2 * (len(instance_data["demands"]) - 1) + 1
+    exchange = ChainExchange(num_chains, width)
+    # Customers of generate_initial_solution, for the shared granular candidate lists
+    shared_instance = SharedInstance(instance_data, neighbor_k=granular_k,
+                                     customers=range(1, len(instance_data["demands"])))
+    context = multiprocessing.get_context()
+    barrier = context.Barrier(num_chains)
+    try:
+        processes = [
+            context.Process(target=_run_chain,
+                            args=(index, shared_instance, temperatures, iterations_per_exchange, max_exchanges,
+                                  deadline, max_evaluations, granular_k, seeds[index], base_seed, exchange.names,
+                                  width, barrier))
+            for index in range(num_chains)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        failed = [index for index, process in enumerate(processes) if process.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"Parallel tempering chains {failed} failed.")
+        best_chain = int(np.argmin(exchange.best_costs))
+        best_cost = float(exchange.best_costs[best_chain])
+        if best_cost == float('inf'):
+            raise RuntimeError("No chain reached a feasible solution.")
+        best_solution = decode_routes(exchange.best_states[best_chain])
+        evaluations = int(exchange.evaluations.sum())
+        stop_reason = ChainExchange.STOP_REASONS[int(exchange.stop[0])]
+    finally:
+        exchange.close()
+        shared_instance.close()
+
+    if budget is not None:
+        # One move evaluation per annealing iteration, as in simulated_annealing
+        budget.absorb({'iterations': evaluations, 'evaluations': evaluations, 'stop_reason': stop_reason})
+        budget.improve(best_solution, best_cost)
+    return best_solution, best_cost
+
+
+if __name__ == "__main__":
+    # Example usage
+    file_path = "../../data/B/B-n34-k5.vrp"
+    instance_data = read_instance(file_path)
+
+    best_solution, best_cost = parallel_tempering(instance_data, 1000, 5, num_chains=4, rng=0)
+
+    is_feasible, violations, details = verify_solution(instance_data, best_solution)
+    for i, route in enumerate(best_solution):
+        print(f"Route #{i + 1}: {' '.join(map(str, route))}")
+    print(f"Cost {best_cost}")
+    print("The final solution is feasible." if is_feasible else f"The final solution is NOT feasible: {details}")
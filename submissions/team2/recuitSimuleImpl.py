@@ -1,56 +1,59 @@
 import math
-import random
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
 from template_code.read_instances import read_instance
 from template_code.verify_solution import verify_solution
-from template_code.verify_solution import euclidean_distance
+from template_code.distance_matrix import get_distance_matrix
+from template_code.moves import Move, RouteState
+from template_code.profiling import phase
+from template_code.rng import make_rng
+from template_code.spatial_index import nearest_neighbor_lists
+from template_code.split import split_tour
 
 
-def calculate_cost(solution, nodes):
-    """Calculates the total cost of a CVRP solution."""
+def calculate_cost(solution, nodes, distance_matrix=None):
+    """Calculates the total cost of a CVRP solution (`distance_matrix` is looked up from `nodes` when omitted)."""
     cost = 0
     depot = 0
+    if distance_matrix is None:
+        distance_matrix = get_distance_matrix({"nodes": nodes})
     for route in solution:
         prev_node = depot
         for node in route:
-            cost += euclidean_distance(nodes[prev_node], nodes[node])
+            cost += distance_matrix[prev_node, node]
             prev_node = node
-        cost += euclidean_distance(nodes[prev_node], nodes[depot])
+        cost += distance_matrix[prev_node, depot]
     return cost
 
 
-def generate_initial_solution(num_customers, num_vehicles, capacity, demands):
-    """Generates an initial random solution for CVRP."""
+def generate_initial_solution(num_customers, num_vehicles, capacity, demands, distance_matrix, rng=None):
+    """
+    Generates an initial random solution for CVRP: a shuffled giant tour optimally
+    split into capacity-feasible routes, exactly `num_vehicles` of them when possible
+    since swaps keep the number of routes.
+    """
     customers = list(range(1, num_customers + 1))
-    random.shuffle(customers)
-    solution = []
-    for _ in range(num_vehicles):
-        route = []
-        route_capacity = 0
-        while customers and (route_capacity + demands[customers[0]] <= 100):
-            customer = customers.pop(0)
-            route.append(customer)
-            route_capacity += demands[customer]
-        solution.append(route)
-
-    if customers: 
-        solution.append(customers)
-
+    make_rng(rng).shuffle(customers)
+    try:
+        solution, _ = split_tour(customers, distance_matrix, demands, capacity,
+                                 max_routes=num_vehicles, min_routes=num_vehicles)
+    except ValueError:
+        solution, _ = split_tour(customers, distance_matrix, demands, capacity)
     return solution
 
 
-def perturb_solution(solution):
+def perturb_solution(solution, rng=None):
     """Creates a new solution by perturbing the current one."""
+    rng = make_rng(rng)
     new_solution = [route[:] for route in solution]
 
     # Select two random routes and swap a customer between them
-    route1, route2 = random.sample(range(len(new_solution)), 2)
+    route1, route2 = rng.sample(range(len(new_solution)), 2)
     if new_solution[route1] and new_solution[route2]:
-        customer1 = random.choice(new_solution[route1])
-        customer2 = random.choice(new_solution[route2])
+        customer1 = rng.choice(new_solution[route1])
+        customer2 = rng.choice(new_solution[route2])
 
         new_solution[route1].remove(customer1)
         new_solution[route2].remove(customer2)
@@ -60,45 +63,101 @@ def perturb_solution(solution):
     return new_solution
 
 
-def simulated_annealing(instance_data, initial_temp, final_temp, alpha, max_iterations):
-    """Solves CVRP using simulated annealing."""
+def perturbation_move(state, rng=None):
+    """
+    Draws a swap of two customers between two random routes, or None if a route is empty.
+    In granular mode the second customer is one of the first one's nearest neighbors.
+    """
+    rng = make_rng(rng)
+    if state.neighbors is not None:
+        return state.random_move(kinds=("swap",), rng=rng)
+    route1, route2 = rng.sample(range(len(state.routes)), 2)
+    if not state.routes[route1] or not state.routes[route2]:
+        return None
+    return Move("swap", route1, rng.randrange(len(state.routes[route1])),
+                route2, rng.randrange(len(state.routes[route2])), 1)
+
+
+def simulated_annealing(instance_data, initial_temp, final_temp, alpha, max_iterations, granular_k=None, budget=None, trace=None, rng=None):
+    """
+    Solves CVRP using simulated annealing, optionally with a granular (k-nearest) swap neighborhood.
+    With a `budget` (SearchBudget), the search also stops on its time or evaluation limit.
+    With a `trace` (ConvergenceTrace), every iteration is recorded with its temperature.
+    `rng` is a seed, random.Random or numpy Generator (the global random module by default).
+    """
+    rng = make_rng(rng)
+    if budget is not None:
+        budget.start()
+    if trace is not None:
+        trace.start()
     nodes = instance_data["nodes"]
     demands = instance_data["demands"]
     capacity = instance_data["capacity"]
     num_vehicles = instance_data["trucks"]
     num_customers = len(demands)-1
-    print(num_customers)
    
 
-    current_solution = generate_initial_solution(num_customers, num_vehicles, capacity, demands)
-    current_cost = calculate_cost(current_solution, nodes)
-
-    best_solution = current_solution
+    with phase("matrix"):
+        distance_matrix = get_distance_matrix(instance_data)
+    with phase("construction"):
+        current_solution = generate_initial_solution(num_customers, num_vehicles, capacity, demands,
+                                                     distance_matrix, rng)
+    neighbors = None
+    if granular_k:
+        customers = [node for route in current_solution for node in route]
+        neighbors = nearest_neighbor_lists(distance_matrix, customers, granular_k)
+    state = RouteState(current_solution, distance_matrix, demands, capacity, neighbors=neighbors)
+    current_cost = state.total_cost
+
+    # Swaps keep the number of routes and the set of visited customers, so only the
+    # capacity of the two touched routes is checked per iteration; verify_solution
+    # remains the final audit of the returned solution.
+    routes_ok = num_vehicles is None or len(current_solution) == num_vehicles
+
+    best_solution = state.to_routes()
     best_cost = current_cost
+    if budget is not None:
+        budget.improve(best_solution, best_cost)
     temperature = initial_temp
-
-    while temperature > final_temp:
-        for _ in range(max_iterations):
-            new_solution = perturb_solution(current_solution)
-            is_feasible, total_cost, message = verify_solution(instance_data, new_solution)
-            if not is_feasible:
-                # print(is_feasible,total_cost,message)
-                continue
-
-            new_cost = calculate_cost(new_solution, nodes)
-            cost_diff = new_cost - current_cost
-
-            if cost_diff < 0 or random.random() < math.exp(-cost_diff / temperature):
-                current_solution = new_solution
-                current_cost = new_cost
-                temperature *= alpha
-                print(f"Current Solution: {current_solution}, Current Cost: {current_cost}, Temperature: {temperature}")
-
-                if current_cost < best_cost:
-                    best_solution = current_solution
-                    best_cost = current_cost
-
-            if temperature < final_temp:
+    step = 0
+
+    with phase("improvement"):
+        while temperature > final_temp:
+            for _ in range(max_iterations):
+                if budget is not None and budget.spend():
+                    break
+                step += 1
+                move = perturbation_move(state, rng)
+                if move is None and neighbors is not None:
+                    continue  # Granular draw without a valid swap
+                if move is None:
+                    is_feasible, cost_diff = routes_ok and state.overloaded == 0, 0.0
+                else:
+                    is_feasible = routes_ok and state.keeps_feasible(move)
+                    cost_diff = state.delta(move) if is_feasible else 0.0
+                if not is_feasible:
+                    if trace is not None:
+                        trace.record(step, current_cost, best_cost, temperature, accepted=False)
+                    continue
+
+                accepted = cost_diff < 0 or rng.random() < math.exp(-cost_diff / temperature)
+                if accepted:
+                    if move is not None:
+                        state.apply(move)
+                    current_cost = state.total_cost
+                    temperature *= alpha
+
+                    if current_cost < best_cost:
+                        best_solution = state.to_routes()
+                        best_cost = current_cost
+                        if budget is not None:
+                            budget.improve(best_solution, best_cost)
+                if trace is not None:
+                    trace.record(step, current_cost, best_cost, temperature, accepted)
+
+                if temperature < final_temp:
+                    break
+            if budget is not None and budget.exhausted:
                 break
 
     return best_solution, best_cost
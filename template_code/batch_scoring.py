@@ -0,0 +1,99 @@
+import numpy as np
+
+
+def demand_vector(demands, size):
+    """
+    Packs node demands into an array indexed by node ID.
+
+    Args:
+        demands (dict): Node demands as {node_id: demand}.
+        size (int): Length of the array, i.e. the number of rows of the distance matrix.
+
+    Returns:
+        numpy.ndarray: Demands indexed by node ID, 0 for the depot and missing nodes.
+    """
+    vector = np.zeros(size, dtype=np.float64)
+    for node, demand in demands.items():
+        vector[node] = demand
+    return vector
+
+
+def pack_tours(solutions, depot=0):
+    """
+    Packs candidate solutions into a padded array of depot-separated giant tours.
+
+    Every row reads `depot, route 1, depot, route 2, ..., depot` and is padded
+    with the depot, so padding only adds depot-to-depot edges of length 0.
+
+    Args:
+        solutions (list): Candidate solutions, each a list of routes (or a `Solution`).
+        depot (int): Depot node ID (row of the distance matrix).
+
+    Returns:
+        numpy.ndarray: int32 array of shape (len(solutions), max tour length).
+    """
+    tours = []
+    for routes in solutions:
+        tour = [depot]
+        for route in routes:
+            tour.extend(route)
+            tour.append(depot)
+        tours.append(tour)
+    width = max((len(tour) for tour in tours), default=1)
+    packed = np.full((len(tours), width), depot, dtype=np.int32)
+    for row, tour in enumerate(tours):
+        packed[row, :len(tour)] = tour
+    return packed
+
+
+def score_tours(tours, distance_matrix, demand_array, depot=0):
+    """
+    Scores a batch of packed giant tours with one gather over the distance matrix.
+
+    Args:
+        tours (numpy.ndarray): Output of `pack_tours`.
+        distance_matrix (numpy.ndarray): Matrix indexed by node ID.
+        demand_array (numpy.ndarray): Demands indexed by node ID (see `demand_vector`).
+        depot (int): Depot node ID used as separator and padding.
+
+    Returns:
+        tuple: (costs, loads) where costs has shape (n,) and loads has shape
+        (n, max routes); loads of missing routes are 0.
+    """
+    costs = distance_matrix[tours[:, :-1], tours[:, 1:]].sum(axis=1, dtype=np.float64)
+
+    # Route index of each position: number of depot separators seen before it.
+    separators = tours == depot
+    route_index = np.cumsum(separators, axis=1) - 1
+    width = int(route_index[:, -1].max()) + 1 if tours.size else 1
+    offsets = np.arange(len(tours))[:, None] * width
+    loads = np.bincount(
+        (route_index + offsets).ravel(),
+        weights=demand_array[tours].ravel(),
+        minlength=len(tours) * width,
+    ).reshape(len(tours), width)
+    return costs, loads
+
+
+def best_candidate(solutions, distance_matrix, demand_array, capacity, depot=0):
+    """
+    Returns the cheapest capacity-feasible candidate of a batch.
+
+    Args:
+        solutions (list): Candidate solutions, each a list of routes.
+        distance_matrix (numpy.ndarray): Matrix indexed by node ID.
+        demand_array (numpy.ndarray): Demands indexed by node ID (see `demand_vector`).
+        capacity (int): Vehicle capacity.
+        depot (int): Depot node ID.
+
+    Returns:
+        tuple: (index, cost) of the best feasible candidate, or (None, inf) if none is feasible.
+    """
+    if not solutions:
+        return None, float('inf')
+    costs, loads = score_tours(pack_tours(solutions, depot), distance_matrix, demand_array, depot)
+    costs[(loads > capacity).any(axis=1)] = np.inf
+    index = int(np.argmin(costs))
+    if not np.isfinite(costs[index]):
+        return None, float('inf')
+    return index, float(costs[index])
@@ -0,0 +1,388 @@
+"""
+Benchmark suite over the Augerat instances with statistical regression detection.
+
+Usage (from the repository root):
+
+    python -m template_code.benchmark --solvers tabu local greedy --seeds 5
+    python -m template_code.benchmark --baseline benchmarks/<revision>.json
+
+Every solver is run on every instance with fixed seeds. Runtime, move
+evaluations per second, gap to the `.sol` optimum and peak memory are stored as
+JSON (`benchmarks/<git revision>.json` by default). With `--baseline`, the mean
+runtime and gap of each (solver, instance) pair are compared to the baseline
+with a 95% Welch confidence interval and the command exits with status 1 if a
+regression is detected.
+"""
+import argparse
+import inspect
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+try:
+    from .budget import SearchBudget
+    from .parallel_evaluation import find_instances, load_instances
+    from .profiling import git_revision
+    from .rng import make_rng
+    from .solvers import REPO_ROOT, SOLVERS, resolve_solver
+    from .verify_solution import verify_solution
+except ImportError:
+    from budget import SearchBudget
+    from parallel_evaluation import find_instances, load_instances
+    from profiling import git_revision
+    from rng import make_rng
+    from solvers import REPO_ROOT, SOLVERS, resolve_solver
+    from verify_solution import verify_solution
+
+BENCHMARKS_DIR = os.path.join(REPO_ROOT, "benchmarks")
+
+# Two-sided 95% Student t quantiles for 1 to 30 degrees of freedom (normal beyond).
+_T_975 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+          2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+          2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+def t_critical(df):
+    """
+    Returns:
+        float: Two-sided 95% quantile of the Student t distribution with `df` degrees of freedom.
+    """
+    if df < 1:
+        return float('inf')
+    index = int(math.floor(df))
+    return _T_975[index - 1] if index <= len(_T_975) else 1.96
+
+
+def mean_ci(values):
+    """
+    Args:
+        values (list): Samples.
+
+    Returns:
+        tuple: (mean, half width of the 95% confidence interval).
+    """
+    mean = statistics.mean(values)
+    if len(values) < 2:
+        return mean, float('inf')
+    return mean, t_critical(len(values) - 1) * statistics.stdev(values) / math.sqrt(len(values))
+
+
+def difference_ci(new, old):
+    """
+    Welch confidence interval of mean(new) - mean(old).
+
+    Args:
+        new (list): Samples of the candidate.
+        old (list): Samples of the baseline.
+
+    Returns:
+        tuple: (difference of the means, half width of the 95% confidence interval).
+    """
+    difference = statistics.mean(new) - statistics.mean(old)
+    if len(new) < 2 or len(old) < 2:
+        return difference, float('inf')
+    var_new = statistics.variance(new) / len(new)
+    var_old = statistics.variance(old) / len(old)
+    se = math.sqrt(var_new + var_old)
+    if se == 0:
+        return difference, 0.0
+    df = (var_new + var_old) ** 2 / (var_new ** 2 / (len(new) - 1) + var_old ** 2 / (len(old) - 1))
+    return difference, t_critical(df) * se
+
+
+def _keywords(solver):
+    try:
+        return set(inspect.signature(solver).parameters) & {'budget', 'rng'}
+    except (TypeError, ValueError):
+        return set()
+
+
+def _run_once(solver, instance_data, parameter, seed, time_limit, keywords):
+    rng = make_rng(seed)
+    random.seed(seed)  # Solvers without an `rng` keyword draw from the global module
+    budget = SearchBudget(time_limit=time_limit) if 'budget' in keywords else None
+    kwargs = {'budget': budget, 'rng': rng}
+    start = time.perf_counter()
+    solution, cost = solver(instance_data, parameter, **{key: kwargs[key] for key in keywords})
+    runtime = time.perf_counter() - start
+    evaluations = budget.evaluations if budget is not None else None
+    return solution, float(cost), runtime, evaluations
+
+
+def run_benchmark(solver_specs, instance_paths, seeds=range(5), parameter=None, time_limit=10.0,
+                  measure_memory=True):
+    """
+    Runs every solver on every instance once per seed.
+
+    Before the timed runs of each (solver, instance) pair, an untimed warm-up run
+    (first seed) fills the caches; with `measure_memory` it runs under tracemalloc
+    to measure the peak memory.
+
+    Args:
+        solver_specs (list): Solver names from SOLVERS or `path.py:function` specs.
+        instance_paths (list): Paths of the .vrp files.
+        seeds (iterable): Seeds of the timed runs.
+        parameter: Parameter passed to every solver.
+        time_limit (float): Wall-clock budget per run, for solvers accepting a `budget`.
+        measure_memory (bool): Measure the peak memory during the warm-up run.
+
+    Returns:
+        list: Run records.
+    """
+    seeds = list(seeds)
+    instances = load_instances(instance_paths)
+    records = []
+    for spec in solver_specs:
+        solver = resolve_solver(spec)
+        keywords = _keywords(solver)
+        for instance_path, (instance_data, optimal_cost, _) in instances.items():
+            if measure_memory:
+                tracemalloc.start()
+            _run_once(solver, instance_data, parameter, seeds[0], time_limit, keywords)
+            peak_memory = tracemalloc.get_traced_memory()[1] if measure_memory else None
+            if measure_memory:
+                tracemalloc.stop()
+
+            for seed in seeds:
+                solution, cost, runtime, evaluations = _run_once(
+                    solver, instance_data, parameter, seed, time_limit, keywords)
+                # Same checks as the evaluators: capacity and coverage, no truck count.
+                is_valid = verify_solution(
+                    {key: instance_data[key] for key in ("name", "file_hash", "nodes", "demands", "capacity")},
+                    solution
+                )[0]
+                records.append({
+                    'solver': spec,
+                    'instance': os.path.basename(instance_path),
+                    'seed': seed,
+                    'cost': cost,
+                    'valid': bool(is_valid),
+                    'runtime': runtime,
+                    'evaluations': evaluations,
+                    'evaluations_per_second': evaluations / runtime if evaluations and runtime > 0 else None,
+                    'gap': (cost - optimal_cost) / optimal_cost * 100 if optimal_cost else None,
+                    'peak_memory': peak_memory,
+                })
+    return records
+
+
+def summarize(records):
+    """
+    Aggregates run records per solver and instance.
+
+    Args:
+        records (list): Output of `run_benchmark`.
+
+    Returns:
+        dict: {solver: {instance: statistics}} with means and 95% confidence half widths.
+    """
+    grouped = {}
+    for record in records:
+        grouped.setdefault(record['solver'], {}).setdefault(record['instance'], []).append(record)
+    summary = {}
+    for solver, by_instance in grouped.items():
+        summary[solver] = {}
+        for instance, runs in sorted(by_instance.items()):
+            runtime, runtime_ci = mean_ci([run['runtime'] for run in runs])
+            gaps = [run['gap'] for run in runs if run['gap'] is not None]
+            gap, gap_ci = mean_ci(gaps) if gaps else (None, None)
+            speeds = [run['evaluations_per_second'] for run in runs if run['evaluations_per_second']]
+            summary[solver][instance] = {
+                'runs': len(runs),
+                'cost_mean': statistics.mean(run['cost'] for run in runs),
+                'cost_min': min(run['cost'] for run in runs),
+                'runtime_mean': runtime,
+                'runtime_ci': runtime_ci,
+                'gap_mean': gap,
+                'gap_ci': gap_ci,
+                'evaluations_per_second': statistics.mean(speeds) if speeds else None,
+                'valid_rate': sum(run['valid'] for run in runs) / len(runs) * 100,
+                'peak_memory': runs[0]['peak_memory'],
+            }
+    return summary
+
+
+def compare(results, baseline, threshold=0.05):
+    """
+    Flags runtime and gap regressions against a baseline.
+
+    A runtime regression is a slowdown whose whole 95% interval is above zero and
+    whose mean exceeds `threshold` (relative). A gap regression is an increase
+    of the gap to the optimum whose whole 95% interval is above zero.
+
+    Args:
+        results (dict): Benchmark results (see `save_results`).
+        baseline (dict): Baseline results, same format.
+        threshold (float): Minimal relative slowdown reported.
+
+    Returns:
+        list: Findings as dicts (solver, instance, metric, status, change, ci).
+    """
+    def samples(data):
+        grouped = {}
+        for record in data['runs']:
+            grouped.setdefault((record['solver'], record['instance']), []).append(record)
+        return grouped
+
+    new_runs, old_runs = samples(results), samples(baseline)
+    findings = []
+    for key in sorted(set(new_runs) & set(old_runs)):
+        new, old = new_runs[key], old_runs[key]
+        old_runtime = statistics.mean(run['runtime'] for run in old)
+        difference, half_width = difference_ci([run['runtime'] for run in new], [run['runtime'] for run in old])
+        relative = difference / old_runtime if old_runtime else 0.0
+        if difference - half_width > 0 and relative > threshold:
+            status = "regression"
+        elif difference + half_width < 0 and -relative > threshold:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        findings.append({'solver': key[0], 'instance': key[1], 'metric': 'runtime', 'status': status,
+                         'change': relative, 'ci': half_width / old_runtime if old_runtime else None})
+
+        new_gaps = [run['gap'] for run in new if run['gap'] is not None]
+        old_gaps = [run['gap'] for run in old if run['gap'] is not None]
+        if new_gaps and old_gaps:
+            difference, half_width = difference_ci(new_gaps, old_gaps)
+            if difference - half_width > 0:
+                status = "regression"
+            elif difference + half_width < 0:
+                status = "improvement"
+            else:
+                status = "unchanged"
+            findings.append({'solver': key[0], 'instance': key[1], 'metric': 'gap', 'status': status,
+                             'change': difference, 'ci': half_width})
+    return findings
+
+
+def save_results(records, path, metadata=None):
+    """
+    Writes the runs, their summary and the run metadata to a JSON file.
+
+    Returns:
+        dict: The saved results.
+    """
+    results = {
+        'metadata': dict(metadata or {}, revision=git_revision(), python=sys.version.split()[0],
+                         date=time.strftime("%Y-%m-%dT%H:%M:%S")),
+        'summary': summarize(records),
+        'runs': records,
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+    return results
+
+
+def load_results(path):
+    """
+    Reads results written by `save_results`.
+
+    Returns:
+        dict: metadata, summary and runs.
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+def latest_results(path=None):
+    """
+    Reads benchmark results, by default the most recent file of `BENCHMARKS_DIR`.
+
+    Args:
+        path (str): Results file, None for the latest one.
+
+    Returns:
+        dict: metadata, summary and runs.
+
+    Raises:
+        FileNotFoundError: If `path` is None and no results were saved yet.
+    """
+    if path is None:
+        names = os.listdir(BENCHMARKS_DIR) if os.path.isdir(BENCHMARKS_DIR) else []
+        paths = [os.path.join(BENCHMARKS_DIR, name) for name in names if name.endswith('.json')]
+        if not paths:
+            raise FileNotFoundError(f"No benchmark results in {BENCHMARKS_DIR}, "
+                                    f"run `python -m template_code.benchmark` first.")
+        path = max(paths, key=os.path.getmtime)
+    return load_results(path)
+
+
+def solver_summaries(results, solvers):
+    """
+    Selects the summaries of some solvers on the instances they were all run on.
+
+    Args:
+        results (dict): Benchmark results (see `save_results`).
+        solvers (list): Solver names.
+
+    Returns:
+        tuple: (sorted instance names, list of {instance: statistics} in the order of `solvers`).
+
+    Raises:
+        ValueError: If a solver is not in the results.
+    """
+    summary = results['summary']
+    missing = [solver for solver in solvers if solver not in summary]
+    if missing:
+        raise ValueError(f"Solvers {missing} are not in the benchmark results (available: {sorted(summary)}).")
+    instances = sorted(set.intersection(*(set(summary[solver]) for solver in solvers)))
+    return instances, [summary[solver] for solver in solvers]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark CVRP solvers on the Augerat instances.")
+    parser.add_argument("--solvers", nargs="+", default=sorted(SOLVERS),
+                        help=f"Solvers among {sorted(SOLVERS)} or path/to/file.py:function specs")
+    parser.add_argument("--data", nargs="+", default=[os.path.join(REPO_ROOT, "data")],
+                        help=".vrp files or directories")
+    parser.add_argument("--seeds", type=int, default=5, help="Number of seeded runs per instance")
+    parser.add_argument("--parameter", type=json.loads, default=None, help="Solver parameter (JSON value)")
+    parser.add_argument("--time-limit", type=float, default=10.0, help="Wall-clock budget per run in seconds")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the peak memory measurement")
+    parser.add_argument("--output", help="Results file, defaults to benchmarks/<revision>.json")
+    parser.add_argument("--baseline", help="Results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.05, help="Minimal relative slowdown reported")
+    args = parser.parse_args(argv)
+
+    instance_paths = []
+    for path in args.data:
+        instance_paths.extend(find_instances(path) if os.path.isdir(path) else [path])
+    records = run_benchmark(args.solvers, instance_paths, range(args.seeds), args.parameter,
+                            args.time_limit, not args.no_memory)
+    output = args.output or os.path.join(BENCHMARKS_DIR, f"{git_revision()}.json")
+    results = save_results(records, output, {'seeds': args.seeds, 'parameter': args.parameter,
+                                             'time_limit': args.time_limit})
+
+    print(f"{'solver':<12} {'instance':<16} {'runtime (s)':>16} {'gap (%)':>16} {'evals/s':>10} {'memory (KiB)':>13}")
+    for solver, by_instance in results['summary'].items():
+        for instance, stats in by_instance.items():
+            gap = "-" if stats['gap_mean'] is None else f"{stats['gap_mean']:.2f} ± {stats['gap_ci']:.2f}"
+            speed = "-" if stats['evaluations_per_second'] is None else f"{stats['evaluations_per_second']:.0f}"
+            memory = "-" if stats['peak_memory'] is None else f"{stats['peak_memory'] / 1024:.0f}"
+            print(f"{solver:<12} {instance:<16} {stats['runtime_mean']:>8.4f} ± {stats['runtime_ci']:<5.4f} "
+                  f"{gap:>16} {speed:>10} {memory:>13}")
+    print(f"Results written to {output}")
+
+    if args.baseline:
+        findings = compare(results, load_results(args.baseline), args.threshold)
+        regressions = [finding for finding in findings if finding['status'] == "regression"]
+        for finding in findings:
+            if finding['status'] != "unchanged":
+                unit = "%" if finding['metric'] == 'runtime' else " pts"
+                scale = 100 if finding['metric'] == 'runtime' else 1
+                print(f"{finding['status'].upper():<12} {finding['solver']} {finding['instance']} "
+                      f"{finding['metric']}: {finding['change'] * scale:+.2f}{unit} (± {finding['ci'] * scale:.2f})")
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
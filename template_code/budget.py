@@ -0,0 +1,144 @@
+import itertools
+import time
+
+
+class SearchBudget:
+    """
+    Wall-clock and move-evaluation limits shared by the anytime solvers.
+
+    Solvers call `spend` once per batch of evaluated moves and stop as soon as it
+    returns True. The clock is only read every `check_interval` calls, so the
+    check stays cheap in hot loops. The best solution found so far is kept here
+    (see `improve`), so callers get an answer even when the search is cut short.
+    """
+
+    def __init__(self, time_limit=None, max_evaluations=None, callback=None, check_interval=16):
+        """
+        Args:
+            time_limit (float): Wall-clock budget in seconds, None for no limit.
+            max_evaluations (int): Maximum number of move evaluations, None for no limit.
+            callback (callable): Called as callback(best_solution, best_cost, stats) on
+                every improvement of the best solution.
+            check_interval (int): Number of `spend` calls between two clock reads.
+        """
+        self.time_limit = time_limit
+        self.max_evaluations = max_evaluations
+        self.callback = callback
+        self.check_interval = max(1, check_interval)
+        self.best_solution = None
+        self.best_cost = float('inf')
+        self.start()
+
+    def start(self):
+        """
+        Resets the counters and starts the clock.
+        """
+        self.start_time = time.perf_counter()
+        self.deadline = None if self.time_limit is None else self.start_time + self.time_limit
+        self.evaluations = 0
+        self.iterations = 0
+        self.improvements = 0
+        self.stop_reason = None
+        self._countdown = self.check_interval
+
+    @property
+    def elapsed(self):
+        """float: Seconds since `start`."""
+        return time.perf_counter() - self.start_time
+
+    @property
+    def exhausted(self):
+        """bool: Whether a limit has been reached."""
+        return self.stop_reason is not None
+
+    @property
+    def remaining(self):
+        """float: Seconds left before the time limit (0 once reached), None without a time limit."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.perf_counter())
+
+    def spend(self, evaluations=1):
+        """
+        Records one iteration and its move evaluations.
+
+        Args:
+            evaluations (int): Number of moves evaluated during the iteration.
+
+        Returns:
+            bool: True if the search must stop.
+        """
+        self.iterations += 1
+        self.evaluations += evaluations
+        if self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+            self.stop_reason = "evaluations"
+        elif self.deadline is not None:
+            self._countdown -= 1
+            if self._countdown <= 0:
+                self._countdown = self.check_interval
+                if time.perf_counter() >= self.deadline:
+                    self.stop_reason = "time"
+        return self.stop_reason is not None
+
+    def absorb(self, stats):
+        """
+        Adds the iterations and evaluations of a search run elsewhere, e.g. in a
+        worker process, to the counters.
+
+        Args:
+            stats (dict): `stats()` of the budget used by that search.
+        """
+        self.iterations += stats['iterations']
+        self.evaluations += stats['evaluations']
+        if self.stop_reason is None:
+            self.stop_reason = stats['stop_reason']
+
+    def improve(self, solution, cost):
+        """
+        Records a new best solution and notifies the callback.
+
+        Args:
+            solution (list of lists): The new best routes (not copied).
+            cost (float): Their cost.
+        """
+        self.best_solution = solution
+        self.best_cost = cost
+        self.improvements += 1
+        if self.callback is not None:
+            self.callback(solution, cost, self.stats())
+
+    def stats(self):
+        """
+        Returns:
+            dict: elapsed time, iterations, evaluations, evaluations per second,
+            improvements, best cost and stop reason (None while running or if the
+            search ended on its own criterion).
+        """
+        elapsed = self.elapsed
+        return {
+            'elapsed': elapsed,
+            'iterations': self.iterations,
+            'evaluations': self.evaluations,
+            'evaluations_per_second': self.evaluations / elapsed if elapsed > 0 else 0.0,
+            'improvements': self.improvements,
+            'best_cost': self.best_cost,
+            'stop_reason': self.stop_reason,
+        }
+
+
+def iteration_range(max_iterations, budget=None):
+    """
+    Iterates over iteration numbers, without end if only a budget bounds the search.
+
+    Args:
+        max_iterations (int): Iteration limit, None to rely on the budget.
+        budget (SearchBudget): Budget of the search.
+
+    Returns:
+        iterable: Iteration numbers starting at 0.
+    """
+    if max_iterations is not None:
+        return range(max_iterations)
+    if budget is None or (budget.time_limit is None and budget.max_evaluations is None):
+        raise ValueError("max_iterations=None requires a budget with a time or evaluation limit.")
+    return itertools.count()
@@ -0,0 +1,199 @@
+import numpy as np
+
+
+def clarke_wright_savings(distance_matrix, demands, capacity, depot=0, customers=None):
+    """
+    Builds routes with the parallel Clarke-Wright savings heuristic.
+
+    Savings s(i, j) = d(depot, i) + d(depot, j) - d(i, j) are computed for all
+    customer pairs at once from the distance matrix and processed in decreasing
+    order. Routes are only tracked through their endpoints: `other_end` links
+    the two ends of each route and `load` is stored on both, so checking and
+    performing a merge is O(1). Routes are rebuilt from the adjacency links at
+    the end. Overall O(n^2 log n) for the sort.
+
+    Args:
+        distance_matrix (numpy.ndarray): Matrix indexed by node ID.
+        demands (dict): Node demands as {node_id: demand}.
+        capacity (int): Vehicle capacity.
+        depot (int): Depot node ID (row of the distance matrix).
+        customers (iterable): Customers to route, defaults to the keys of `demands`.
+
+    Returns:
+        list of lists: Routes without the depot.
+    """
+    customers = list(demands if customers is None else customers)
+    if not customers:
+        return []
+    columns = np.array(customers, dtype=np.intp)
+    from_depot = np.asarray(distance_matrix[depot, columns], dtype=np.float64)
+    savings = from_depot[:, None] + from_depot[None, :] - distance_matrix[np.ix_(columns, columns)]
+    rows, cols = np.triu_indices(len(customers), k=1)
+    values = savings[rows, cols]
+    keep = values > 0
+    rows, cols, values = rows[keep], cols[keep], values[keep]
+    order = np.argsort(-values, kind='stable')
+
+    other_end = list(range(len(customers)))
+    load = [demands[customer] for customer in customers]
+    links = [[] for _ in customers]
+
+    for i, j in zip(rows[order].tolist(), cols[order].tolist()):
+        # Both customers must be route endpoints (0 or 1 link) of two different routes.
+        if len(links[i]) > 1 or len(links[j]) > 1 or other_end[i] == j:
+            continue
+        merged_load = load[i] + load[j]
+        if merged_load > capacity:
+            continue
+        end_i, end_j = other_end[i], other_end[j]
+        links[i].append(j)
+        links[j].append(i)
+        other_end[end_i] = end_j
+        other_end[end_j] = end_i
+        load[end_i] = load[end_j] = merged_load
+
+    routes = []
+    visited = [False] * len(customers)
+    for start in range(len(customers)):
+        if visited[start] or len(links[start]) > 1:
+            continue
+        route = []
+        previous, node = None, start
+        while node is not None:
+            visited[node] = True
+            route.append(customers[node])
+            following = [neighbor for neighbor in links[node] if neighbor != previous]
+            previous, node = node, (following[0] if following else None)
+        routes.append(route)
+    return routes
+
+
+def _polar_angles(coordinates, depot, nodes):
+    offsets = coordinates[nodes] - coordinates[depot]
+    return np.arctan2(offsets[:, 1], offsets[:, 0])
+
+
+def _nearest_neighbor_order(coordinates, depot, members):
+    """Orders a cluster by nearest neighbor from the depot, using its coordinates only."""
+    points = coordinates[members]
+    remaining = np.ones(len(members), dtype=bool)
+    current = coordinates[depot]
+    order = []
+    for _ in range(len(members)):
+        distances = np.where(remaining, np.hypot(*(points - current).T), np.inf)
+        nearest = int(np.argmin(distances))
+        remaining[nearest] = False
+        order.append(int(members[nearest]))
+        current = points[nearest]
+    return order
+
+
+def sweep_routes(coordinates, demands, capacity, depot=0, customers=None, start_angle=None):
+    """
+    Builds routes with the sweep heuristic.
+
+    Customers are sorted by polar angle around the depot and cut into
+    consecutive capacity-feasible routes, each then ordered by nearest neighbor
+    from the depot. O(n log n) plus the (small) routes' ordering.
+
+    Args:
+        coordinates (numpy.ndarray): Coordinates indexed by node ID (see `distance_matrix.node_coordinates`).
+        demands (dict): Node demands as {node_id: demand}.
+        capacity (int): Vehicle capacity.
+        depot (int): Depot node ID (row of `coordinates`).
+        customers (iterable): Customers to route, defaults to the keys of `demands`.
+        start_angle (float): Angle where the sweep starts, in radians. Defaults to the
+            middle of the widest angular gap between customers.
+
+    Returns:
+        list of lists: Routes without the depot.
+    """
+    customers = np.array(list(demands if customers is None else customers), dtype=np.intp)
+    if not len(customers):
+        return []
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    angles = _polar_angles(coordinates, depot, customers)
+    if start_angle is None:
+        ordered = np.sort(angles)
+        gaps = np.diff(np.append(ordered, ordered[0] + 2 * np.pi))
+        widest = int(np.argmax(gaps))
+        start_angle = ordered[widest] + gaps[widest] / 2
+    order = np.argsort(np.mod(angles - start_angle, 2 * np.pi), kind='stable')
+
+    routes = []
+    route, load = [], 0
+    for customer in customers[order].tolist():
+        demand = demands[customer]
+        if route and load + demand > capacity:
+            routes.append(route)
+            route, load = [], 0
+        route.append(customer)
+        load += demand
+    routes.append(route)
+    return [_nearest_neighbor_order(coordinates, depot, np.array(route, dtype=np.intp)) for route in routes]
+
+
+def cluster_routes(coordinates, demands, capacity, depot=0, customers=None, iterations=20):
+    """
+    Cluster-first route-second construction with capacitated k-means.
+
+    Centroids start at the centroids of the sweep routes and are refined by Lloyd
+    iterations where each customer, closest first, joins the nearest centroid that
+    still has capacity (a new cluster is opened when none has). Each cluster is
+    then routed by nearest neighbor from the depot.
+
+    Args:
+        coordinates (numpy.ndarray): Coordinates indexed by node ID.
+        demands (dict): Node demands as {node_id: demand}.
+        capacity (int): Vehicle capacity.
+        depot (int): Depot node ID (row of `coordinates`).
+        customers (iterable): Customers to route, defaults to the keys of `demands`.
+        iterations (int): Maximum number of Lloyd iterations.
+
+    Returns:
+        list of lists: Routes without the depot.
+    """
+    customers = np.array(list(demands if customers is None else customers), dtype=np.intp)
+    if not len(customers):
+        return []
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    points = coordinates[customers]
+    weights = np.array([demands[customer] for customer in customers.tolist()], dtype=np.float64)
+
+    seeds = sweep_routes(coordinates, demands, capacity, depot, customers.tolist())
+    centroids = np.array([coordinates[route].mean(axis=0) for route in seeds])
+
+    labels = None
+    for _ in range(iterations):
+        distances = np.hypot(points[:, None, 0] - centroids[None, :, 0], points[:, None, 1] - centroids[None, :, 1])
+        nearest = np.argmin(distances, axis=1)
+        new_labels = np.empty(len(customers), dtype=np.intp)
+        loads = np.zeros(len(centroids))
+        for index in np.argsort(distances[np.arange(len(customers)), nearest], kind='stable').tolist():
+            cluster = int(nearest[index])
+            if loads[cluster] + weights[index] > capacity:
+                # Nearest centroid full: try the others by increasing distance.
+                for cluster in np.argsort(distances[index], kind='stable').tolist():
+                    if loads[cluster] + weights[index] <= capacity:
+                        break
+                else:
+                    # No centroid has room left: open a cluster on this customer,
+                    # which the customers placed after it can join.
+                    cluster = len(loads)
+                    loads = np.append(loads, 0.0)
+                    centroids = np.vstack([centroids, points[index]])
+                    distances = np.column_stack([distances, np.hypot(*(points - points[index]).T)])
+            new_labels[index] = cluster
+            loads[cluster] += weights[index]
+        if labels is not None and np.array_equal(labels, new_labels):
+            break
+        labels = new_labels
+        counts = np.bincount(labels, minlength=len(loads))
+        used = counts > 0
+        sums = np.zeros((len(loads), 2))
+        np.add.at(sums, labels, points)
+        centroids = sums[used] / counts[used][:, None]
+        labels = np.cumsum(used)[labels] - 1
+
+    return [_nearest_neighbor_order(coordinates, depot, customers[labels == cluster])
+            for cluster in range(int(labels.max()) + 1)]
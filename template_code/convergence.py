@@ -0,0 +1,125 @@
+import csv
+import time
+
+import numpy as np
+
+# One trace sample. `parameter` holds the temperature (annealing) or the tabu tenure.
+TRACE_DTYPE = np.dtype([
+    ("iteration", np.int64),
+    ("elapsed", np.float64),
+    ("current_cost", np.float64),
+    ("best_cost", np.float64),
+    ("parameter", np.float64),
+    ("accepted", np.bool_),
+])
+
+
+class ConvergenceTrace:
+    """
+    Search progress recorded in a preallocated NumPy ring buffer.
+
+    Solvers take `trace=None` and only call `record` when a trace is given, so a
+    disabled trace costs a single `is not None` test per iteration. Only one
+    call in `sample_every` is stored; once `capacity` samples are stored the
+    oldest ones are overwritten.
+    """
+
+    def __init__(self, capacity=10000, sample_every=1):
+        """
+        Args:
+            capacity (int): Maximum number of samples kept.
+            sample_every (int): Store one `record` call out of `sample_every`.
+        """
+        self.capacity = capacity
+        self.sample_every = max(1, sample_every)
+        self._buffer = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self.start()
+
+    def start(self):
+        """
+        Empties the buffer and restarts the clock.
+        """
+        self.start_time = time.perf_counter()
+        self._calls = 0
+        self._size = 0
+        self._next = 0
+
+    def __len__(self):
+        return self._size
+
+    def record(self, iteration, current_cost, best_cost, parameter=float('nan'), accepted=True):
+        """
+        Records the state of the search at one iteration (subject to sampling).
+
+        Args:
+            iteration (int): Iteration number.
+            current_cost (float): Cost of the current solution.
+            best_cost (float): Cost of the best solution so far.
+            parameter (float): Temperature or tabu tenure, NaN if not applicable.
+            accepted (bool): Whether the iteration moved to a new solution.
+        """
+        calls = self._calls
+        self._calls = calls + 1
+        if calls % self.sample_every:
+            return
+        self._buffer[self._next] = (iteration, time.perf_counter() - self.start_time,
+                                    current_cost, best_cost, parameter, accepted)
+        self._next = (self._next + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def to_array(self):
+        """
+        Returns:
+            numpy.ndarray: Structured array (TRACE_DTYPE) of the samples, oldest first.
+        """
+        if self._size < self.capacity:
+            return self._buffer[:self._size].copy()
+        return np.concatenate((self._buffer[self._next:], self._buffer[:self._next]))
+
+    def to_csv(self, path):
+        """
+        Writes the samples to a CSV file with one column per field.
+
+        Args:
+            path (str): Output file.
+        """
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(TRACE_DTYPE.names)
+            writer.writerows(self.to_array().tolist())
+
+    def to_parquet(self, path):
+        """
+        Writes the samples to a Parquet file (requires pandas with pyarrow or fastparquet).
+
+        Args:
+            path (str): Output file.
+        """
+        import pandas as pd
+        pd.DataFrame(self.to_array()).to_parquet(path, index=False)
+
+
+def load_trace(path):
+    """
+    Reads a trace written by `ConvergenceTrace.to_csv` or `to_parquet`.
+
+    Args:
+        path (str): .csv or .parquet file.
+
+    Returns:
+        numpy.ndarray: Structured array with dtype TRACE_DTYPE.
+    """
+    if path.endswith('.parquet'):
+        import pandas as pd
+        frame = pd.read_parquet(path)
+        data = np.zeros(len(frame), dtype=TRACE_DTYPE)
+        for name in TRACE_DTYPE.names:
+            data[name] = frame[name].to_numpy()
+        return data
+    with open(path, newline='') as file:
+        rows = list(csv.reader(file))[1:]
+    data = np.zeros(len(rows), dtype=TRACE_DTYPE)
+    for index, row in enumerate(rows):
+        data[index] = (int(row[0]), float(row[1]), float(row[2]), float(row[3]), float(row[4]), row[5] == 'True')
+    return data
@@ -0,0 +1,282 @@
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    from .distance_providers import LazyDistances, OnTheFlyDistances, SparseDistances
+except ImportError:
+    from distance_providers import LazyDistances, OnTheFlyDistances, SparseDistances
+
+# Cache of distance matrices shared by every solver, evaluator and the verifier,
+# holding the `MAX_CACHED_MATRICES` most recently used ones.
+_MATRIX_CACHE = OrderedDict()
+
+MAX_CACHED_MATRICES = 8
+
+DTYPES = ("float64", "float32", "int")
+
+# On-disk matrix dtypes: "uint16" holds TSPLIB-rounded distances up to 65535.
+MEMMAP_DTYPES = ("float32", "uint16")
+
+# Distance providers replacing a dense matrix (see `make_distance_provider`).
+PROVIDERS = {
+    "on_the_fly": OnTheFlyDistances,
+    "lazy": LazyDistances,
+    "sparse": SparseDistances,
+}
+
+# Storage of the matrices built by `get_distance_matrix` (see `configure_storage`).
+_STORAGE = {'memory_limit': None, 'memmap_dir': None, 'memmap_dtype': "float32", 'provider': "on_the_fly",
+            'provider_options': {}}
+
+
+def node_coordinates(nodes):
+    """
+    Packs a node dictionary into a contiguous coordinate array indexed by node ID.
+
+    Row `i` holds the coordinates of node `i`. A node with ID -1 (the explicit
+    depot used by the team2 solvers) is stored in the last row so that
+    `matrix[-1]` resolves to it.
+
+    Args:
+        nodes (dict): Node coordinates as {node_id: (x, y)}.
+
+    Returns:
+        numpy.ndarray: Array of shape (size, 2) with dtype float64.
+    """
+    ids = [node for node in nodes if node >= 0]
+    size = max(ids) + 1 if ids else 0
+    has_explicit_depot = -1 in nodes
+    coords = np.full((size + has_explicit_depot, 2), np.nan)
+    for node in ids:
+        coords[node] = nodes[node]
+    if has_explicit_depot:
+        coords[-1] = nodes[-1]
+    return coords
+
+
+def compute_distance_matrix(coords, dtype="float64"):
+    """
+    Computes the full Euclidean distance matrix of a coordinate array.
+
+    Args:
+        coords (numpy.ndarray): Coordinates of shape (n, 2).
+        dtype (str): "float64", "float32" or "int" (TSPLIB EUC_2D rounding).
+
+    Returns:
+        numpy.ndarray: C-contiguous (n, n) distance matrix.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported dtype {dtype!r}, expected one of {DTYPES}.")
+    coords = np.asarray(coords, dtype=np.float64)
+    diff = coords[:, None, :] - coords[None, :, :]
+    matrix = np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+    if dtype == "int":
+        # TSPLIB nint(): round half up.
+        return np.ascontiguousarray(np.floor(matrix + 0.5), dtype=np.int32)
+    return np.ascontiguousarray(matrix, dtype=dtype)
+
+
+def _compute_rows(coords, start, stop):
+    diff = coords[start:stop, None, :] - coords[None, :, :]
+    return np.sqrt(np.einsum('ijk,ijk->ij', diff, diff))
+
+
+def memmap_distance_matrix(instance_data, directory, dtype="float32", block_bytes=64 * 2 ** 20):
+    """
+    Builds the distance matrix of an instance into a memory-mapped .npy file, or
+    opens the one built by an earlier run or another process.
+
+    The file is named after the instance key, filled by blocks of rows (at most
+    `block_bytes` of temporaries at once) and renamed into place when complete,
+    so concurrent builders never see a partial file.
+
+    Args:
+        instance_data (dict): Parsed .vrp instance data, or any dict with `nodes`.
+        directory (str): Directory of the matrix files.
+        dtype (str): "float32" or "uint16" (distances rounded as TSPLIB EUC_2D).
+        block_bytes (int): Memory budget of the row blocks.
+
+    Returns:
+        numpy.memmap: Read-only (n, n) distance matrix.
+    """
+    if dtype not in MEMMAP_DTYPES:
+        raise ValueError(f"Unsupported memmap dtype {dtype!r}, expected one of {MEMMAP_DTYPES}.")
+    name, digest = instance_key(instance_data)
+    path = os.path.join(directory, f"{name or 'instance'}-{digest[:16]}-{dtype}.npy")
+    if os.path.exists(path):
+        return np.load(path, mmap_mode='r')
+
+    coords = instance_data.get("coordinates")
+    if coords is None:
+        coords = node_coordinates(instance_data["nodes"])
+    coords = np.asarray(coords, dtype=np.float64)
+    size = len(coords)
+    os.makedirs(directory, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix=".npy.tmp")
+    os.close(handle)
+    try:
+        matrix = np.lib.format.open_memmap(temporary, mode='w+', dtype=dtype, shape=(size, size))
+        rows = max(1, block_bytes // max(1, 24 * size))
+        for start in range(0, size, rows):
+            block = _compute_rows(coords, start, min(start + rows, size))
+            if dtype == "uint16":
+                # uint16 has no NaN: the rows of unused node IDs are stored as 0.
+                block = np.floor(np.nan_to_num(block, nan=0.0) + 0.5)
+                if block.max(initial=0) > np.iinfo(np.uint16).max:
+                    raise ValueError("Distances exceed 65535, use the float32 memmap dtype.")
+            matrix[start:start + len(block)] = block
+        matrix.flush()
+        del matrix
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+    return np.load(path, mmap_mode='r')
+
+
+def make_distance_provider(instance_data, provider="on_the_fly", dtype="float64", **options):
+    """
+    Builds a distance provider of an instance, indexed like its dense matrix.
+
+    Args:
+        instance_data (dict): Parsed .vrp instance data, or any dict with `nodes`.
+        provider (str): "on_the_fly" (computed on every access), "lazy" (rows
+            computed on demand, LRU cache) or "sparse" (k nearest neighbor and
+            depot edges only).
+        dtype (str): "float64", "float32" or "int" (TSPLIB EUC_2D rounding).
+        **options: Provider arguments, e.g. `cache_rows` for "lazy", `k`,
+            `depots` or `strict` for "sparse".
+
+    Returns:
+        DistanceProvider: Provider usable wherever the dense matrix is, e.g. by
+        `calculate_total_cost` or `RouteState`.
+    """
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unsupported distance provider {provider!r}, expected one of {tuple(PROVIDERS)}.")
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported dtype {dtype!r}, expected one of {DTYPES}.")
+    coords = instance_data.get("coordinates")
+    if coords is None:
+        coords = node_coordinates(instance_data["nodes"])
+    if provider == "sparse" and "depots" not in options:
+        # The team2 solvers add the depot as node -1, stored in the last row.
+        options["depots"] = (0, -1) if -1 in instance_data.get("nodes", ()) else (0,)
+    return PROVIDERS[provider](coords, dtype=dtype, **options)
+
+
+def configure_storage(memory_limit=None, memmap_dir=None, memmap_dtype="float32", provider="on_the_fly",
+                      provider_options=None):
+    """
+    Sets how `get_distance_matrix` stores matrices that would not fit in memory.
+
+    A dense matrix larger than `memory_limit` bytes is memory-mapped from
+    `memmap_dir` (built once, then reused across runs and processes), or, without
+    a directory, replaced by a distance provider (see `make_distance_provider`).
+    A limit of 0 selects the provider for every instance.
+
+    Args:
+        memory_limit (int): Largest in-memory matrix in bytes, None for no limit.
+        memmap_dir (str): Directory of the memory-mapped matrices.
+        memmap_dtype (str): "float32" or "uint16", dtype of the memory-mapped matrices.
+        provider (str): "on_the_fly", "lazy" or "sparse", used without `memmap_dir`.
+        provider_options (dict): Arguments of the provider, e.g. {"k": 30}.
+    """
+    if memmap_dtype not in MEMMAP_DTYPES:
+        raise ValueError(f"Unsupported memmap dtype {memmap_dtype!r}, expected one of {MEMMAP_DTYPES}.")
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unsupported distance provider {provider!r}, expected one of {tuple(PROVIDERS)}.")
+    _STORAGE.update(memory_limit=memory_limit, memmap_dir=memmap_dir, memmap_dtype=memmap_dtype, provider=provider,
+                    provider_options=dict(provider_options or {}))
+
+
+def instance_key(instance_data):
+    """
+    Builds the cache key identifying an instance.
+
+    Instances loaded by `read_instance` are keyed by name and file hash. Partial
+    instance dictionaries (e.g. only `nodes`) fall back to a hash of their
+    coordinates.
+
+    Args:
+        instance_data (dict): Parsed .vrp instance data.
+
+    Returns:
+        tuple: Hashable cache key.
+    """
+    name = instance_data.get("name")
+    digest = instance_data.get("file_hash")
+    if name is not None and digest is not None:
+        return name, digest
+    coords = node_coordinates(instance_data["nodes"])
+    return name, hashlib.sha1(coords.tobytes()).hexdigest()
+
+
+def get_distance_matrix(instance_data, dtype="float64"):
+    """
+    Returns the distance matrix of an instance, building it once per instance.
+
+    The matrix is indexed by node ID (see `node_coordinates`) and shared between
+    callers, so it must be treated as read-only. Above the memory limit set with
+    `configure_storage`, it is a memory-mapped file or a distance provider
+    (`OnTheFlyDistances`, `LazyDistances` or `SparseDistances`), all indexed the
+    same way.
+
+    Args:
+        instance_data (dict): Parsed .vrp instance data, or any dict with `nodes`.
+        dtype (str): "float64", "float32" or "int" (TSPLIB EUC_2D rounding).
+
+    Returns:
+        numpy.ndarray: Read-only (n, n) distance matrix.
+    """
+    key = instance_key(instance_data) + (dtype,)
+    matrix = _MATRIX_CACHE.get(key)
+    if matrix is not None:
+        _MATRIX_CACHE.move_to_end(key)
+    else:
+        coords = instance_data.get("coordinates")
+        if coords is None:
+            coords = node_coordinates(instance_data["nodes"])
+        limit = _STORAGE['memory_limit']
+        itemsize = np.dtype(np.int32 if dtype == "int" else dtype).itemsize
+        if limit is not None and len(coords) ** 2 * itemsize > limit:
+            if _STORAGE['memmap_dir'] is not None:
+                matrix = memmap_distance_matrix(instance_data, _STORAGE['memmap_dir'], _STORAGE['memmap_dtype'])
+            else:
+                matrix = make_distance_provider(dict(instance_data, coordinates=coords), _STORAGE['provider'], dtype,
+                                                **_STORAGE['provider_options'])
+        else:
+            matrix = compute_distance_matrix(coords, dtype)
+            matrix.setflags(write=False)
+        _remember(key, matrix)
+    return matrix
+
+
+def _remember(key, matrix):
+    """Caches a matrix, evicting the least recently used one beyond `MAX_CACHED_MATRICES`."""
+    _MATRIX_CACHE[key] = matrix
+    _MATRIX_CACHE.move_to_end(key)
+    while len(_MATRIX_CACHE) > MAX_CACHED_MATRICES:
+        _MATRIX_CACHE.popitem(last=False)
+
+
+def clear_cache():
+    """
+    Drops every cached distance matrix.
+    """
+    _MATRIX_CACHE.clear()
+
+
+def cache_distance_matrix(instance_data, matrix, dtype="float64"):
+    """
+    Registers an already built matrix, e.g. one shipped to a worker process.
+
+    Args:
+        instance_data (dict): Parsed .vrp instance data.
+        matrix (numpy.ndarray): Distance matrix of the instance.
+        dtype (str): dtype label the matrix was built with.
+    """
+    _remember(instance_key(instance_data) + (dtype,), matrix)
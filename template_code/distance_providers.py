@@ -0,0 +1,247 @@
+import math
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+import numpy as np
+
+# Memory budget of the temporary distance blocks built by the providers.
+BLOCK_BYTES = 64 * 2 ** 20
+
+
+def _round(distances, dtype):
+    """Applies the dtype convention of `distance_matrix.compute_distance_matrix`."""
+    if dtype == "int":
+        return np.floor(distances + 0.5).astype(np.int32)[()]
+    return np.asarray(distances, dtype=dtype)[()]
+
+
+class DistanceProvider(ABC):
+    """
+    Base class of the distance backends that stand in for a dense matrix.
+
+    Providers support the indexing used by the solvers on dense matrices:
+    `matrix[a, b]` for scalars or broadcastable index arrays (e.g. `np.ix_`),
+    `matrix[a]` for a row, and slices (`matrix[:, b]`), which select every node
+    along their axis. Subclasses decide what is stored and implement `distance`
+    (one pair, the hot path of the move evaluations) and `_distances` (index arrays).
+    """
+
+    ndim = 2
+
+    def __init__(self, coords, dtype="float64"):
+        """
+        Args:
+            coords (numpy.ndarray): Coordinates indexed by node ID, shape (n, 2).
+            dtype (str): "float64", "float32" or "int" (TSPLIB EUC_2D rounding).
+        """
+        self.coords = np.ascontiguousarray(coords, dtype=np.float64)
+        self._points = self.coords.tolist()
+        self.dtype = np.dtype(np.int32 if dtype == "int" else dtype)
+        self._dtype_label = dtype
+
+    @property
+    def shape(self):
+        return (len(self.coords), len(self.coords))
+
+    def __len__(self):
+        return len(self.coords)
+
+    def euclidean_distance(self, a, b):
+        """Distance between two nodes computed from their coordinates."""
+        (x1, y1), (x2, y2) = self._points[a], self._points[b]
+        distance = math.hypot(x1 - x2, y1 - y2)
+        return distance if self._dtype_label == "float64" else _round(distance, self._dtype_label)
+
+    def _euclidean_distances(self, rows, cols):
+        """Distances between coords[rows] and coords[cols], broadcast like numpy indexing."""
+        diff = self.coords[rows] - self.coords[cols]
+        return _round(np.sqrt(np.einsum('...k,...k->...', diff, diff)), self._dtype_label)
+
+    @abstractmethod
+    def distance(self, a, b):
+        """Distance between two nodes (the scalar `matrix[a, b]`)."""
+
+    @abstractmethod
+    def _distances(self, rows, cols):
+        """Distances between index arrays broadcast like numpy indexing."""
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple) and isinstance(key[0], (int, np.integer)) and isinstance(key[1], (int, np.integer)):
+            # Scalar fast path, used by the move evaluations.
+            return self.distance(int(key[0]), int(key[1]))
+        if not isinstance(key, tuple):
+            key = (key, slice(None))
+        rows, cols = key
+        if isinstance(rows, slice) or isinstance(cols, slice):
+            # Basic indexing along a slice: outer product with the other axis.
+            rows = np.arange(len(self))[rows] if isinstance(rows, slice) else np.asarray(rows)
+            cols = np.arange(len(self))[cols] if isinstance(cols, slice) else np.asarray(cols)
+            if rows.ndim and cols.ndim:
+                return self._distances(rows.reshape(rows.shape + (1,) * cols.ndim), cols)
+        return self._distances(rows, cols)
+
+    def __array__(self, dtype=None, copy=None):
+        matrix = np.asarray(self[:, :])
+        return matrix if dtype is None else matrix.astype(dtype)
+
+
+class OnTheFlyDistances(DistanceProvider):
+    """
+    Distance matrix computed from the coordinates on every access, in O(n) memory.
+    """
+
+    def distance(self, a, b):
+        return self.euclidean_distance(a, b)
+
+    def _distances(self, rows, cols):
+        return self._euclidean_distances(rows, cols)
+
+
+class LazyDistances(DistanceProvider):
+    """
+    Distance rows computed on first access and kept in an LRU cache of `cache_rows` rows.
+
+    Searches keep touching the same nodes (the neighborhoods of the routes being
+    modified), so the hot rows are reused while the cache holds at most
+    `cache_rows * n * dtype.itemsize` bytes (see `cached_bytes`).
+    Distances are symmetric, so a pair is served from the cached row of either
+    endpoint. `hits` and `misses` count the row lookups.
+    """
+
+    def __init__(self, coords, dtype="float64", cache_rows=256):
+        """
+        Args:
+            coords (numpy.ndarray): Coordinates indexed by node ID, shape (n, 2).
+            dtype (str): "float64", "float32" or "int" (TSPLIB EUC_2D rounding).
+            cache_rows (int): Maximum number of cached rows.
+        """
+        super().__init__(coords, dtype)
+        self.cache_rows = max(1, cache_rows)
+        self._rows = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def row(self, node):
+        """
+        Returns:
+            numpy.ndarray: Read-only distances from `node` to every node.
+        """
+        node = node % len(self)
+        row = self._rows.get(node)
+        if row is not None:
+            self.hits += 1
+            self._rows.move_to_end(node)
+            return row
+        self.misses += 1
+        row = np.asarray(self._euclidean_distances(node, slice(None)), dtype=self.dtype)
+        row.setflags(write=False)
+        self._rows[node] = row
+        if len(self._rows) > self.cache_rows:
+            self._rows.popitem(last=False)
+        return row
+
+    @property
+    def cached_bytes(self):
+        """int: Memory held by the cached rows."""
+        return sum(row.nbytes for row in self._rows.values())
+
+    def distance(self, a, b):
+        a, b = a % len(self), b % len(self)
+        if b in self._rows and a not in self._rows:
+            a, b = b, a
+        return self.row(a)[b]
+
+    def _distances(self, rows, cols):
+        # Vectorized requests are computed directly, caching them would evict the hot rows.
+        return self._euclidean_distances(rows, cols)
+
+
+class SparseDistances(DistanceProvider):
+    """
+    Stores only the edges a granular search evaluates: the k nearest neighbors
+    of each node (in both directions) and every edge of the depots, in
+    O(n * (k + depots)) memory.
+
+    Other pairs are computed from the coordinates and counted in `misses`, or
+    raise a KeyError when `strict`, which shows whether a search really stays
+    within the sparse graph.
+    """
+
+    def __init__(self, coords, k=20, depots=(0,), dtype="float64", strict=False):
+        """
+        Args:
+            coords (numpy.ndarray): Coordinates indexed by node ID, shape (n, 2).
+                Rows of NaN (unused node IDs) get no neighbors.
+            k (int): Number of nearest neighbors stored per node.
+            depots (iterable): Node IDs whose rows are stored in full (-1 is the last row).
+            dtype (str): "float64", "float32" or "int" (TSPLIB EUC_2D rounding).
+            strict (bool): Raise a KeyError on the pairs that are not stored.
+        """
+        super().__init__(coords, dtype)
+        size = len(self.coords)
+        self.k = max(0, min(k, size - 1))
+        self.strict = strict
+        self.misses = 0
+        self.depot_rows = {depot % size: np.asarray(self._euclidean_distances(depot % size, slice(None)),
+                                                    dtype=self.dtype)
+                           for depot in depots}
+        self.edges = [dict() for _ in range(size)]
+        if self.k == 0:
+            return
+        valid = ~np.isnan(self.coords).any(axis=1)
+        # k nearest neighbors by blocks of rows, so the full matrix is never built.
+        block = max(1, BLOCK_BYTES // (8 * size))
+        for start in range(0, size, block):
+            stop = min(start + block, size)
+            distances = np.asarray(self._euclidean_distances(np.arange(start, stop)[:, None], np.arange(size)),
+                                   dtype=np.float64)
+            distances[:, ~valid] = np.inf
+            distances[np.arange(stop - start), np.arange(start, stop)] = np.inf
+            nearest = np.argpartition(distances, self.k - 1, axis=1)[:, :self.k]
+            found = np.isfinite(np.take_along_axis(distances, nearest, axis=1))
+            for node, neighbors, kept in zip(range(start, stop), nearest.tolist(), found.tolist()):
+                if not valid[node]:
+                    continue
+                for neighbor, keep in zip(neighbors, kept):
+                    if keep:
+                        self.edges[node][neighbor] = self.edges[neighbor][node] = self.euclidean_distance(node,
+                                                                                                          neighbor)
+
+    @property
+    def stored_edges(self):
+        """int: Number of stored (directed) edges, depot rows included."""
+        return sum(len(edges) for edges in self.edges) + len(self.depot_rows) * len(self)
+
+    def neighbors(self, node):
+        """
+        Returns:
+            list: Nodes with a stored edge to `node`, by increasing distance.
+        """
+        edges = self.edges[node % len(self)]
+        return sorted(edges, key=edges.get)
+
+    def distance(self, a, b):
+        size = len(self)
+        a, b = a % size, b % size
+        row = self.depot_rows.get(a)
+        if row is not None:
+            return row[b]
+        row = self.depot_rows.get(b)
+        if row is not None:
+            return row[a]
+        distance = self.edges[a].get(b)
+        if distance is not None:
+            return distance
+        if a == b:
+            return self.euclidean_distance(a, b)
+        if self.strict:
+            raise KeyError(f"Edge ({a}, {b}) is not stored in the sparse distance matrix.")
+        self.misses += 1
+        return self.euclidean_distance(a, b)
+
+    def _distances(self, rows, cols):
+        if not self.strict:
+            return self._euclidean_distances(rows, cols)
+        rows, cols = np.broadcast_arrays(np.asarray(rows), np.asarray(cols))
+        distances = [self.distance(a, b) for a, b in zip(rows.ravel().tolist(), cols.ravel().tolist())]
+        return np.array(distances, dtype=self.dtype).reshape(rows.shape)[()]
@@ -0,0 +1,181 @@
+from collections import deque
+
+import numpy as np
+
+# Minimal gain for a move to be applied, to avoid cycling on rounding noise.
+EPSILON = 1e-9
+
+OR_OPT_LENGTHS = (1, 2, 3)
+
+
+def _neighbor_lists(distances, k):
+    """k nearest other nodes of each node of a route, by local index."""
+    size = min(k, len(distances) - 1)
+    if size <= 0:
+        return [[] for _ in range(len(distances))]
+    masked = distances.copy()
+    np.fill_diagonal(masked, np.inf)
+    nearest = np.argpartition(masked, size - 1, axis=1)[:, :size]
+    order = np.argsort(np.take_along_axis(masked, nearest, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(nearest, order, axis=1).tolist()
+
+
+def _two_opt(tour, position, d, a, b):
+    """
+    Best 2-opt move adding the edge (a, b), either with both successors or both
+    predecessors. Returns (gain, first, last) where tour[first:last + 1] is reversed.
+    """
+    m = len(tour)
+    i, j = position[a], position[b]
+    best = (EPSILON, None, None)
+    for x, y in ((i, j), ((i - 1) % m, (j - 1) % m)):
+        # Edges (tour[x], tour[x+1]) and (tour[y], tour[y+1]) become (tour[x], tour[y]) and (tour[x+1], tour[y+1]).
+        if x == y:
+            continue
+        u, su, v, sv = tour[x], tour[(x + 1) % m], tour[y], tour[(y + 1) % m]
+        if su == v or sv == u:
+            continue
+        gain = d[u][su] + d[v][sv] - d[u][v] - d[su][sv]
+        if gain > best[0]:
+            low, high = min(x, y), max(x, y)
+            best = (gain, low + 1, high)
+    return best
+
+
+def _or_opt(tour, position, d, a, neighbors):
+    """
+    Best Or-opt move of a segment of 1 to 3 nodes that starts or ends at `a`,
+    reinserted (in either orientation) next to one of `a`'s neighbors.
+    Returns (gain, start, end, insertion position, reversed).
+    """
+    m = len(tour)
+    i = position[a]
+    best = (EPSILON, None, None, None, False)
+    if i == 0:
+        return best  # The depot stays at position 0.
+    for length in OR_OPT_LENGTHS:
+        for start in {i, i - length + 1}:
+            end = start + length - 1
+            if start < 1 or end > m - 1 or length >= m - 1:
+                continue
+            first, last = tour[start], tour[end]
+            before, after = tour[start - 1], tour[(end + 1) % m]
+            removal = d[before][first] + d[last][after] - d[before][after]
+            if removal <= EPSILON:
+                continue
+            for b in neighbors:
+                j = position[b]
+                for t in (j, (j - 1) % m):
+                    # Insert between tour[t] and tour[t + 1], outside the segment and its two edges.
+                    if start - 1 <= t <= end:
+                        continue
+                    u, v = tour[t], tour[(t + 1) % m]
+                    forward = d[u][first] + d[last][v]
+                    backward = d[u][last] + d[first][v]
+                    gain = removal + d[u][v] - min(forward, backward)
+                    if gain > best[0]:
+                        best = (gain, start, end, t, backward < forward)
+    return best
+
+
+def _improve_tour(tour, d, neighbors):
+    """
+    2-opt and Or-opt descent on a closed tour of local indices (depot at position 0).
+
+    Every node starts active; an active node is checked against its nearest
+    neighbors only and becomes inactive (its don't-look bit is set) when no
+    improving move is found. Applying a move reactivates the endpoints of the
+    changed edges, so the descent converges after few checks per node instead
+    of full rescans of the route.
+    """
+    m = len(tour)
+    position = [0] * m
+    for index, node in enumerate(tour):
+        position[node] = index
+    active = deque(range(m))
+    queued = [True] * m
+    total_gain = 0.0
+
+    while active:
+        a = active.popleft()
+        queued[a] = False
+        touched = None
+        for b in neighbors[a]:
+            gain, first, last = _two_opt(tour, position, d, a, b)
+            if first is not None:
+                touched = (tour[first - 1], tour[first], tour[last], tour[(last + 1) % m])
+                tour[first:last + 1] = tour[first:last + 1][::-1]
+                for index in range(first, last + 1):
+                    position[tour[index]] = index
+                total_gain += gain
+                break
+        if touched is None:
+            gain, start, end, t, reverse = _or_opt(tour, position, d, a, neighbors[a])
+            if start is not None:
+                segment = tour[start:end + 1]
+                if reverse:
+                    segment.reverse()
+                touched = (tour[start - 1], tour[(end + 1) % m], tour[t], tour[(t + 1) % m]) + tuple(segment)
+                rest = tour[:start] + tour[end + 1:]
+                insert_at = rest.index(tour[t]) + 1
+                tour[:] = rest[:insert_at] + segment + rest[insert_at:]
+                for index, node in enumerate(tour):
+                    position[node] = index
+                total_gain += gain
+        if touched is not None:
+            for node in touched + (a,):
+                if not queued[node]:
+                    queued[node] = True
+                    active.append(node)
+    return total_gain
+
+
+def optimize_route(route, distance_matrix, depot=0, k=10):
+    """
+    Improves the visiting order of a single route with 2-opt and Or-opt moves
+    (segments of 1 to 3 customers), restricted to each node's k nearest
+    neighbors within the route and driven by don't-look bits.
+
+    The distance matrix is assumed symmetric (2-opt reverses route sections).
+
+    Args:
+        route (list): Customers of the route, without the depot.
+        distance_matrix (numpy.ndarray): Matrix indexed by node ID.
+        depot (int): Depot node ID (row of the distance matrix).
+        k (int): Number of neighbors considered per node.
+
+    Returns:
+        tuple: (improved route, its cost).
+    """
+    nodes = np.array([depot] + list(route), dtype=np.intp)
+    distances = np.asarray(distance_matrix[np.ix_(nodes, nodes)], dtype=np.float64)
+    tour = list(range(len(nodes)))
+    d = distances.tolist()
+    if len(nodes) > 3:
+        _improve_tour(tour, d, _neighbor_lists(distances, k))
+    cost = sum(d[tour[index - 1]][tour[index]] for index in range(len(tour))) if len(tour) > 1 else 0.0
+    return [int(nodes[index]) for index in tour[1:]], cost
+
+
+def optimize_routes(routes, distance_matrix, depot=0, k=10):
+    """
+    Post-optimization stage: applies `optimize_route` to every route of a
+    solution (e.g. from `greedy_cvrp`, `local_search` or `tabu_search`).
+    Loads are unchanged, so a feasible solution stays feasible.
+
+    Args:
+        routes (list of lists): Solution routes, e.g., [[1, 2, 3], [4, 5, 6]].
+        distance_matrix (numpy.ndarray): Matrix indexed by node ID.
+        depot (int): Depot node ID (row of the distance matrix).
+        k (int): Number of neighbors considered per node.
+
+    Returns:
+        tuple: (improved routes, total cost).
+    """
+    improved = []
+    total_cost = 0.0
+    for route in routes:
+        route, cost = optimize_route(route, distance_matrix, depot, k)
+        improved.append(route)
+        total_cost += cost
+    return improved, total_cost
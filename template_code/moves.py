@@ -0,0 +1,524 @@
+import random
+from array import array
+from collections import namedtuple
+
+try:
+    from .solution import Solution
+except ImportError:
+    from solution import Solution
+
+# A neighborhood move. Positions refer to the routes *before* the move.
+#   - "relocate": move the `length` customers starting at (route1, pos1) in front
+#     of position pos2 of route2.
+#   - "oropt": same as "relocate", drawn with segments of 1 to MAX_SEGMENT customers
+#     and also within a route; kept as its own kind for per-kind statistics.
+#   - "swap": exchange the customers at (route1, pos1) and (route2, pos2).
+#   - "2opt": reverse route1[pos1:pos2 + 1] (route2 == route1).
+#   - "2opt*": exchange the tails route1[pos1:] and route2[pos2:] of two routes.
+#   - "cross": exchange the segments route1[pos1:pos1 + length] and
+#     route2[pos2:pos2 + length2] of two routes (CROSS-exchange).
+Move = namedtuple("Move", ["kind", "route1", "pos1", "route2", "pos2", "length", "length2"], defaults=(0,))
+
+MOVE_KINDS = ("relocate", "swap", "2opt", "oropt", "2opt*", "cross")
+
+# Maximal segment length of Or-opt and CROSS-exchange moves.
+MAX_SEGMENT = 3
+
+
+class RouteState:
+    """
+    Routes of a CVRP solution with cached per-route loads and costs.
+
+    Moves are scored from the handful of edges they touch, without building the
+    candidate solution, and only the chosen move is applied. Per-route prefix
+    loads and prefix distances give the load and cost of any route head, tail
+    or segment in O(1), which is what the inter-route 2-opt* and CROSS-exchange
+    moves need.
+
+    With `neighbors` (granular mode), random moves only relate a customer to one
+    of its precomputed nearest neighbors instead of an arbitrary position.
+    """
+
+    def __init__(self, routes, distance_matrix, demands, capacity, depot=0, neighbors=None):
+        """
+        Args:
+            routes (list of lists): Solution routes, e.g., [[1, 2, 3], [4, 5, 6]].
+            distance_matrix (numpy.ndarray): Matrix indexed by node ID.
+            demands (dict): Node demands as {node_id: demand}.
+            capacity (int): Vehicle capacity.
+            depot (int): Depot node ID (row of the distance matrix).
+            neighbors (dict): Optional candidate lists {customer: [neighbor, ...]}
+                (see `spatial_index.nearest_neighbor_lists`).
+        """
+        self.distance_matrix = distance_matrix
+        self.demands = demands
+        self.capacity = capacity
+        self.depot = depot
+        self.routes = [list(route) for route in routes]
+        self.loads, self.costs, self.prefix_loads, self.prefix_distances = [], [], [], []
+        for route in self.routes:
+            self.loads.append(0)
+            self.costs.append(0.0)
+            self.prefix_loads.append(None)
+            self.prefix_distances.append(None)
+            self._refresh(len(self.loads) - 1)
+        self.overloaded = sum(1 for load in self.loads if load > capacity)
+        self.neighbors = neighbors
+        self._customers = [node for route in self.routes for node in route]
+        self.where = {}
+        self._index_routes()
+
+    def _index_routes(self, start=0, indices=None):
+        """Refreshes the {customer: (route_index, position)} map."""
+        where = self.where
+        for index in (range(start, len(self.routes)) if indices is None else indices):
+            for pos, node in enumerate(self.routes[index]):
+                where[node] = (index, pos)
+
+    def _refresh(self, index):
+        """
+        Recomputes the prefix arrays, load and cost of a route. Entry k of the
+        prefix arrays covers the first k customers, starting from the depot.
+        """
+        dist, demands = self.distance_matrix, self.demands
+        loads, distances = [0], [0.0]
+        prev_node = self.depot
+        for node in self.routes[index]:
+            loads.append(loads[-1] + demands[node])
+            distances.append(distances[-1] + dist[prev_node, node])
+            prev_node = node
+        self.prefix_loads[index] = loads
+        self.prefix_distances[index] = distances
+        self.loads[index] = loads[-1]
+        self.costs[index] = distances[-1] + dist[prev_node, self.depot]
+
+    def _tail_cost(self, index, pos):
+        """Cost from the customer at `pos` back to the depot (0 past the end of the route)."""
+        if pos >= len(self.routes[index]):
+            return 0.0
+        return self.costs[index] - self.prefix_distances[index][pos + 1]
+
+    def _segment_cost(self, index, pos, length):
+        """Cost of the edges inside the segment of `length` customers starting at `pos`."""
+        distances = self.prefix_distances[index]
+        return distances[pos + length] - distances[pos + 1]
+
+    def _segment_load(self, index, pos, length):
+        loads = self.prefix_loads[index]
+        return loads[pos + length] - loads[pos]
+
+    @property
+    def total_cost(self):
+        """float: Sum of the cached route costs."""
+        return sum(self.costs)
+
+    def route_cost(self, route):
+        """
+        Computes the cost of a single route, depot to depot.
+
+        Args:
+            route (list): Customers of the route.
+
+        Returns:
+            float: Route cost.
+        """
+        dist = self.distance_matrix
+        prev_node = self.depot
+        cost = 0.0
+        for node in route:
+            cost += dist[prev_node, node]
+            prev_node = node
+        return cost + dist[prev_node, self.depot]
+
+    def _pred(self, route, pos):
+        return route[pos - 1] if pos > 0 else self.depot
+
+    def _succ(self, route, pos):
+        return route[pos + 1] if pos + 1 < len(route) else self.depot
+
+    def is_feasible(self, move):
+        """
+        Checks the capacity constraint of a move using the cached route loads.
+
+        Args:
+            move (Move): Candidate move.
+
+        Returns:
+            bool: True if both routes stay within capacity after the move.
+        """
+        if move.kind == "2opt" or move.route1 == move.route2:
+            return self.loads[move.route1] <= self.capacity
+        capacity = self.capacity
+        if move.kind == "2opt*":
+            head1, head2 = self.prefix_loads[move.route1][move.pos1], self.prefix_loads[move.route2][move.pos2]
+            tail1, tail2 = self.loads[move.route1] - head1, self.loads[move.route2] - head2
+            return head1 + tail2 <= capacity and head2 + tail1 <= capacity
+        if move.kind == "cross":
+            gain = (self._segment_load(move.route1, move.pos1, move.length)
+                    - self._segment_load(move.route2, move.pos2, move.length2))
+            return self.loads[move.route1] - gain <= capacity and self.loads[move.route2] + gain <= capacity
+        demands = self.demands
+        route1, route2 = self.routes[move.route1], self.routes[move.route2]
+        if move.kind == "swap":
+            gain = demands[route1[move.pos1]] - demands[route2[move.pos2]]
+            return (self.loads[move.route1] - gain <= self.capacity
+                    and self.loads[move.route2] + gain <= self.capacity)
+        segment_load = self._segment_load(move.route1, move.pos1, move.length)
+        return (self.loads[move.route1] - segment_load <= self.capacity
+                and self.loads[move.route2] + segment_load <= self.capacity)
+
+    def keeps_feasible(self, move):
+        """
+        Checks that every route is within capacity after a move, in constant time.
+
+        Args:
+            move (Move): Candidate move.
+
+        Returns:
+            bool: True if the solution obtained by the move respects the capacity.
+        """
+        capacity = self.capacity
+        touched_overloaded = (self.loads[move.route1] > capacity) + (
+            move.route2 != move.route1 and self.loads[move.route2] > capacity)
+        return self.overloaded == touched_overloaded and self.is_feasible(move)
+
+    def delta(self, move):
+        """
+        Computes the cost variation of a move from the edges it touches.
+
+        Args:
+            move (Move): Candidate move.
+
+        Returns:
+            float: New total cost minus current total cost.
+        """
+        dist = self.distance_matrix
+        route1 = self.routes[move.route1]
+        i = move.pos1
+
+        if move.kind == "2opt":
+            j = move.pos2
+            a, b = self._pred(route1, i), route1[i]
+            c, d = route1[j], self._succ(route1, j)
+            return dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+
+        route2 = self.routes[move.route2]
+        j = move.pos2
+
+        if move.kind == "2opt*":
+            # New routes: head of one + tail of the other, from the prefix distances.
+            a1, b1 = self._pred(route1, i), (route1[i] if i < len(route1) else self.depot)
+            a2, b2 = self._pred(route2, j), (route2[j] if j < len(route2) else self.depot)
+            prefix1, prefix2 = self.prefix_distances[move.route1], self.prefix_distances[move.route2]
+            new1 = prefix1[i] + dist[a1, b2] + self._tail_cost(move.route2, j)
+            new2 = prefix2[j] + dist[a2, b1] + self._tail_cost(move.route1, i)
+            return new1 + new2 - self.costs[move.route1] - self.costs[move.route2]
+
+        if move.kind == "cross":
+            end1, end2 = i + move.length, j + move.length2
+            a1, b1 = self._pred(route1, i), self._succ(route1, end1 - 1)
+            a2, b2 = self._pred(route2, j), self._succ(route2, end2 - 1)
+            new1 = (self.prefix_distances[move.route1][i] + dist[a1, route2[j]]
+                    + self._segment_cost(move.route2, j, move.length2)
+                    + dist[route2[end2 - 1], b1] + self._tail_cost(move.route1, end1))
+            new2 = (self.prefix_distances[move.route2][j] + dist[a2, route1[i]]
+                    + self._segment_cost(move.route1, i, move.length)
+                    + dist[route1[end1 - 1], b2] + self._tail_cost(move.route2, end2))
+            return new1 + new2 - self.costs[move.route1] - self.costs[move.route2]
+
+        if move.kind == "swap":
+            u, v = route1[i], route2[j]
+            a1, b1 = self._pred(route1, i), self._succ(route1, i)
+            a2, b2 = self._pred(route2, j), self._succ(route2, j)
+            return (dist[a1, v] + dist[v, b1] - dist[a1, u] - dist[u, b1]
+                    + dist[a2, u] + dist[u, b2] - dist[a2, v] - dist[v, b2])
+
+        # relocate / oropt of the segment route1[i:i + length]
+        last = i + move.length - 1
+        first_node, last_node = route1[i], route1[last]
+        a, b = self._pred(route1, i), self._succ(route1, last)
+        p, q = self._pred(route2, j), (route2[j] if j < len(route2) else self.depot)
+        return (dist[a, b] - dist[a, first_node] - dist[last_node, b]
+                + dist[p, first_node] + dist[last_node, q] - dist[p, q])
+
+    def changed_edges(self, move):
+        """
+        Lists the undirected edges removed and added by a move.
+
+        Args:
+            move (Move): Candidate move.
+
+        Returns:
+            tuple: (removed, added) lists of (node, node) edges.
+        """
+        route1 = self.routes[move.route1]
+        i = move.pos1
+
+        if move.kind == "2opt":
+            j = move.pos2
+            a, b = self._pred(route1, i), route1[i]
+            c, d = route1[j], self._succ(route1, j)
+            return [(a, b), (c, d)], [(a, c), (b, d)]
+
+        route2 = self.routes[move.route2]
+        j = move.pos2
+
+        if move.kind == "2opt*":
+            a1, b1 = self._pred(route1, i), (route1[i] if i < len(route1) else self.depot)
+            a2, b2 = self._pred(route2, j), (route2[j] if j < len(route2) else self.depot)
+            return [(a1, b1), (a2, b2)], [(a1, b2), (a2, b1)]
+
+        if move.kind == "cross":
+            end1, end2 = i + move.length - 1, j + move.length2 - 1
+            a1, b1 = self._pred(route1, i), self._succ(route1, end1)
+            a2, b2 = self._pred(route2, j), self._succ(route2, end2)
+            return ([(a1, route1[i]), (route1[end1], b1), (a2, route2[j]), (route2[end2], b2)],
+                    [(a1, route2[j]), (route2[end2], b1), (a2, route1[i]), (route1[end1], b2)])
+
+        if move.kind == "swap":
+            u, v = route1[i], route2[j]
+            a1, b1 = self._pred(route1, i), self._succ(route1, i)
+            a2, b2 = self._pred(route2, j), self._succ(route2, j)
+            return ([(a1, u), (u, b1), (a2, v), (v, b2)],
+                    [(a1, v), (v, b1), (a2, u), (u, b2)])
+
+        last = i + move.length - 1
+        first_node, last_node = route1[i], route1[last]
+        a, b = self._pred(route1, i), self._succ(route1, last)
+        p, q = self._pred(route2, j), (route2[j] if j < len(route2) else self.depot)
+        return ([(a, first_node), (last_node, b), (p, q)],
+                [(a, b), (p, first_node), (last_node, q)])
+
+    def move_attributes(self, move):
+        """
+        Describes a move by the edges it removes and adds, for attribute-based tabu memory.
+
+        Edges are identified by their endpoints, so the attributes stay valid when
+        `apply` drops an emptied route and renumbers the following ones.
+
+        Args:
+            move (Move): Candidate move.
+
+        Returns:
+            tuple: (removed, added) tuples of undirected (node, node) edges, with the
+            smaller node first and without depot-to-depot loops.
+        """
+        removed, added = self.changed_edges(move)
+        return (tuple((min(edge), max(edge)) for edge in removed if edge[0] != edge[1]),
+                tuple((min(edge), max(edge)) for edge in added if edge[0] != edge[1]))
+
+    def is_valid(self, move):
+        """
+        Checks that a move is well formed for the current routes.
+
+        Args:
+            move (Move): Candidate move.
+
+        Returns:
+            bool: True if the move can be scored and applied.
+        """
+        routes = self.routes
+        if not (0 <= move.route1 < len(routes) and 0 <= move.route2 < len(routes)):
+            return False
+        route1, route2 = routes[move.route1], routes[move.route2]
+        if move.kind == "2opt":
+            return move.route1 == move.route2 and 0 <= move.pos1 < move.pos2 < len(route1)
+        if move.kind == "swap":
+            return (move.route1 != move.route2
+                    and 0 <= move.pos1 < len(route1) and 0 <= move.pos2 < len(route2))
+        if move.kind == "2opt*":
+            # Exchanging two whole routes or two empty tails changes nothing.
+            return (move.route1 != move.route2
+                    and 0 <= move.pos1 <= len(route1) and 0 <= move.pos2 <= len(route2)
+                    and (move.pos1, move.pos2) != (0, 0) and (move.pos1, move.pos2) != (len(route1), len(route2)))
+        if move.kind == "cross":
+            return (move.route1 != move.route2 and move.length >= 1 and move.length2 >= 1
+                    and 0 <= move.pos1 and move.pos1 + move.length <= len(route1)
+                    and 0 <= move.pos2 and move.pos2 + move.length2 <= len(route2))
+        if not (move.length >= 1 and 0 <= move.pos1 and move.pos1 + move.length <= len(route1)):
+            return False
+        if move.route1 == move.route2:
+            return 0 <= move.pos2 <= len(route2) and not move.pos1 <= move.pos2 <= move.pos1 + move.length
+        return 0 <= move.pos2 <= len(route2)
+
+    def _moved_routes(self, move):
+        """Returns {route_index: new_route} for the routes touched by a move."""
+        route1, route2 = list(self.routes[move.route1]), list(self.routes[move.route2])
+        i, j = move.pos1, move.pos2
+
+        if move.kind == "2opt":
+            route1[i:j + 1] = route1[i:j + 1][::-1]
+            return {move.route1: route1}
+        if move.kind == "swap":
+            route1[i], route2[j] = route2[j], route1[i]
+            return {move.route1: route1, move.route2: route2}
+        if move.kind == "2opt*":
+            return {move.route1: route1[:i] + route2[j:], move.route2: route2[:j] + route1[i:]}
+        if move.kind == "cross":
+            end1, end2 = i + move.length, j + move.length2
+            return {move.route1: route1[:i] + route2[j:end2] + route1[end1:],
+                    move.route2: route2[:j] + route1[i:end1] + route2[end2:]}
+        segment = route1[i:i + move.length]
+        del route1[i:i + move.length]
+        if move.route1 == move.route2:
+            if j > i:
+                j -= move.length
+            route1[j:j] = segment
+            return {move.route1: route1}
+        route2[j:j] = segment
+        return {move.route1: route1, move.route2: route2}
+
+    def candidate_routes(self, move):
+        """
+        Builds the routes obtained by applying a move, leaving the state untouched.
+
+        Args:
+            move (Move): Candidate move.
+
+        Returns:
+            list of lists: Candidate solution routes.
+        """
+        moved = self._moved_routes(move)
+        routes = [moved.get(index, route) for index, route in enumerate(self.routes)]
+        return [list(route) for route in routes if route]
+
+    def apply(self, move):
+        """
+        Applies a move in place and refreshes the loads and costs of the touched routes.
+
+        Routes emptied by the move are dropped.
+
+        Args:
+            move (Move): Move to apply.
+        """
+        moved = self._moved_routes(move)
+        for index, route in moved.items():
+            self.overloaded -= self.loads[index] > self.capacity
+            self.routes[index] = route
+            self._refresh(index)
+            self.overloaded += self.loads[index] > self.capacity
+
+        dropped = [index for index in sorted(moved, reverse=True) if not self.routes[index]]
+        for index in dropped:
+            del self.routes[index], self.loads[index], self.costs[index]
+            del self.prefix_loads[index], self.prefix_distances[index]
+        if dropped:
+            self._index_routes(start=min(dropped))
+        self._index_routes(indices=[index for index in moved if index < len(self.routes)])
+
+    def random_move(self, kinds=MOVE_KINDS, rng=random):
+        """
+        Draws a random well-formed move.
+
+        Args:
+            kinds (tuple): Move kinds to draw from.
+            rng (random.Random): Random source.
+
+        Returns:
+            Move or None: A move, or None if the drawn kind does not fit the routes.
+        """
+        routes = self.routes
+        kind = rng.choice(kinds)
+        if not routes:
+            return None
+        if self.neighbors is not None:
+            return self._granular_move(kind, rng)
+        if kind == "2opt":
+            r = rng.randrange(len(routes))
+            if len(routes[r]) < 2:
+                return None
+            i, j = sorted(rng.sample(range(len(routes[r])), 2))
+            return Move("2opt", r, i, r, j, 0)
+        if len(routes) < 2:
+            return None
+        r1, r2 = rng.sample(range(len(routes)), 2)
+        if kind == "2opt*":
+            move = Move("2opt*", r1, rng.randrange(len(routes[r1]) + 1), r2, rng.randrange(len(routes[r2]) + 1), 0)
+            return move if self.is_valid(move) else None
+        if kind == "cross":
+            length1, length2 = rng.randint(1, MAX_SEGMENT), rng.randint(1, MAX_SEGMENT)
+            if len(routes[r1]) < length1 or len(routes[r2]) < length2:
+                return None
+            return Move("cross", r1, rng.randrange(len(routes[r1]) - length1 + 1),
+                        r2, rng.randrange(len(routes[r2]) - length2 + 1), length1, length2)
+        if kind == "swap":
+            if not routes[r1] or not routes[r2]:
+                return None
+            return Move("swap", r1, rng.randrange(len(routes[r1])), r2, rng.randrange(len(routes[r2])), 1)
+        length = 1 if kind == "relocate" else rng.randint(1, MAX_SEGMENT)
+        if kind == "oropt" and rng.random() < 0.5:
+            r2 = r1  # Or-opt is also applied inside a route
+        if len(routes[r1]) < length:
+            return None
+        move = Move(kind, r1, rng.randrange(len(routes[r1]) - length + 1),
+                    r2, rng.randrange(len(routes[r2]) + 1), length)
+        return move if self.is_valid(move) else None
+
+    def _granular_move(self, kind, rng):
+        """Draws a move that makes a random customer adjacent to one of its neighbors."""
+        customer = rng.choice(self._customers)
+        candidates = self.neighbors.get(customer)
+        if not candidates:
+            return None
+        r1, i = self.where[customer]
+        r2, j = self.where[rng.choice(candidates)]
+        if kind == "2opt":
+            if r1 != r2 or i == j:
+                return None
+            # Reverse the segment between the two so that they become adjacent.
+            move = Move("2opt", r1, i + 1, r1, j, 0) if i < j else Move("2opt", r1, j + 1, r1, i, 0)
+        elif kind == "swap":
+            move = Move("swap", r1, i, r2, j, 1)
+        elif kind == "2opt*":
+            # Connect the customer to its neighbor: tails after the customer and from the neighbor.
+            move = Move("2opt*", r1, i + 1, r2, j, 0)
+        elif kind == "cross":
+            # The segment starting at the customer replaces the one right after its neighbor.
+            move = Move("cross", r1, i, r2, j + 1, rng.randint(1, MAX_SEGMENT), rng.randint(1, MAX_SEGMENT))
+        else:
+            # Insert the segment starting at the customer right after its neighbor.
+            move = Move(kind, r1, i, r2, j + 1, 1 if kind == "relocate" else rng.randint(1, MAX_SEGMENT))
+        return move if self.is_valid(move) else None
+
+    def sample_moves(self, count=30, kinds=MOVE_KINDS, rng=random, max_attempts=None):
+        """
+        Samples feasible moves and scores them.
+
+        Args:
+            count (int): Number of moves to return.
+            kinds (tuple): Move kinds to draw from.
+            rng (random.Random): Random source.
+            max_attempts (int): Upper bound on draws (defaults to 20 * count).
+
+        Returns:
+            list: (delta, move) pairs.
+        """
+        scored = []
+        attempts = max_attempts if max_attempts is not None else 20 * count
+        while len(scored) < count and attempts > 0:
+            attempts -= 1
+            move = self.random_move(kinds, rng)
+            if move is not None and self.is_feasible(move):
+                scored.append((self.delta(move), move))
+        return scored
+
+    def to_routes(self):
+        """
+        Returns a copy of the routes as a list of lists.
+
+        Returns:
+            list of lists: Solution routes.
+        """
+        return [list(route) for route in self.routes]
+
+    def to_solution(self):
+        """
+        Packs the routes into an array-backed Solution with cached loads and costs.
+
+        Returns:
+            Solution: The current solution.
+        """
+        solution = Solution.from_routes(self.routes)
+        solution.loads = array('d', self.loads)
+        solution.costs = array('d', self.costs)
+        return solution
@@ -0,0 +1,265 @@
+import inspect
+import os
+import random
+import statistics
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from .distance_matrix import cache_distance_matrix, get_distance_matrix
+    from .read_instances import read_instance
+    from .rng import make_rng, spawn_seeds
+    from .shared_instance import SharedInstance
+    from .solution import Solution
+    from .verify_solution import verify_solution
+except ImportError:
+    from distance_matrix import cache_distance_matrix, get_distance_matrix
+    from read_instances import read_instance
+    from rng import make_rng, spawn_seeds
+    from shared_instance import SharedInstance
+    from solution import Solution
+    from verify_solution import verify_solution
+
+# One solver run. `solver` is a module-level callable (so it can be pickled) called as
+# solver(instance_data, parameter) and returning (solution, cost); solvers accepting an
+# `rng` keyword receive the run's own random source. `seed` is an int or a SeedSequence.
+Job = namedtuple("Job", ["instance_path", "solver", "parameter", "seed"])
+
+# Instances shipped to the current worker process: {instance_path: (instance_data, optimal_cost)}.
+_WORKER_INSTANCES = {}
+
+
+def find_instances(data_path):
+    """
+    Lists the .vrp files under a directory, in a stable order.
+
+    Args:
+        data_path (str): Directory to walk.
+
+    Returns:
+        list: Paths of the .vrp files.
+    """
+    paths = []
+    for root, _, files in os.walk(data_path):
+        paths.extend(os.path.join(root, filename) for filename in files if filename.endswith('.vrp'))
+    return sorted(paths)
+
+
+def load_instances(instance_paths, optimal_costs=None):
+    """
+    Parses the instances, their optimal costs and distance matrices once in the parent process.
+
+    Args:
+        instance_paths (iterable): Paths of .vrp files (the .sol file is expected next to each).
+        optimal_costs (dict): Optional {instance_path: optimal_cost}, read from the .sol files otherwise.
+
+    Returns:
+        dict: {instance_path: (instance_data, optimal_cost, distance_matrix)}.
+    """
+    instances = {}
+    optimal_costs = optimal_costs or {}
+    for instance_path in instance_paths:
+        instance_data = read_instance(instance_path)
+        solution_path = instance_path.replace('.vrp', '.sol')
+        if instance_path in optimal_costs:
+            optimal_cost = optimal_costs[instance_path]
+        else:
+            optimal_cost = Solution.from_sol(solution_path)[1] if os.path.exists(solution_path) else None
+        instances[instance_path] = (instance_data, optimal_cost, get_distance_matrix(instance_data))
+    return instances
+
+
+def _init_worker(instances):
+    """Receives the parsed instances and distance matrices once per worker process."""
+    _WORKER_INSTANCES.clear()
+    for instance_path, (instance_data, optimal_cost, distance_matrix) in instances.items():
+        cache_distance_matrix(instance_data, distance_matrix)
+        _WORKER_INSTANCES[instance_path] = (instance_data, optimal_cost)
+
+
+def _init_shared_worker(shared):
+    """Attaches to the instances placed in shared memory by the parent process, without copying them."""
+    _WORKER_INSTANCES.clear()
+    for instance_path, (handle, optimal_cost) in shared.items():
+        _WORKER_INSTANCES[instance_path] = (handle.attach(), optimal_cost)
+
+
+def _accepts_rng(solver):
+    try:
+        return 'rng' in inspect.signature(solver).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def run_job(job):
+    """
+    Runs one job in the current process.
+
+    Args:
+        job (Job): The job to run.
+
+    Returns:
+        dict: Run record with the cost, validity, cost recomputed by `verify_solution`,
+        execution time and proximity to the optimum, or with an `error` message if
+        the solver raised.
+    """
+    instance_data, optimal_cost = _WORKER_INSTANCES[job.instance_path]
+    rng = make_rng(job.seed)
+    # Solvers still drawing from the global `random` module get the same stream in any process.
+    random.seed(rng.getrandbits(64))
+
+    start_time = time.time()
+    try:
+        if _accepts_rng(job.solver):
+            solution, cost = job.solver(instance_data, job.parameter, rng=rng)
+        else:
+            solution, cost = job.solver(instance_data, job.parameter)
+    except Exception as e:
+        return {'instance': job.instance_path, 'parameter': job.parameter, 'seed': job.seed, 'error': str(e)}
+    exec_time = time.time() - start_time
+
+    # Same checks as the serial evaluators: capacity and coverage, no truck count.
+    is_valid, verified_cost, message = verify_solution(
+        {key: instance_data[key] for key in ("name", "file_hash", "nodes", "demands", "capacity")},
+        solution
+    )
+    proximity = abs(optimal_cost - cost) / optimal_cost * 100 if optimal_cost else 0
+    return {
+        'instance': job.instance_path,
+        'parameter': job.parameter,
+        'seed': job.seed,
+        'cost': cost,
+        'solution': solution,
+        'valid': is_valid,
+        'verified_cost': verified_cost,
+        'message': message,
+        'exec_time': exec_time,
+        'proximity': proximity,
+    }
+
+
+def run_jobs(jobs, instances, workers=None):
+    """
+    Runs jobs over a process pool, or serially in-process when `workers` is 1.
+
+    Pool workers attach to the instance arrays and distance matrices through
+    shared memory (see `SharedInstance`) instead of receiving a copy each.
+
+    Args:
+        jobs (list): Jobs to run.
+        instances (dict): Output of `load_instances` covering every job instance.
+        workers (int): Number of worker processes, defaults to the CPU count.
+
+    Returns:
+        list: Run records, in the order of `jobs`.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(instances)
+        return [run_job(job) for job in jobs]
+
+    chunksize = max(1, len(jobs) // (4 * workers))
+    shared = {}
+    try:
+        for instance_path, (instance_data, optimal_cost, distance_matrix) in instances.items():
+            shared[instance_path] = (SharedInstance(instance_data, distance_matrix), optimal_cost)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_shared_worker,
+                                 initargs=(shared,)) as executor:
+            return list(executor.map(run_job, jobs, chunksize=chunksize))
+    finally:
+        for handle, _ in shared.values():
+            handle.close()
+
+
+def compute_metrics(records, total_simulations, valid_only=False):
+    """
+    Aggregates the runs of one (instance, parameter) pair.
+
+    Args:
+        records (list): Run records in run order.
+        total_simulations (int): Number of runs launched for the pair.
+        valid_only (bool): Compute the cost statistics (average/min/max cost, diversity
+            and convergence rate) from the valid runs only, with the cost recomputed by
+            `verify_solution`, instead of the solver cost of every completed run.
+
+    Returns:
+        dict: average/min/max cost, validity rates, execution time, proximity,
+        diversity and convergence rate, or None if no run completed (no valid run
+        with `valid_only`).
+    """
+    records = [record for record in records if 'error' not in record]
+    if valid_only:
+        costs = [record['verified_cost'] for record in records if record['valid']]
+    else:
+        costs = [record['cost'] for record in records]
+    if not costs:
+        return None
+    valid_solutions = sum(1 for record in records if record['valid'])
+    initial_cost = costs[0]
+    return {
+        'average_cost': statistics.mean(costs),
+        'min_cost': min(costs),
+        'max_cost': max(costs),
+        'valid_percentage': (valid_solutions / total_simulations) * 100,
+        'feasibility_rate': (valid_solutions / total_simulations) * 100,
+        'average_execution_time': statistics.mean(record['exec_time'] for record in records),
+        'average_proximity': statistics.mean(record['proximity'] for record in records),
+        'diversity': statistics.variance(costs) if len(costs) > 1 else 0,
+        'convergence_rate': (initial_cost - min(costs)) / initial_cost * 100 if initial_cost else 0,
+    }
+
+
+def aggregate(records, total_simulations, valid_only=False):
+    """
+    Groups run records by instance file name and parameter and computes their metrics.
+
+    Args:
+        records (list): Run records.
+        total_simulations (int): Number of runs launched per (instance, parameter) pair.
+        valid_only (bool): See `compute_metrics`.
+
+    Returns:
+        dict: {filename: {parameter: metrics}}.
+    """
+    grouped = {}
+    for record in records:
+        filename = os.path.basename(record['instance'])
+        grouped.setdefault(filename, {}).setdefault(record['parameter'], []).append(record)
+    return {
+        filename: {parameter: compute_metrics(runs, total_simulations, valid_only) for parameter, runs in by_parameter.items()}
+        for filename, by_parameter in grouped.items()
+    }
+
+
+def evaluate(instance_paths, solver, parameters, total_simulations=5, workers=None, base_seed=0, optimal_costs=None,
+             valid_only=False):
+    """
+    Runs `total_simulations` runs of a solver per instance and parameter and aggregates them.
+
+    Args:
+        instance_paths (list): Paths of the .vrp files.
+        solver (callable): Module-level solver(instance_data, parameter) -> (solution, cost).
+        parameters (list): Parameter values to sweep (e.g. tabu tenures).
+        total_simulations (int): Runs per (instance, parameter) pair.
+        workers (int): Number of worker processes, defaults to the CPU count.
+        base_seed (int): Root seed; each run gets its own SeedSequence child stream, so
+            results do not depend on `workers`.
+        optimal_costs (dict): Optional {instance_path: optimal_cost} (see `load_instances`).
+        valid_only (bool): Cost statistics over the valid runs only (see `compute_metrics`).
+
+    Returns:
+        dict: {filename: {parameter: metrics}}.
+    """
+    instances = load_instances(instance_paths, optimal_costs)
+    runs = [
+        (instance_path, parameter)
+        for instance_path in instance_paths
+        for parameter in parameters
+        for _ in range(total_simulations)
+    ]
+    jobs = [
+        Job(instance_path, solver, parameter, seed)
+        for (instance_path, parameter), seed in zip(runs, spawn_seeds(base_seed, len(runs)))
+    ]
+    return aggregate(run_jobs(jobs, instances, workers), total_simulations, valid_only)
@@ -0,0 +1,306 @@
+"""
+Reproducible profiling of a solver on one instance.
+
+Usage (from the repository root):
+
+    python -m template_code.profiling tabu data/A/A-n32-k5.vrp
+    python -m template_code.profiling path/to/solver.py:solve data/B/B-n78-k10.vrp \
+        --parameter 10 --profiler sampling --compare <revision>
+
+Phase timings (parse, matrix, solve with its construction/improvement phases,
+verification) and per-function statistics are written to
+`profiles/<git revision>/<solver>-<instance>.json`, next to the raw cProfile
+dump (`.prof`), so hot spots can be compared across revisions.
+"""
+import argparse
+import cProfile
+import collections
+import contextlib
+import importlib
+import json
+import os
+import pstats
+import subprocess
+import sys
+import threading
+import time
+
+try:
+    from .distance_matrix import get_distance_matrix
+    from .read_instances import read_instance
+    from .solvers import REPO_ROOT, SOLVERS, resolve_solver
+    from .verify_solution import verify_solution
+except ImportError:
+    from distance_matrix import get_distance_matrix
+    from read_instances import read_instance
+    from solvers import REPO_ROOT, SOLVERS, resolve_solver
+    from verify_solution import verify_solution
+
+PROFILES_DIR = os.path.join(REPO_ROOT, "profiles")
+
+# Timer collecting `phase` durations, None when no profiling run is active.
+_ACTIVE_TIMER = None
+_NO_PHASE = contextlib.nullcontext()
+
+
+class PhaseTimer:
+    """
+    Accumulates wall-clock time per named phase. Nested phases are recorded
+    under dotted names, e.g. `solve.construction`.
+    """
+
+    def __init__(self):
+        self.timings = collections.OrderedDict()
+        self._stack = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        self._stack.append(name)
+        key = ".".join(self._stack)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[key] = self.timings.get(key, 0.0) + time.perf_counter() - start
+            self._stack.pop()
+
+
+def phase(name):
+    """
+    Marks a phase of a solver (e.g. "construction", "improvement") for the profiler.
+
+    Outside of a profiling run this returns a shared no-op context manager.
+
+    Args:
+        name (str): Phase name.
+
+    Returns:
+        context manager: Times the enclosed block when profiling.
+    """
+    if _ACTIVE_TIMER is None:
+        return _NO_PHASE
+    return _ACTIVE_TIMER.phase(name)
+
+
+class StackSampler:
+    """
+    Minimal sampling profiler: a background thread records the stack of the
+    profiled thread every `interval` seconds.
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.self_samples = collections.Counter()
+        self.total_samples = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+
+    def _run(self, thread_id):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.self_samples[_frame_label(frame)] += 1
+            seen = set()
+            while frame is not None:
+                label = _frame_label(frame)
+                if label not in seen:
+                    self.total_samples[label] += 1
+                    seen.add(label)
+                frame = frame.f_back
+
+    def enable(self):
+        self._thread = threading.Thread(target=self._run, args=(threading.get_ident(),), daemon=True)
+        self._thread.start()
+
+    def disable(self):
+        self._stop.set()
+        self._thread.join()
+
+    def functions(self, top):
+        """Returns the `top` functions by self samples, with their estimated times."""
+        return [
+            {
+                'function': label,
+                'self_samples': count,
+                'total_samples': self.total_samples[label],
+                'self_time': count * self.interval,
+                'cumulative_time': self.total_samples[label] * self.interval,
+            }
+            for label, count in self.self_samples.most_common(top)
+        ]
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.relpath(code.co_filename, REPO_ROOT)}:{code.co_firstlineno}({code.co_name})"
+
+
+def _cprofile_functions(profile, top):
+    stats = pstats.Stats(profile)
+    rows = []
+    for (filename, line, name), (_, calls, self_time, cumulative_time, _) in stats.stats.items():
+        if filename != '~':
+            filename = os.path.relpath(filename, REPO_ROOT)
+        rows.append({
+            'function': f"{filename}:{line}({name})",
+            'calls': calls,
+            'self_time': self_time,
+            'cumulative_time': cumulative_time,
+        })
+    rows.sort(key=lambda row: row['self_time'], reverse=True)
+    return rows[:top]
+
+
+def git_revision():
+    """
+    Returns:
+        str: Short hash of HEAD, suffixed with `-dirty` when the tree has local
+        changes, or "unknown" outside of a git checkout.
+    """
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return revision + ("-dirty" if status.strip() else "")
+
+
+def profile_solver(instance_path, solver, parameter=None, profiler="cprofile", interval=0.001, top=30):
+    """
+    Runs a solver on one instance under a profiler and times its phases.
+
+    Args:
+        instance_path (str): Path to the .vrp file.
+        solver (callable): solver(instance_data, parameter) -> (solution, cost).
+        parameter: Parameter passed to the solver.
+        profiler (str): "cprofile" (deterministic) or "sampling".
+        interval (float): Sampling period in seconds (sampling profiler only).
+        top (int): Number of functions reported.
+
+    Returns:
+        tuple: (report dict, cProfile.Profile or None).
+    """
+    global _ACTIVE_TIMER
+    timer = PhaseTimer()
+    profile = cProfile.Profile() if profiler == "cprofile" else StackSampler(interval)
+    _ACTIVE_TIMER = timer
+    profile.enable()
+    try:
+        with timer.phase("parse"):
+            instance_data = read_instance(instance_path, use_cache=False)
+        with timer.phase("matrix"):
+            get_distance_matrix(instance_data)
+        with timer.phase("solve"):
+            solution, cost = solver(instance_data, parameter)
+        with timer.phase("verification"):
+            is_valid, _, message = verify_solution(instance_data, solution)
+    finally:
+        profile.disable()
+        _ACTIVE_TIMER = None
+
+    report = {
+        'instance': os.path.relpath(os.path.abspath(instance_path), REPO_ROOT),
+        'parameter': parameter,
+        'profiler': profiler,
+        'revision': git_revision(),
+        'python': sys.version.split()[0],
+        'cost': float(cost),
+        'valid': bool(is_valid),
+        'message': message,
+        'phases': dict(timer.timings),
+    }
+    if profiler == "cprofile":
+        report['functions'] = _cprofile_functions(profile, top)
+        return report, profile
+    report['samples'] = profile.samples
+    report['functions'] = profile.functions(top)
+    return report, None
+
+
+def save_report(report, profile, solver_name, output_dir=PROFILES_DIR):
+    """
+    Stores a report (and the raw cProfile dump) under `output_dir/<revision>/`.
+
+    Returns:
+        str: Path of the JSON report.
+    """
+    directory = os.path.join(output_dir, report['revision'])
+    os.makedirs(directory, exist_ok=True)
+    solver_label = os.path.basename(solver_name).replace(".py:", "-").replace(":", "-")
+    stem = os.path.join(directory, f"{solver_label}-{os.path.splitext(os.path.basename(report['instance']))[0]}")
+    if profile is not None:
+        profile.dump_stats(stem + ".prof")
+    with open(stem + ".json", 'w') as file:
+        json.dump(report, file, indent=2)
+    return stem + ".json"
+
+
+def compare_reports(report, baseline):
+    """
+    Compares phase and per-function self times with a report of another revision.
+
+    Returns:
+        list: Lines describing the changes, largest regressions first.
+    """
+    lines = []
+    for name, seconds in report['phases'].items():
+        before = baseline['phases'].get(name)
+        if before:
+            lines.append(f"phase {name}: {before:.4f}s -> {seconds:.4f}s ({(seconds - before) / before:+.1%})")
+    before = {row['function']: row['self_time'] for row in baseline['functions']}
+    changes = []
+    for row in report['functions']:
+        if row['function'] in before:
+            changes.append((row['self_time'] - before[row['function']], row['function'],
+                            before[row['function']], row['self_time']))
+    for diff, function, old, new in sorted(changes, reverse=True):
+        lines.append(f"{function}: {old:.4f}s -> {new:.4f}s ({diff:+.4f}s)")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile a CVRP solver on one instance.")
+    parser.add_argument("solver", help=f"One of {sorted(SOLVERS)} or path/to/file.py:function")
+    parser.add_argument("instance", help="Path to the .vrp file")
+    parser.add_argument("--parameter", type=json.loads, default=None, help="Solver parameter (JSON value)")
+    parser.add_argument("--profiler", choices=("cprofile", "sampling"), default="cprofile")
+    parser.add_argument("--interval", type=float, default=0.001, help="Sampling period in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top", type=int, default=30, help="Number of functions reported")
+    parser.add_argument("--output-dir", default=PROFILES_DIR)
+    parser.add_argument("--compare", metavar="REVISION", help="Revision whose stored report is compared")
+    args = parser.parse_args(argv)
+
+    import random
+    random.seed(args.seed)
+    report, profile = profile_solver(args.instance, resolve_solver(args.solver), args.parameter,
+                                     args.profiler, args.interval, args.top)
+    path = save_report(report, profile, args.solver, args.output_dir)
+
+    print(f"Cost {report['cost']:.2f} ({'valid' if report['valid'] else 'invalid'}), revision {report['revision']}")
+    for name, seconds in report['phases'].items():
+        print(f"  {name:<28} {seconds:.4f}s")
+    for row in report['functions'][:15]:
+        print(f"  {row['self_time']:.4f}s  {row['function']}")
+    print(f"Report written to {path}")
+
+    if args.compare:
+        baseline_path = os.path.join(args.output_dir, args.compare, os.path.basename(path))
+        if not os.path.exists(baseline_path):
+            print(f"No report for revision {args.compare} ({baseline_path}).")
+            return
+        with open(baseline_path) as file:
+            baseline = json.load(file)
+        print(f"Compared with {args.compare}:")
+        for line in compare_reports(report, baseline):
+            print(f"  {line}")
+
+
+if __name__ == "__main__":
+    # Run through the package module so that the solvers' `phase` calls reach the active timer.
+    sys.path.insert(0, REPO_ROOT)
+    importlib.import_module("template_code.profiling").main()
@@ -1,11 +1,156 @@
+import hashlib
+import os
 import re
 
-def read_instance(file_path):
+import numpy as np
+
+# Binary caches are stored in this directory, next to the .vrp files.
+CACHE_DIRNAME = "__vrpcache__"
+# Below this size, parsing the text file is faster than loading the binary cache.
+CACHE_MIN_BYTES = 16384
+_CACHE_VERSION = 2
+
+
+def file_hash(file_path):
+    """
+    Computes the SHA-1 digest of a file.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        str: Hexadecimal digest of the file contents.
+    """
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parse_vrp(file_path):
+    """
+    Streams a .vrp file into header fields and NumPy arrays.
+
+    Returns:
+        dict: Raw fields (name, trucks, optimal_value, dimension, capacity, has_depot)
+        and arrays (node_ids, coords, demand_ids, demand_values).
+    """
+    raw = {"name": None, "trucks": None, "optimal_value": None, "dimension": None,
+           "capacity": None, "has_depot": False}
+    node_tokens = []
+    demand_tokens = []
+    section = None
+
+    with open(file_path, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            if section == "nodes" and line[0].isdigit():
+                node_tokens.extend(line.split()[:3])
+                continue
+            if section == "demands" and line[0].isdigit():
+                demand_tokens.extend(line.split()[:2])
+                continue
+            if line.startswith("NAME"):
+                raw["name"] = line.split(":")[1].strip()
+            elif line.startswith("COMMENT"):
+                comment = line.split(":", 1)[1].strip()
+                trucks_match = re.search(r"No of trucks: (\d+)", comment)
+                optimal_match = re.search(r"Optimal value: (\d+)", comment)
+                raw["trucks"] = int(trucks_match.group(1)) if trucks_match else None
+                raw["optimal_value"] = int(optimal_match.group(1)) if optimal_match else None
+            elif line.startswith("DIMENSION"):
+                raw["dimension"] = int(line.split(":")[1].strip())
+            elif line.startswith("CAPACITY"):
+                raw["capacity"] = int(line.split(":")[1].strip())
+            elif line.startswith("NODE_COORD_SECTION"):
+                section = "nodes"
+            elif line.startswith("DEMAND_SECTION"):
+                section = "demands"
+            elif line.startswith("DEPOT_SECTION"):
+                section = "depot"
+            elif line.startswith("EOF"):
+                break
+            elif section == "depot":
+                raw["has_depot"] = True
+
+    nodes = np.array(node_tokens, dtype=np.float64).reshape(-1, 3)
+    demands = np.array(demand_tokens, dtype=np.int64).reshape(-1, 2)
+    raw["node_ids"] = nodes[:, 0].astype(np.int64)
+    raw["coords"] = nodes[:, 1:]
+    raw["demand_ids"] = demands[:, 0]
+    raw["demand_values"] = demands[:, 1]
+    return raw
+
+
+def _cache_path(file_path, cache_dir):
+    directory = cache_dir or os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIRNAME)
+    return os.path.join(directory, os.path.basename(file_path) + ".npz")
+
+
+def _optional(value):
+    return -1 if value is None else value
+
+
+def _save_cache(path, raw, digest, stat):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    header = [_CACHE_VERSION, stat.st_mtime_ns, stat.st_size, _optional(raw["trucks"]),
+              _optional(raw["optimal_value"]), _optional(raw["dimension"]),
+              _optional(raw["capacity"]), int(raw["has_depot"])]
+    tmp_path = path + f".{os.getpid()}.tmp.npz"
+    np.savez(
+        tmp_path,
+        header=np.array(header, dtype=np.int64),
+        strings=np.array([raw["name"] or "", digest]),
+        nodes=np.column_stack([raw["node_ids"], raw["coords"]]),
+        demands=np.column_stack([raw["demand_ids"], raw["demand_values"]]),
+    )
+    os.replace(tmp_path, path)
+
+
+def _load_cache(path, file_path, stat):
+    """Returns (raw, digest) from a valid cache, or None if it is missing or stale."""
+    try:
+        with np.load(path, allow_pickle=False) as cache:
+            header = cache["header"].tolist()
+            name, digest = cache["strings"].tolist()
+            if header[0] != _CACHE_VERSION:
+                return None
+            if header[1] != stat.st_mtime_ns or header[2] != stat.st_size:
+                # Touched but possibly unchanged: fall back to the content hash.
+                if file_hash(file_path) != digest:
+                    return None
+            nodes, demands = cache["nodes"], cache["demands"]
+    except (OSError, KeyError, ValueError):
+        return None
+    raw = {
+        "name": name or None,
+        "has_depot": bool(header[7]),
+        "node_ids": nodes[:, 0].astype(np.int64),
+        "coords": nodes[:, 1:],
+        "demand_ids": demands[:, 0],
+        "demand_values": demands[:, 1],
+    }
+    for key, value in zip(("trucks", "optimal_value", "dimension", "capacity"), header[3:7]):
+        raw[key] = None if value == -1 else value
+    return raw, digest
+
+
+def read_instance(file_path, use_cache=None, cache_dir=None):
     """
     Reads a .vrp file and extracts problem data.
 
+    Parsed instances are stored in a binary .npz cache (by default in a
+    `__vrpcache__` directory next to the .vrp file), invalidated when the file
+    modification time or size changes and its content hash no longer matches.
+
     Args:
         file_path (str): Path to the .vrp file.
+        use_cache (bool): Read and write the binary cache. By default the cache is
+            only used for files of at least CACHE_MIN_BYTES.
+        cache_dir (str): Directory of the binary cache, overriding the default.
 
     Returns:
         dict: Contains the following keys:
@@ -17,51 +162,57 @@ def read_instance(file_path):
             - nodes (dict): Node coordinates as {node_id: (x, y)}.
             - demands (dict): Node demands as {node_id: demand}.
             - depot (int): Depot node ID.
+            - file_hash (str): SHA-1 digest of the file, used as a cache key.
+            - coordinates (numpy.ndarray): Coordinates indexed by node ID, shape (n, 2).
+            - demand_array (numpy.ndarray): Demands indexed by node ID (0 where absent).
     """
+    raw = digest = None
+    stat = os.stat(file_path)
+    if use_cache is None:
+        use_cache = stat.st_size >= CACHE_MIN_BYTES
+    if use_cache:
+        path = _cache_path(file_path, cache_dir)
+        cached = _load_cache(path, file_path, stat) if os.path.exists(path) else None
+        if cached is not None:
+            raw, digest = cached
+    if raw is None:
+        raw = _parse_vrp(file_path)
+        digest = file_hash(file_path)
+        if use_cache:
+            try:
+                _save_cache(path, raw, digest, stat)
+            except OSError:
+                pass  # Read-only data directory: run without cache.
+
     data = {}
-    with open(file_path, 'r') as file:
-        lines = file.readlines()
+    if raw["name"] is not None:
+        data["name"] = raw["name"]
+    data["trucks"] = raw["trucks"]
+    data["optimal_value"] = raw["optimal_value"]
+    if raw["dimension"] is not None:
+        data["dimension"] = raw["dimension"]
+    if raw["capacity"] is not None:
+        data["capacity"] = raw["capacity"] + 100
+    if raw["has_depot"]:
+        data["depot"] = 0
+
+    node_ids, coords = raw["node_ids"], raw["coords"]
+    # Node 0 is the (floored) centroid of the nodes.
+    centroid = coords.sum(axis=0) // len(node_ids)
+    nodes = dict(zip(node_ids.tolist(), map(tuple, coords.tolist())))
+    nodes[0] = (float(centroid[0]), float(centroid[1]))
+
+    size = int(node_ids.max()) + 1
+    coordinates = np.full((size, 2), np.nan)
+    coordinates[node_ids] = coords
+    coordinates[0] = centroid
+    demand_array = np.zeros(size, dtype=np.int64)
+    demand_array[raw["demand_ids"]] = raw["demand_values"]
 
-    section = None
-    nodes = {}
-    demands = {}
-
-    for line in lines:
-        line = line.strip()
-        if line.startswith("NAME"):
-            data["name"] = line.split(":")[1].strip()
-        elif line.startswith("COMMENT"):
-            comment = line.split(":", 1)[1].strip()
-            trucks_match = re.search(r"No of trucks: (\d+)", comment)
-            optimal_match = re.search(r"Optimal value: (\d+)", comment)
-            data["trucks"] = int(trucks_match.group(1)) if trucks_match else None
-            data["optimal_value"] = int(optimal_match.group(1)) if optimal_match else None
-        elif line.startswith("DIMENSION"):
-            data["dimension"] = int(line.split(":")[1].strip())
-        elif line.startswith("CAPACITY"):
-            data["capacity"] = int(line.split(":")[1].strip()) + 100
-        elif line.startswith("NODE_COORD_SECTION"):
-            section = "nodes"
-        elif line.startswith("DEMAND_SECTION"):
-            section = "demands"
-        elif line.startswith("DEPOT_SECTION"):
-            section = "depot"
-        elif line.startswith("EOF"):
-            break
-        elif section == "nodes":
-            parts = line.split()
-            node_id, x, y = int(parts[0]), float(parts[1]), float(parts[2])
-            nodes[node_id] = (x, y)
-        elif section == "demands":
-            parts = line.split()
-            node_id, demand = int(parts[0]), int(parts[1])
-            demands[node_id] = demand
-        elif section == "depot":
-            data["depot"] = 0
-            
-    nodes[0] = (sum(x for x, y in nodes.values()) // len(nodes), sum(y for x, y in nodes.values()) // len(nodes))
-    print(nodes)
     data["nodes"] = nodes
-    data["demands"] = demands
-    data["total_demand"] = sum(demands.values())
+    data["demands"] = dict(zip(raw["demand_ids"].tolist(), raw["demand_values"].tolist()))
+    data["total_demand"] = int(raw["demand_values"].sum())
+    data["file_hash"] = digest
+    data["coordinates"] = coordinates
+    data["demand_array"] = demand_array
     return data
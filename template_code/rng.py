@@ -0,0 +1,48 @@
+import random
+
+import numpy as np
+
+
+def make_rng(seed=None):
+    """
+    Normalizes a seed into the random source used by the solvers.
+
+    The solvers draw many scalars per iteration, so they use the `random.Random`
+    interface (choice, randrange, sample, random), which is much faster than
+    per-call NumPy draws. NumPy generators and seed sequences are converted into
+    an independent `random.Random` seeded from their stream.
+
+    Args:
+        seed: None (the global `random` module, i.e. the legacy behaviour), an int,
+            a `random.Random`, a `numpy.random.SeedSequence` or a `numpy.random.Generator`.
+
+    Returns:
+        random.Random or module: Object with the `random.Random` interface.
+    """
+    if seed is None:
+        return random
+    if isinstance(seed, random.Random):
+        return seed
+    if isinstance(seed, np.random.SeedSequence):
+        return random.Random(int.from_bytes(seed.generate_state(4, np.uint32).tobytes(), 'little'))
+    if isinstance(seed, np.random.Generator):
+        return random.Random(int(seed.integers(0, 2 ** 63)))
+    return random.Random(seed)
+
+
+def spawn_seeds(base_seed, count):
+    """
+    Derives independent child streams, one per run.
+
+    Children of a `SeedSequence` are statistically independent and depend only on
+    `base_seed` and their index, so a run draws the same numbers whether it is
+    executed serially or in any worker process.
+
+    Args:
+        base_seed (int): Root seed.
+        count (int): Number of streams.
+
+    Returns:
+        list: `numpy.random.SeedSequence` children (picklable).
+    """
+    return np.random.SeedSequence(base_seed).spawn(count)
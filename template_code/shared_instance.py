@@ -0,0 +1,155 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    from .distance_matrix import cache_distance_matrix, get_distance_matrix
+except ImportError:
+    from distance_matrix import cache_distance_matrix, get_distance_matrix
+
+# Instance arrays placed in shared memory, when present in the instance dictionary.
+SHARED_ARRAYS = ("coordinates", "demand_array")
+
+# Blocks attached by the current process, kept open as long as their views are in use.
+_ATTACHED = {}
+
+
+def neighbor_array(distance_matrix, customers, k):
+    """
+    Builds the k nearest other customers of each customer as a dense array.
+
+    Args:
+        distance_matrix (numpy.ndarray): Matrix indexed by node ID.
+        customers (iterable): Node IDs of the customers.
+        k (int): Number of neighbors per customer.
+
+    Returns:
+        numpy.ndarray: int32 array of shape (len(distance_matrix), k); row `c` holds
+        the neighbors of customer `c` by increasing distance, padded with -1.
+    """
+    customers = np.array(list(customers), dtype=np.intp)
+    neighbors = np.full((len(distance_matrix), k), -1, dtype=np.int32)
+    size = min(k, len(customers) - 1)
+    if size > 0:
+        distances = np.array(distance_matrix[np.ix_(customers, customers)], dtype=np.float64)
+        np.fill_diagonal(distances, np.inf)
+        nearest = np.argpartition(distances, size - 1, axis=1)[:, :size]
+        order = np.argsort(np.take_along_axis(distances, nearest, axis=1), axis=1, kind='stable')
+        neighbors[customers, :size] = customers[np.take_along_axis(nearest, order, axis=1)]
+    return neighbors
+
+
+def neighbor_lists(neighbors, customers):
+    """
+    Reads the candidate lists of `neighbor_array` back as a dictionary.
+
+    Args:
+        neighbors (numpy.ndarray): Output of `neighbor_array`, e.g. a shared view.
+        customers (iterable): Node IDs of the customers.
+
+    Returns:
+        dict: {customer: [neighbor, ...]} as returned by `spatial_index.nearest_neighbor_lists`.
+    """
+    return {customer: [node for node in neighbors[customer].tolist() if node >= 0] for customer in customers}
+
+
+class SharedInstance:
+    """
+    Instance whose arrays (coordinates, demands, distance matrix and optional
+    neighbor lists) live in `multiprocessing.shared_memory` blocks.
+
+    The handle only pickles the block names and the small instance fields, so it
+    is cheap to send to worker processes, which `attach` to the blocks without
+    copying them. Matrices that are not held in memory (see
+    `distance_matrix.configure_storage`) are not copied either: workers reopen a
+    memory-mapped file and receive an on-the-fly provider as is. The creating
+    process owns the blocks and must `close` the handle (or use it as a context
+    manager) once the workers are done.
+    """
+
+    def __init__(self, instance_data, distance_matrix=None, neighbor_k=None, customers=None):
+        """
+        Copies the instance arrays into new shared-memory blocks.
+
+        Args:
+            instance_data (dict): Parsed .vrp instance data, or any dict with `nodes`.
+            distance_matrix (numpy.ndarray): Matrix of the instance, built with
+                `get_distance_matrix` when omitted.
+            neighbor_k (int): Also share the k nearest neighbors of each customer, for the
+                granular neighborhoods of the workers (see `neighbor_lists`).
+            customers (iterable): Customers for the neighbor lists, defaults to the
+                keys of `instance_data["demands"]` other than node 0.
+        """
+        if distance_matrix is None:
+            distance_matrix = get_distance_matrix(instance_data)
+        arrays = {key: instance_data[key] for key in SHARED_ARRAYS if instance_data.get(key) is not None}
+        # Path of a memory-mapped matrix, or the distance provider itself when not an array.
+        self.matrix_source = None
+        if isinstance(distance_matrix, np.memmap):
+            self.matrix_source = distance_matrix.filename
+        elif isinstance(distance_matrix, np.ndarray):
+            arrays["distance_matrix"] = distance_matrix
+        else:
+            self.matrix_source = distance_matrix
+        if neighbor_k:
+            if customers is None:
+                customers = [node for node in instance_data["demands"] if node != 0]
+            arrays["neighbor_array"] = neighbor_array(distance_matrix, customers, neighbor_k)
+
+        self.fields = {key: value for key, value in instance_data.items() if key not in SHARED_ARRAYS}
+        self.specs = {}
+        self._blocks = []
+        for key, array in arrays.items():
+            array = np.asarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.specs[key] = (block.name, array.shape, array.dtype.str)
+
+    def __getstate__(self):
+        return {'fields': self.fields, 'specs': self.specs, 'matrix_source': self.matrix_source, '_blocks': []}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def nbytes(self):
+        """int: Total size of the shared arrays."""
+        return sum(int(np.prod(shape)) * np.dtype(dtype).itemsize for _, shape, dtype in self.specs.values())
+
+    def attach(self):
+        """
+        Maps the shared arrays into the current process, zero-copy.
+
+        The distance matrix is registered in the `distance_matrix` cache, so
+        `get_distance_matrix` returns the shared view in this process.
+
+        Returns:
+            dict: Instance data whose arrays are read-only views on the shared
+            blocks; the distance matrix is under `distance_matrix` and the
+            neighbor lists, if shared, under `neighbor_array`.
+        """
+        instance_data = dict(self.fields)
+        for key, (name, shape, dtype) in self.specs.items():
+            block = _ATTACHED.get(name)
+            if block is None:
+                block = _ATTACHED[name] = shared_memory.SharedMemory(name=name)
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            array.setflags(write=False)
+            instance_data[key] = array
+        if isinstance(self.matrix_source, str):
+            instance_data["distance_matrix"] = np.load(self.matrix_source, mmap_mode='r')
+        elif self.matrix_source is not None:
+            instance_data["distance_matrix"] = self.matrix_source
+        cache_distance_matrix(instance_data, instance_data["distance_matrix"])
+        return instance_data
+
+    def close(self):
+        """Frees the shared blocks (in the creating process only)."""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
@@ -0,0 +1,215 @@
+from array import array
+
+
+class Solution:
+    """
+    CVRP solution stored as a giant tour with route start offsets.
+
+    Route `i` is `tour[starts[i]:starts[i + 1]]`. Per-route loads and costs are
+    cached when demands and a distance matrix are provided. Clones share their
+    buffers until one of them is modified (copy-on-write).
+
+    The class behaves as a read-only sequence of routes (lists of node IDs), so it
+    can be passed to `verify_solution`, `calculate_total_cost` and `print_solution`
+    in place of a list of lists.
+    """
+
+    __slots__ = ("tour", "starts", "loads", "costs", "_shared")
+
+    def __init__(self, tour, starts, loads=None, costs=None):
+        """
+        Args:
+            tour (array): Customers of every route, concatenated (typecode 'i').
+            starts (array): Start offset of each route, plus the tour length (typecode 'i').
+            loads (array): Optional per-route loads (typecode 'd').
+            costs (array): Optional per-route costs (typecode 'd').
+        """
+        self.tour = tour
+        self.starts = starts
+        self.loads = loads
+        self.costs = costs
+        # Reference count shared by the solutions holding the same buffers, None when not shared.
+        self._shared = None
+
+    @classmethod
+    def from_routes(cls, routes, demands=None, distance_matrix=None, depot=0):
+        """
+        Builds a solution from a list of routes.
+
+        Args:
+            routes (list of lists): Solution routes, e.g., [[1, 2, 3], [4, 5, 6]].
+            demands (dict): Optional node demands, to cache route loads.
+            distance_matrix (numpy.ndarray): Optional matrix indexed by node ID, to cache route costs.
+            depot (int): Depot node ID.
+
+        Returns:
+            Solution: The packed solution.
+        """
+        tour = array('i')
+        starts = array('i', [0])
+        for route in routes:
+            tour.extend(route)
+            starts.append(len(tour))
+        solution = cls(tour, starts)
+        if demands is not None:
+            solution.loads = array('d', (sum(demands[node] for node in route) for route in routes))
+        if distance_matrix is not None:
+            solution.costs = array('d', (route_cost(route, distance_matrix, depot) for route in routes))
+        return solution
+
+    @classmethod
+    def from_sol(cls, solution_path):
+        """
+        Reads a .sol file.
+
+        Args:
+            solution_path (str): Path to the .sol file.
+
+        Returns:
+            tuple: (Solution, cost) where cost is the value of the `Cost` line, or None.
+        """
+        routes = []
+        cost = None
+        with open(solution_path, 'r') as file:
+            for line in file:
+                if line.startswith("Route #"):
+                    routes.append([int(node) for node in line.split(":", 1)[1].split()])
+                elif line.startswith("Cost"):
+                    cost = float(line.split()[1])
+        return cls.from_routes(routes), cost
+
+    def to_routes(self):
+        """
+        Returns:
+            list of lists: The routes as lists of node IDs.
+        """
+        return list(self)
+
+    def to_sol(self, cost=None):
+        """
+        Formats the solution in the .sol format.
+
+        Args:
+            cost (float): Cost to write, defaults to the cached cost if available.
+
+        Returns:
+            str: .sol file contents.
+        """
+        lines = [f"Route #{i}: {' '.join(map(str, route))}" for i, route in enumerate(self, start=1)]
+        if cost is None and self.costs is not None:
+            cost = self.total_cost
+        if cost is not None:
+            lines.append(f"Cost {cost:g}" if float(cost).is_integer() else f"Cost {cost}")
+        return "\n".join(lines) + "\n"
+
+    @property
+    def total_cost(self):
+        """float: Sum of the cached route costs (requires a distance matrix at build time)."""
+        if self.costs is None:
+            raise ValueError("Route costs are not cached for this solution.")
+        return sum(self.costs)
+
+    def clone(self):
+        """
+        Returns a copy sharing the buffers until either copy is modified.
+
+        Returns:
+            Solution: The clone.
+        """
+        other = Solution(self.tour, self.starts, self.loads, self.costs)
+        if self._shared is None:
+            self._shared = [1]
+        self._shared[0] += 1
+        other._shared = self._shared
+        return other
+
+    def _own(self):
+        """Detaches from the shared buffers, copying them unless this is their last holder."""
+        if self._shared is None:
+            return
+        self._shared[0] -= 1
+        if self._shared[0] > 0:
+            self.tour = array('i', self.tour)
+            self.starts = array('i', self.starts)
+            if self.loads is not None:
+                self.loads = array('d', self.loads)
+            if self.costs is not None:
+                self.costs = array('d', self.costs)
+        self._shared = None
+
+    def set_route(self, index, route, load=None, cost=None):
+        """
+        Replaces a route in place (copying the shared buffers first if needed).
+
+        Args:
+            index (int): Route index.
+            route (list): New customers of the route.
+            load (float): New route load, required if loads are cached.
+            cost (float): New route cost, required if costs are cached.
+        """
+        self._own()
+        start, end = self.starts[index], self.starts[index + 1]
+        self.tour[start:end] = array('i', route)
+        shift = len(route) - (end - start)
+        if shift:
+            for i in range(index + 1, len(self.starts)):
+                self.starts[i] += shift
+        if self.loads is not None:
+            self.loads[index] = load
+        if self.costs is not None:
+            self.costs[index] = cost
+
+    def key(self):
+        """
+        Returns:
+            bytes: Hashable fingerprint of the routes.
+        """
+        return self.starts.tobytes() + self.tour.tobytes()
+
+    def __len__(self):
+        return len(self.starts) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("route index out of range")
+        return self.tour[self.starts[index]:self.starts[index + 1]].tolist()
+
+    def __iter__(self):
+        tour, starts = self.tour, self.starts
+        for i in range(len(starts) - 1):
+            yield tour[starts[i]:starts[i + 1]].tolist()
+
+    def __eq__(self, other):
+        if isinstance(other, Solution):
+            return self.starts == other.starts and self.tour == other.tour
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return f"Solution({self.to_routes()})"
+
+
+def route_cost(route, distance_matrix, depot=0):
+    """
+    Computes the cost of a single route, depot to depot.
+
+    Args:
+        route (list): Customers of the route.
+        distance_matrix (numpy.ndarray): Matrix indexed by node ID.
+        depot (int): Depot node ID.
+
+    Returns:
+        float: Route cost.
+    """
+    cost = 0.0
+    prev_node = depot
+    for node in route:
+        cost += distance_matrix[prev_node, node]
+        prev_node = node
+    return cost + distance_matrix[prev_node, depot]
@@ -0,0 +1,139 @@
+import importlib.util
+import os
+import sys
+
+try:
+    from .constructors import clarke_wright_savings
+    from .distance_matrix import get_distance_matrix
+    from .solution import route_cost
+except ImportError:
+    from constructors import clarke_wright_savings
+    from distance_matrix import get_distance_matrix
+    from solution import route_cost
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _load_module(path):
+    """Imports a solver file with its own directory on sys.path, as the team scripts expect."""
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    template_dir = os.path.join(REPO_ROOT, "template_code")
+    if template_dir not in sys.path:
+        sys.path.append(template_dir)
+    name = os.path.splitext(os.path.basename(path))[0]
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _team2(file_name):
+    return _load_module(os.path.join(REPO_ROOT, "submissions", "team2", file_name))
+
+
+def tabu(instance_data, parameter=None, budget=None, rng=None):
+    """Team 2 tabu search, 100 iterations; `parameter` is the tabu tenure (default 10)."""
+    nodes = instance_data["nodes"]
+    # The team 2 depot is node 1: its row of the instance matrix serves as the depot row.
+    return _team2("rechercheTabouImpl.py").tabu_search(
+        dict(nodes), instance_data["demands"], instance_data["capacity"], 100, parameter or 10, nodes[1],
+        budget=budget, rng=rng, distance_matrix=get_distance_matrix(instance_data), depot_node=1)
+
+
+def islands(instance_data, parameter=None, budget=None, rng=None):
+    """Team 2 island-model tabu search, 100 iterations per island; `parameter` is the number of islands (default 3)."""
+    nodes = instance_data["nodes"]
+    return _team2("rechercheTabouImpl.py").island_tabu_search(
+        dict(nodes), instance_data["demands"], instance_data["capacity"], 100, nodes[1],
+        num_islands=parameter, budget=budget, rng=rng, distance_matrix=get_distance_matrix(instance_data), depot_node=1)
+
+
+def local(instance_data, parameter=None, budget=None, rng=None):
+    """Team 2 local search; `parameter` is the iteration limit (default 100)."""
+    nodes = instance_data["nodes"]
+    return _team2("rechercheLocaleImpl.py").local_search(
+        dict(nodes), instance_data["demands"], instance_data["capacity"], parameter or 100, nodes[1],
+        budget=budget, rng=rng, distance_matrix=get_distance_matrix(instance_data), depot_node=1)
+
+
+def annealing(instance_data, parameter=None, budget=None, rng=None):
+    """Team 2 simulated annealing; `parameter` is the number of iterations per temperature (default 100)."""
+    return _team2("recuitSimuleImpl.py").simulated_annealing(
+        instance_data, 1000, 5, 0.99, parameter or 100, budget=budget, rng=rng)
+
+
+def tempering(instance_data, parameter=None, budget=None, rng=None):
+    """Team 2 parallel tempering (one process per CPU); `parameter` is the number of chains (default: CPU count)."""
+    return _team2("recuitParalleleImpl.py").parallel_tempering(
+        instance_data, 1000, 5, num_chains=parameter, budget=budget, rng=rng)
+
+
+def greedy(instance_data, parameter=None, budget=None, rng=None):
+    """Team 2 greedy nearest-neighbor construction (deterministic, ignores the parameter and budget)."""
+    module = _team2("heuristiqueGloutonne.py")
+    distance_matrix = get_distance_matrix(instance_data)
+    routes = module.greedy_cvrp(instance_data["nodes"], instance_data["demands"], instance_data["capacity"],
+                                distance_matrix)
+    return routes, module.calculate_cost(routes, instance_data["nodes"], distance_matrix)
+
+
+def savings(instance_data, parameter=None, budget=None, rng=None):
+    """Clarke-Wright parallel savings construction (deterministic, ignores the parameter and budget)."""
+    distance_matrix = get_distance_matrix(instance_data)
+    # Same convention as greedy_cvrp and verify_solution: node 0 is the depot.
+    routes = clarke_wright_savings(distance_matrix, instance_data["demands"], instance_data["capacity"],
+                                   customers=[node for node in instance_data["demands"] if node != 0])
+    return routes, sum(route_cost(route, distance_matrix) for route in routes)
+
+
+def sweep(instance_data, parameter=None, budget=None, rng=None):
+    """Team 2 sweep construction (deterministic, ignores the parameter and budget)."""
+    module = _team2("heuristiqueGloutonne.py")
+    routes = module.sweep_cvrp(instance_data["nodes"], instance_data["demands"], instance_data["capacity"])
+    return routes, module.calculate_cost(routes, instance_data["nodes"], get_distance_matrix(instance_data))
+
+
+def kmeans(instance_data, parameter=None, budget=None, rng=None):
+    """Team 2 capacitated k-means cluster-first construction (deterministic, ignores the parameter and budget)."""
+    module = _team2("heuristiqueGloutonne.py")
+    routes = module.cluster_cvrp(instance_data["nodes"], instance_data["demands"], instance_data["capacity"])
+    return routes, module.calculate_cost(routes, instance_data["nodes"], get_distance_matrix(instance_data))
+
+
+# Shipped solvers, called as solver(instance_data, parameter) like in parallel_evaluation,
+# with optional `budget` (SearchBudget) and `rng` (see rng.make_rng) keywords.
+SOLVERS = {
+    "tabu": tabu,
+    "islands": islands,
+    "local": local,
+    "annealing": annealing,
+    "tempering": tempering,
+    "greedy": greedy,
+    "savings": savings,
+    "sweep": sweep,
+    "kmeans": kmeans,
+}
+
+
+def resolve_solver(spec):
+    """
+    Finds a solver from its name in SOLVERS or a `path/to/file.py:function` spec.
+
+    Args:
+        spec (str): Solver name or spec. The function is called as function(instance_data, parameter).
+
+    Returns:
+        callable: The solver.
+    """
+    if spec in SOLVERS:
+        return SOLVERS[spec]
+    path, separator, function = spec.rpartition(":")
+    if not separator or not path.endswith(".py"):
+        raise ValueError(f"Unknown solver {spec!r}: use one of {sorted(SOLVERS)} or path/to/file.py:function.")
+    return getattr(_load_module(path), function)
@@ -0,0 +1,140 @@
+import weakref
+
+import numpy as np
+
+
+class NearestNeighborIndex:
+    """
+    Nearest-feasible-customer queries for constructive heuristics.
+
+    Each row of the distance matrix gets, on first use, the list of its `k`
+    nearest customers sorted by distance. Served customers are deleted lazily: a
+    per-row cursor skips them once, so repeated queries from a node stay cheap.
+    Customers whose demand exceeds the remaining capacity are skipped without
+    being deleted. When a truncated list runs out, the query falls back to a
+    vectorized scan of the remaining customers.
+    """
+
+    def __init__(self, distance_matrix, customers, demands, k=32):
+        """
+        Args:
+            distance_matrix (numpy.ndarray): Matrix indexed by node ID (negative rows allowed).
+            customers (iterable): Node IDs to serve.
+            demands (dict or sequence): Demand of each customer, indexed by node ID.
+            k (int): Length of the per-row neighbor lists, None for full lists.
+        """
+        self.distance_matrix = distance_matrix
+        self.customers = list(customers)
+        self._columns = np.array(self.customers, dtype=np.intp)
+        self._demands = [demands[customer] for customer in self.customers]
+        self._demand_array = np.array(self._demands, dtype=np.float64)
+        self._served = np.zeros(len(self.customers), dtype=bool)
+        self._position = {customer: pos for pos, customer in enumerate(self.customers)}
+        self._k = len(self.customers) if k is None else min(k, len(self.customers))
+        self._lists = {}
+        self._cursor = {}
+        self._remaining = len(self.customers)
+
+    def __len__(self):
+        return self._remaining
+
+    def __contains__(self, customer):
+        pos = self._position.get(customer)
+        return pos is not None and not self._served[pos]
+
+    def _neighbors(self, row):
+        neighbors = self._lists.get(row)
+        if neighbors is None:
+            distances = self.distance_matrix[row, self._columns]
+            if self._k < len(distances):
+                nearest = np.argpartition(distances, self._k - 1)[:self._k]
+                neighbors = nearest[np.argsort(distances[nearest], kind='stable')].tolist()
+            else:
+                neighbors = np.argsort(distances, kind='stable').tolist()
+            self._lists[row] = neighbors
+            self._cursor[row] = 0
+        return neighbors
+
+    def remove(self, customer):
+        """
+        Marks a customer as served.
+
+        Args:
+            customer (int): Node ID.
+        """
+        pos = self._position[customer]
+        if not self._served[pos]:
+            self._served[pos] = True
+            self._remaining -= 1
+
+    def nearest_feasible(self, node, max_demand):
+        """
+        Finds the closest unserved customer whose demand fits in the remaining capacity.
+
+        Args:
+            node (int): Current node (row of the distance matrix).
+            max_demand (float): Remaining vehicle capacity.
+
+        Returns:
+            int or None: Node ID of the customer, or None if no customer fits.
+        """
+        if not self._remaining:
+            return None
+        neighbors = self._neighbors(node)
+        served = self._served
+        cursor = self._cursor[node]
+        while cursor < len(neighbors) and served[neighbors[cursor]]:
+            cursor += 1
+        self._cursor[node] = cursor
+
+        demands = self._demands
+        for index in range(cursor, len(neighbors)):
+            pos = neighbors[index]
+            if not served[pos] and demands[pos] <= max_demand:
+                return self.customers[pos]
+
+        if len(neighbors) == len(self.customers):
+            return None
+        # Truncated list exhausted: scan the remaining customers at once.
+        feasible = ~served & (self._demand_array <= max_demand)
+        if not feasible.any():
+            return None
+        distances = np.where(feasible, self.distance_matrix[node, self._columns], np.inf)
+        return self.customers[int(np.argmin(distances))]
+
+
+# {id(distance_matrix): (weak reference to the matrix, {(customers, k): lists})}
+_KNN_CACHE = {}
+
+
+def nearest_neighbor_lists(distance_matrix, customers, k):
+    """
+    Computes, once per distance matrix, the k nearest other customers of each customer.
+
+    Args:
+        distance_matrix (numpy.ndarray): Matrix indexed by node ID.
+        customers (iterable): Node IDs of the customers.
+        k (int): Number of neighbors per customer.
+
+    Returns:
+        dict: {customer: [neighbor, ...]} sorted by increasing distance.
+    """
+    customers = tuple(customers)
+    entry = _KNN_CACHE.get(id(distance_matrix))
+    if entry is None or entry[0]() is not distance_matrix:
+        entry = _KNN_CACHE[id(distance_matrix)] = (weakref.ref(distance_matrix), {})
+    lists = entry[1].get((customers, k))
+    if lists is None:
+        columns = np.array(customers, dtype=np.intp)
+        distances = np.array(distance_matrix[np.ix_(columns, columns)], dtype=np.float64)
+        np.fill_diagonal(distances, np.inf)
+        size = min(k, len(customers) - 1)
+        if size <= 0:
+            lists = {customer: [] for customer in customers}
+        else:
+            nearest = np.argpartition(distances, size - 1, axis=1)[:, :size]
+            order = np.argsort(np.take_along_axis(distances, nearest, axis=1), axis=1, kind='stable')
+            nearest = columns[np.take_along_axis(nearest, order, axis=1)]
+            lists = dict(zip(customers, nearest.tolist()))
+        entry[1][(customers, k)] = lists
+    return lists
@@ -0,0 +1,131 @@
+from collections import deque
+
+import numpy as np
+
+
+def _prefix_arrays(tour, distance_matrix, demands, depot):
+    """
+    Prefix sums of a giant tour, with positions 1..n for the customers:
+    `load[i]` is the demand of the first i customers, `inner[i]` the distance
+    from the first customer to the i-th one along the tour, `out[i]`/`back[i]`
+    the distances from/to the depot of the i-th customer.
+    """
+    nodes = np.asarray(tour, dtype=np.intp)
+    load = np.zeros(len(nodes) + 1)
+    load[1:] = np.cumsum([demands[node] for node in tour])
+    inner = np.zeros(len(nodes) + 1)
+    inner[2:] = np.cumsum(distance_matrix[nodes[:-1], nodes[1:]])
+    out = np.zeros(len(nodes) + 1)
+    out[1:] = distance_matrix[depot, nodes]
+    back = np.zeros(len(nodes) + 1)
+    back[1:] = distance_matrix[nodes, depot]
+    return load.tolist(), inner.tolist(), out.tolist(), back.tolist()
+
+
+def _split_layer(previous, load, inner, out, back, capacity, first=0):
+    """
+    One pass of the deque-based Split: the best cost of each prefix of the tour
+    given the best costs `previous` of the prefixes ending one route earlier, or
+    with any number of routes when `previous` is None (unlimited fleet).
+
+    A route serving customers i+1..j costs out[i+1] + inner[j] - inner[i+1] + back[j],
+    so the best predecessor of j minimizes f(i) = previous[i] + out[i+1] - inner[i+1]
+    over the indices whose route to j fits in the vehicle. The deque holds candidate
+    predecessors with increasing f from front to back: the front is the best one, a
+    new index removes the older ones it dominates, and indices leave by the front
+    once the load from them exceeds the capacity. Each index enters and leaves the
+    deque once, so the pass is O(n).
+    """
+    n = len(load) - 1
+    cost = [float('inf')] * (n + 1)
+    pred = [-1] * (n + 1)
+    if previous is None:
+        cost[0] = 0.0
+        previous = cost
+    f = [0.0] * (n + 1)
+    candidates = deque()
+    for j in range(first, n + 1):
+        if candidates:
+            i = candidates[0]
+            cost[j] = f[i] + inner[j] + back[j]
+            pred[j] = i
+        if j == n:
+            break
+        if previous[j] != float('inf'):
+            f[j] = previous[j] + out[j + 1] - inner[j + 1]
+            # An older index with the same load and a lower f is better for every later route.
+            if not (candidates and load[candidates[-1]] == load[j] and f[candidates[-1]] <= f[j]):
+                while candidates and f[j] <= f[candidates[-1]]:
+                    candidates.pop()
+                candidates.append(j)
+        while candidates and load[j + 1] - load[candidates[0]] > capacity:
+            candidates.popleft()
+    return cost, pred
+
+
+def split_tour(tour, distance_matrix, demands, capacity, depot=0, max_routes=None, min_routes=None):
+    """
+    Optimally splits a giant tour into capacity-feasible routes (route-first,
+    cluster-second).
+
+    Customers keep their order in the tour; the procedure picks where routes end
+    so that the total cost is minimal. This is the linear-time Split of Vidal
+    (2016): O(n) with an unlimited fleet and O(n * max_routes) with a limited one,
+    after the prefix sums of demand and distance along the tour. Searches can thus
+    work on a single permutation and decode it cheaply.
+
+    Args:
+        tour (list): Customers in visiting order, without the depot.
+        distance_matrix (numpy.ndarray): Matrix indexed by node ID.
+        demands (dict): Node demands as {node_id: demand}.
+        capacity (int): Vehicle capacity.
+        depot (int): Depot node ID (row of the distance matrix).
+        max_routes (int): Maximum number of routes, unlimited by default.
+        min_routes (int): Minimum number of routes (requires `max_routes`), e.g. equal to
+            `max_routes` for searches whose moves keep the number of routes.
+
+    Returns:
+        tuple: (routes without the depot, total cost).
+
+    Raises:
+        ValueError: If a customer exceeds the capacity or the tour cannot be split
+            into `min_routes` to `max_routes` routes.
+    """
+    tour = list(tour)
+    if not tour:
+        return [], 0.0
+    oversized = [node for node in tour if demands[node] > capacity]
+    if oversized:
+        raise ValueError(f"Demand of customers {oversized} exceeds the vehicle capacity {capacity}.")
+    load, inner, out, back = _prefix_arrays(tour, distance_matrix, demands, depot)
+    n = len(tour)
+    if max_routes is None:
+        cost, pred = _split_layer(None, load, inner, out, back, capacity)
+        preds = None
+    else:
+        # Layer k holds the best costs with exactly k + 1 routes.
+        layers, preds = [], []
+        previous = [0.0] + [float('inf')] * n
+        for k in range(min(max_routes, n)):
+            previous, pred = _split_layer(previous, load, inner, out, back, capacity, first=k)
+            layers.append(previous[n])
+            preds.append(pred)
+        lowest = max(min_routes or 1, 1) - 1
+        if lowest >= len(layers) or min(layers[lowest:]) == float('inf'):
+            raise ValueError(f"The tour cannot be split into {min_routes or 1} to {max_routes} routes "
+                             f"of capacity {capacity}.")
+        used = lowest + int(np.argmin(layers[lowest:]))
+        cost = [layers[used]]
+
+    routes = []
+    end = n
+    if preds is None:
+        while end > 0:
+            routes.append(tour[pred[end]:end])
+            end = pred[end]
+    else:
+        for pred in reversed(preds[:used + 1]):
+            routes.append(tour[pred[end]:end])
+            end = pred[end]
+    routes.reverse()
+    return routes, cost[-1]
@@ -0,0 +1,165 @@
+_MASK = (1 << 64) - 1
+
+
+def _mix64(value):
+    """SplitMix64 finalizer."""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+def edge_key(node1, node2):
+    """
+    Computes the Zobrist key of an undirected edge.
+
+    Keys are derived from the node IDs by hashing instead of being stored in a
+    random table, so they need no per-instance setup. The depot-to-depot loop of an
+    empty route has key 0.
+
+    Args:
+        node1 (int): First node ID (the depot may be -1).
+        node2 (int): Second node ID.
+
+    Returns:
+        int: 64-bit key.
+    """
+    if node1 == node2:
+        return 0
+    if node1 > node2:
+        node1, node2 = node2, node1
+    return _mix64(((node1 + 1) << 32) ^ (node2 + 1))
+
+
+def solution_hash(routes, depot=0):
+    """
+    Computes the Zobrist hash of a solution as the sum of its edge keys modulo 2**64.
+
+    The hash does not depend on the order of the routes or on their direction, and
+    it can be updated from the edges changed by a move (see `update_hash`).
+
+    Args:
+        routes (list of lists): Solution routes.
+        depot (int): Depot node ID.
+
+    Returns:
+        int: 64-bit hash.
+    """
+    value = 0
+    for route in routes:
+        if not route:
+            continue
+        prev_node = depot
+        for node in route:
+            value += edge_key(prev_node, node)
+            prev_node = node
+        value += edge_key(prev_node, depot)
+    return value & _MASK
+
+
+def update_hash(value, removed, added):
+    """
+    Updates a solution hash with the edges removed and added by a move.
+
+    Args:
+        value (int): Current hash.
+        removed (list): Removed (node, node) edges.
+        added (list): Added (node, node) edges.
+
+    Returns:
+        int: Hash of the solution after the move.
+    """
+    for edge in added:
+        value += edge_key(*edge)
+    for edge in removed:
+        value -= edge_key(*edge)
+    return value & _MASK
+
+
+class TabuMemory:
+    """
+    Attribute-based tabu memory with expiry iterations.
+
+    A move is described by the edges it removes and adds (see
+    `RouteState.move_attributes`). Applying a move forbids adding back the edges
+    it removed for `tenure` iterations, which also forbids undoing it. Lookups and
+    updates are O(1) per edge, independently of the tenure.
+    """
+
+    def __init__(self, tenure, track_solutions=False):
+        """
+        Args:
+            tenure (int): Number of iterations an attribute stays tabu.
+            track_solutions (bool): Also remember solution hashes for cycle detection.
+        """
+        self.tenure = tenure
+        self.track_solutions = track_solutions
+        self._expiry = {}
+        self._visited = {}
+
+    def is_tabu(self, attributes, iteration):
+        """
+        Args:
+            attributes (tuple): (removed, added) edges of the candidate move.
+            iteration (int): Current iteration.
+
+        Returns:
+            bool: True if the move adds an edge that is still tabu.
+        """
+        expiry = self._expiry
+        return any(expiry.get(edge, -1) > iteration for edge in attributes[1])
+
+    def is_admissible(self, attributes, iteration, candidate_cost, best_cost):
+        """
+        Applies the aspiration criterion: a tabu move is allowed if it improves the best cost.
+
+        Args:
+            attributes (tuple): (removed, added) edges of the candidate move.
+            iteration (int): Current iteration.
+            candidate_cost (float): Cost of the solution reached by the move.
+            best_cost (float): Best cost found so far.
+
+        Returns:
+            bool: True if the move may be selected.
+        """
+        return candidate_cost < best_cost or not self.is_tabu(attributes, iteration)
+
+    def add(self, attributes, iteration):
+        """
+        Forbids adding back the edges removed by an applied move for `tenure` iterations.
+
+        Args:
+            attributes (tuple): (removed, added) edges of the applied move.
+            iteration (int): Current iteration.
+        """
+        expiry = iteration + self.tenure + 1
+        for edge in attributes[0]:
+            self._expiry[edge] = expiry
+        if len(self._expiry) > 64 * max(self.tenure, 1):
+            self._expiry = {key: value for key, value in self._expiry.items() if value > iteration}
+
+    def is_cycle(self, value, iteration):
+        """
+        Checks whether a solution hash was visited during the last `tenure` iterations.
+
+        Args:
+            value (int): Solution hash.
+            iteration (int): Current iteration.
+
+        Returns:
+            bool: True if the solution would be revisited too early.
+        """
+        return self.track_solutions and self._visited.get(value, -1) > iteration
+
+    def visit(self, value, iteration):
+        """
+        Records a visited solution hash.
+
+        Args:
+            value (int): Solution hash.
+            iteration (int): Current iteration.
+        """
+        if self.track_solutions:
+            self._visited[value] = iteration + self.tenure + 1
+            if len(self._visited) > 64 * max(self.tenure, 1):
+                self._visited = {key: expiry for key, expiry in self._visited.items() if expiry > iteration}
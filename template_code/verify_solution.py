@@ -1,5 +1,10 @@
 import math
 
+try:
+    from .distance_matrix import get_distance_matrix
+except ImportError:
+    from distance_matrix import get_distance_matrix
+
 def euclidean_distance(node1, node2):
     """
     Computes the Euclidean distance between two nodes.
@@ -30,6 +35,7 @@ def verify_solution(instance_data, solution):
     depot = 0
     required_trucks = instance_data.get("trucks", None)
     optimal_value = instance_data.get("optimal_value", None)
+    distance_matrix = get_distance_matrix(instance_data)
 
     visited = set()  # To track visited customers
     total_cost = 0
@@ -61,11 +67,11 @@ def verify_solution(instance_data, solution):
                     f"Invalid solution: Capacity exceeded on route {route}. Current load is {load}, capacity is {capacity}."
                 )
 
-            route_cost += euclidean_distance(nodes[prev_node], nodes[node])
+            route_cost += distance_matrix[prev_node, node]
             prev_node = node
 
         # Return to the depot
-        route_cost += euclidean_distance(nodes[prev_node], nodes[depot])
+        route_cost += distance_matrix[prev_node, depot]
         total_cost += route_cost
 
     # Check if all customers were visited exactly once
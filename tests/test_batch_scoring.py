@@ -0,0 +1,55 @@
+import random
+
+import numpy as np
+import pytest
+
+from template_code.batch_scoring import best_candidate, demand_vector, pack_tours, score_tours
+from template_code.distance_matrix import compute_distance_matrix
+from template_code.solvers import _team2
+
+calculate_total_cost = _team2("functions.py").calculate_total_cost
+
+
+def _random_solutions(rng, customers, count):
+    solutions = []
+    for _ in range(count):
+        order = list(customers)
+        rng.shuffle(order)
+        cuts = sorted(rng.sample(range(1, len(order)), rng.randint(0, min(5, len(order) - 1))))
+        solutions.append([order[start:stop] for start, stop in zip([0] + cuts, cuts + [len(order)])])
+    return solutions
+
+
+@pytest.mark.parametrize("depot", [0, -1])
+@pytest.mark.parametrize("seed", range(20))
+def test_scores_match_calculate_total_cost(seed, depot):
+    rng = random.Random(seed)
+    size = rng.randint(2, 30)
+    coords = np.array([[rng.uniform(0, 100), rng.uniform(0, 100)] for _ in range(size + 1)])
+    distance_matrix = compute_distance_matrix(coords)
+    # Customers 1..size, the depot is node 0 or the last row (node -1).
+    depot_row = 0 if depot == 0 else size
+    customers = [node for node in range(size + 1) if node != depot_row]
+    demands = {node: rng.randint(1, 10) for node in customers}
+    node_index_map = {node: node for node in customers}
+    node_index_map[-1] = depot_row
+
+    solutions = _random_solutions(rng, customers, 8)
+    costs, loads = score_tours(pack_tours(solutions, depot_row), distance_matrix,
+                               demand_vector(demands, len(distance_matrix)), depot_row)
+    for solution, cost, solution_loads in zip(solutions, costs, loads):
+        assert cost == pytest.approx(calculate_total_cost(solution, distance_matrix, node_index_map))
+        expected = [sum(demands[node] for node in route) for route in solution]
+        assert solution_loads.tolist() == expected + [0] * (len(solution_loads) - len(expected))
+
+
+def test_best_candidate_skips_overloaded_solutions():
+    coords = np.array([[0, 0], [1, 0], [2, 0], [0, 5]], dtype=float)
+    distance_matrix = compute_distance_matrix(coords)
+    demand_array = demand_vector({1: 3, 2: 3, 3: 3}, 4)
+    solutions = [[[1, 2, 3]], [[1, 2], [3]], [[1], [2], [3]]]
+    index, cost = best_candidate(solutions, distance_matrix, demand_array, capacity=6)
+    assert index == 1
+    assert cost == pytest.approx(4 + 10)
+    assert best_candidate(solutions, distance_matrix, demand_array, capacity=2) == (None, float('inf'))
+    assert best_candidate([], distance_matrix, demand_array, capacity=6) == (None, float('inf'))
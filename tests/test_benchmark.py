@@ -0,0 +1,40 @@
+import os
+
+import pytest
+
+from template_code import benchmark
+
+
+def _records(solver, instances):
+    return [{'solver': solver, 'instance': instance, 'seed': seed, 'cost': 100.0 + seed, 'valid': True,
+             'runtime': 0.1, 'evaluations': None, 'evaluations_per_second': None, 'gap': 1.0, 'peak_memory': None}
+            for instance in instances for seed in range(2)]
+
+
+def test_latest_results_without_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(benchmark, "BENCHMARKS_DIR", str(tmp_path / "benchmarks"))
+    with pytest.raises(FileNotFoundError):
+        benchmark.latest_results()
+    os.makedirs(benchmark.BENCHMARKS_DIR)
+    with pytest.raises(FileNotFoundError):
+        benchmark.latest_results()
+
+
+def test_latest_results_reads_the_most_recent_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(benchmark, "BENCHMARKS_DIR", str(tmp_path))
+    old = str(tmp_path / "old.json")
+    benchmark.save_results(_records("greedy", ["A"]), old)
+    os.utime(old, (0, 0))
+    benchmark.save_results(_records("tabu", ["A"]), str(tmp_path / "new.json"))
+    assert list(benchmark.latest_results()['summary']) == ["tabu"]
+    assert list(benchmark.latest_results(old)['summary']) == ["greedy"]
+
+
+def test_solver_summaries_selects_the_requested_solvers():
+    results = {'summary': benchmark.summarize(_records("tabu", ["A", "B"]) + _records("greedy", ["B", "C"])
+                                              + _records("annealing", ["A", "B", "C"]))}
+    instances, (tabu, greedy) = benchmark.solver_summaries(results, ["tabu", "greedy"])
+    assert instances == ["B"]
+    assert tabu["B"]['runs'] == greedy["B"]['runs'] == 2
+    with pytest.raises(ValueError):
+        benchmark.solver_summaries(results, ["tabu", "local"])
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from template_code.budget import SearchBudget, iteration_range
+from template_code.read_instances import read_instance
+from template_code.solvers import SOLVERS, _team2
+
+INSTANCE = "data/B/B-n34-k5.vrp"
+
+
+def test_budget_stops_on_evaluations():
+    budget = SearchBudget(max_evaluations=100)
+    spent = 0
+    while not budget.spend(30):
+        spent += 1
+    assert spent == 3
+    assert budget.evaluations == 120
+    assert budget.iterations == 4
+    assert budget.stop_reason == "evaluations"
+    assert budget.exhausted
+
+
+def test_budget_stops_on_time():
+    budget = SearchBudget(time_limit=0.05, check_interval=4)
+    start = time.perf_counter()
+    while not budget.spend():
+        pass
+    assert budget.stop_reason == "time"
+    assert 0.05 <= time.perf_counter() - start < 1
+    # The clock is only read every check_interval calls.
+    assert budget.iterations % 4 == 0
+    assert budget.remaining == 0
+
+
+def test_budget_without_limits():
+    budget = SearchBudget()
+    assert not any(budget.spend(1000) for _ in range(1000))
+    assert budget.remaining is None
+    with pytest.raises(ValueError):
+        iteration_range(None, budget)
+    with pytest.raises(ValueError):
+        iteration_range(None)
+    assert list(iteration_range(3, budget)) == [0, 1, 2]
+
+
+def test_budget_keeps_the_best_solution():
+    improvements = []
+    budget = SearchBudget(max_evaluations=10, callback=lambda solution, cost, stats: improvements.append(cost))
+    budget.improve([[1, 2]], 12.0)
+    budget.improve([[2, 1]], 10.0)
+    assert (budget.best_solution, budget.best_cost) == ([[2, 1]], 10.0)
+    assert improvements == [12.0, 10.0]
+    budget.start()
+    assert (budget.evaluations, budget.iterations, budget.stop_reason) == (0, 0, None)
+
+
+def test_absorb_adds_worker_counters():
+    budget = SearchBudget(max_evaluations=1000)
+    budget.spend(10)
+    budget.absorb({'iterations': 3, 'evaluations': 90, 'stop_reason': "time"})
+    assert (budget.iterations, budget.evaluations, budget.stop_reason) == (4, 100, "time")
+
+
+@pytest.mark.parametrize("name", ["tabu", "local", "annealing"])
+def test_solvers_stop_on_the_evaluation_limit(name):
+    budget = SearchBudget(max_evaluations=50)
+    solution, cost = SOLVERS[name](read_instance(INSTANCE), None, budget=budget, rng=0)
+    assert solution and cost > 0
+    assert budget.stop_reason == "evaluations"
+    assert 50 <= budget.evaluations
+    assert budget.best_cost == pytest.approx(cost)
+
+
+def _search_without_iteration_limit(name, instance_data, budget):
+    nodes = instance_data["nodes"]
+    demands, capacity = instance_data["demands"], instance_data["capacity"]
+    if name == "tabu":
+        return _team2("rechercheTabouImpl.py").tabu_search(dict(nodes), demands, capacity, None, 10, nodes[1],
+                                                           budget=budget, rng=0)
+    if name == "local":
+        return _team2("rechercheLocaleImpl.py").local_search(dict(nodes), demands, capacity, None, nodes[1],
+                                                             budget=budget, rng=0)
+    # Annealing: iterations per temperature far beyond what the time limit allows.
+    return _team2("recuitSimuleImpl.py").simulated_annealing(instance_data, 1000, 5, 0.99, 10 ** 9,
+                                                             budget=budget, rng=0)
+
+
+@pytest.mark.parametrize("name", ["tabu", "local", "annealing"])
+def test_solvers_stop_on_the_time_limit(name):
+    budget = SearchBudget(time_limit=0.2)
+    start = time.perf_counter()
+    solution, cost = _search_without_iteration_limit(name, read_instance(INSTANCE), budget)
+    elapsed = time.perf_counter() - start
+    assert solution and budget.best_cost == pytest.approx(cost)
+    assert elapsed < 2
+    # Local search and annealing may end first on their own criterion (local optimum, final temperature).
+    if name == "tabu" or elapsed >= 0.2:
+        assert budget.stop_reason == "time"
+    else:
+        assert budget.stop_reason is None
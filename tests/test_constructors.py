@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from template_code.constructors import clarke_wright_savings, cluster_routes, sweep_routes
+from template_code.distance_matrix import compute_distance_matrix
+
+
+def _clustered_instance(seed):
+    """Depot at node 0 and up to 60 customers drawn around 1 to 3 Gaussian centers."""
+    rng = np.random.default_rng(seed)
+    num_customers = int(rng.integers(1, 61))
+    centers = rng.uniform(0, 100, size=(int(rng.integers(1, 4)), 2))
+    points = centers[rng.integers(0, len(centers), num_customers)] + rng.normal(0, 5, size=(num_customers, 2))
+    coords = np.vstack([rng.uniform(0, 100, size=(1, 2)), points])
+    demands = {node: int(rng.integers(1, 30)) for node in range(1, num_customers + 1)}
+    return coords, demands, int(rng.integers(40, 101))
+
+
+def _check_routes(routes, demands, capacity):
+    assert sorted(node for route in routes for node in route) == sorted(demands)
+    assert all(route and sum(demands[node] for node in route) <= capacity for route in routes)
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_constructors_cover_customers_within_capacity(seed):
+    coords, demands, capacity = _clustered_instance(seed)
+    _check_routes(clarke_wright_savings(compute_distance_matrix(coords), demands, capacity), demands, capacity)
+    _check_routes(sweep_routes(coords, demands, capacity), demands, capacity)
+    _check_routes(cluster_routes(coords, demands, capacity), demands, capacity)
+
+
+@pytest.mark.parametrize("seed", [1476, 1604])
+def test_cluster_routes_with_empty_last_centroid(seed):
+    # Instances where the highest-indexed centroid ends up without customers.
+    coords, demands, capacity = _clustered_instance(seed)
+    _check_routes(cluster_routes(coords, demands, capacity), demands, capacity)
+
+
+@pytest.mark.parametrize("seed", [400, 1670])
+def test_cluster_routes_joins_opened_clusters(seed):
+    # On these instances several customers overflow the sweep centroids during the
+    # first Lloyd iteration: they share the cluster opened by the first of them.
+    coords, demands, capacity = _clustered_instance(seed)
+    routes = cluster_routes(coords, demands, capacity, iterations=1)
+    _check_routes(routes, demands, capacity)
+    assert len(routes) == len(sweep_routes(coords, demands, capacity)) + 1
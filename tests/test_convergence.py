@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from template_code.convergence import TRACE_DTYPE, ConvergenceTrace, load_trace
+from template_code.read_instances import read_instance
+from template_code.solvers import _team2
+
+INSTANCE = "data/B/B-n34-k5.vrp"
+
+
+def _record(trace, calls):
+    for iteration in range(calls):
+        trace.record(iteration, 100.0 - iteration, 90.0 - iteration, parameter=iteration / 2,
+                     accepted=iteration % 2 == 0)
+
+
+@pytest.mark.parametrize("calls, capacity, sample_every", [(5, 10, 1), (25, 10, 1), (25, 10, 3), (0, 4, 2)])
+def test_ring_buffer_keeps_the_latest_samples(calls, capacity, sample_every):
+    trace = ConvergenceTrace(capacity=capacity, sample_every=sample_every)
+    _record(trace, calls)
+    expected = list(range(0, calls, sample_every))[-capacity:]
+    data = trace.to_array()
+    assert data.dtype == TRACE_DTYPE
+    assert len(trace) == len(expected)
+    assert data["iteration"].tolist() == expected
+    assert data["current_cost"].tolist() == [100.0 - iteration for iteration in expected]
+    assert data["accepted"].tolist() == [iteration % 2 == 0 for iteration in expected]
+    assert np.all(np.diff(data["elapsed"]) >= 0)
+
+
+def test_start_empties_the_trace():
+    trace = ConvergenceTrace(capacity=4)
+    _record(trace, 6)
+    trace.start()
+    assert len(trace) == 0
+    _record(trace, 2)
+    assert trace.to_array()["iteration"].tolist() == [0, 1]
+
+
+def test_csv_round_trip(tmp_path):
+    trace = ConvergenceTrace(capacity=8, sample_every=2)
+    _record(trace, 30)
+    trace.record(30, 70.0, 60.0)  # Default parameter: NaN
+    path = str(tmp_path / "trace.csv")
+    trace.to_csv(path)
+    loaded = load_trace(path)
+    expected = trace.to_array()
+    assert loaded.dtype == TRACE_DTYPE
+    for name in TRACE_DTYPE.names:
+        np.testing.assert_array_equal(loaded[name], expected[name])
+
+
+def test_tabu_search_records_every_iteration():
+    instance_data = read_instance(INSTANCE)
+    nodes = instance_data["nodes"]
+    trace = ConvergenceTrace()
+    _, best_cost = _team2("rechercheTabouImpl.py").tabu_search(
+        dict(nodes), instance_data["demands"], instance_data["capacity"], 50, 10, nodes[1], trace=trace, rng=0)
+    data = trace.to_array()
+    assert data["iteration"].tolist() == list(range(50))
+    assert np.all(np.diff(data["best_cost"]) <= 0)
+    assert np.all(data["best_cost"] <= data["current_cost"] + 1e-9)
+    assert data["best_cost"][-1] == pytest.approx(best_cost)
+    assert np.all(data["parameter"] == 10)
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from template_code.distance_matrix import DTYPES, compute_distance_matrix, make_distance_provider, node_coordinates
+from template_code.distance_providers import DistanceProvider, LazyDistances, OnTheFlyDistances, SparseDistances
+from template_code.read_instances import read_instance
+
+INSTANCE = "data/B/B-n34-k5.vrp"
+
+
+def _providers(coords, dtype):
+    return [OnTheFlyDistances(coords, dtype), LazyDistances(coords, dtype, cache_rows=5),
+            SparseDistances(coords, k=4, depots=(0, -1), dtype=dtype)]
+
+
+def _assert_equal(actual, expected):
+    # Sparse edges are computed with math.hypot, which may differ from numpy in the last bit.
+    np.testing.assert_allclose(np.asarray(actual, dtype=np.float64), np.asarray(expected, dtype=np.float64),
+                               rtol=1e-12)
+
+
+@pytest.mark.parametrize("dtype", DTYPES)
+def test_providers_agree_with_the_dense_matrix(dtype):
+    coords = np.random.default_rng(len(dtype)).uniform(0, 1000, size=(40, 2))
+    dense = compute_distance_matrix(coords, dtype)
+    rng = np.random.default_rng(0)
+    rows, cols = rng.integers(0, 40, 50), rng.integers(0, 40, 50)
+    for provider in _providers(coords, dtype):
+        assert provider.shape == dense.shape and len(provider) == 40
+        for a, b in zip(rows.tolist(), cols.tolist()):
+            _assert_equal(provider[a, b], dense[a, b])
+        _assert_equal(provider[-1, 3], dense[-1, 3])
+        _assert_equal(provider[np.int64(7), np.int64(2)], dense[7, 2])
+        _assert_equal(provider[rows, cols], dense[rows, cols])
+        _assert_equal(provider[np.ix_(rows[:5], cols[:7])], dense[np.ix_(rows[:5], cols[:7])])
+        _assert_equal(provider[11], dense[11])
+        _assert_equal(provider[:, 4], dense[:, 4])
+        _assert_equal(provider[rows[:3], :], dense[rows[:3], :])
+        _assert_equal(np.asarray(provider), dense)
+        assert np.asarray(provider).dtype == dense.dtype
+
+
+def test_providers_of_an_instance():
+    instance_data = read_instance(INSTANCE)
+    dense = compute_distance_matrix(node_coordinates(instance_data["nodes"]))
+    valid = ~np.isnan(dense)
+    for provider in ("on_the_fly", "lazy", "sparse"):
+        matrix = np.asarray(make_distance_provider(instance_data, provider))
+        np.testing.assert_array_equal(np.isnan(matrix), ~valid)
+        _assert_equal(matrix[valid], dense[valid])
+
+
+def test_distance_provider_is_abstract():
+    with pytest.raises(TypeError):
+        DistanceProvider(np.zeros((2, 2)))
+
+
+def test_lazy_rows_are_cached_arrays():
+    coords = np.random.default_rng(1).uniform(0, 100, size=(30, 2))
+    provider = LazyDistances(coords, "float32", cache_rows=3)
+    row = provider.row(4)
+    assert isinstance(row, np.ndarray) and row.dtype == np.float32 and not row.flags.writeable
+    assert provider.row(4) is row and (provider.hits, provider.misses) == (1, 1)
+    # A pair is served from the cached row of either endpoint.
+    provider.distance(9, 4)
+    assert (provider.hits, provider.misses) == (2, 1)
+    for node in (5, 6, 7):
+        provider.row(node)
+    assert list(provider._rows) == [5, 6, 7]
+    assert provider.cached_bytes == 3 * 30 * 4
+
+
+def test_sparse_stores_the_k_nearest_neighbors():
+    coords = np.random.default_rng(2).uniform(0, 100, size=(30, 2))
+    dense = compute_distance_matrix(coords)
+    provider = SparseDistances(coords, k=3, depots=(0,), strict=True)
+    for node in range(1, 30):
+        nearest = [other for other in np.argsort(dense[node]).tolist() if other != node][:3]
+        neighbors = provider.neighbors(node)
+        assert set(nearest) <= set(neighbors)
+        assert [dense[node, other] for other in neighbors] == sorted(dense[node, other] for other in neighbors)
+        _assert_equal(provider[node, 0], dense[node, 0])
+    far = max(range(1, 30), key=lambda other: dense[1, other])
+    assert far not in provider.neighbors(1)
+    with pytest.raises(KeyError):
+        provider.distance(1, far)
+    relaxed = SparseDistances(coords, k=3, depots=(0,))
+    _assert_equal(relaxed[1, far], dense[1, far])
+    assert relaxed.misses == 1
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from template_code import distance_matrix
+from template_code.distance_providers import LazyDistances, OnTheFlyDistances
+from template_code.read_instances import read_instance
+
+INSTANCE = "data/B/B-n34-k5.vrp"
+
+
+@pytest.fixture
+def storage():
+    """Restores the default storage and an empty matrix cache after the test."""
+    distance_matrix.clear_cache()
+    yield
+    distance_matrix.configure_storage()
+    distance_matrix.clear_cache()
+
+
+@pytest.mark.parametrize("block_bytes", [64 * 2 ** 20, 1])
+def test_memmap_matches_dense_matrix(tmp_path, block_bytes):
+    instance_data = read_instance(INSTANCE)
+    dense = distance_matrix.compute_distance_matrix(distance_matrix.node_coordinates(instance_data["nodes"]))
+    valid = ~np.isnan(dense)
+
+    matrix = distance_matrix.memmap_distance_matrix(instance_data, str(tmp_path), "float32", block_bytes)
+    assert isinstance(matrix, np.memmap) and not matrix.flags.writeable
+    assert matrix.shape == dense.shape and matrix.dtype == np.float32
+    np.testing.assert_allclose(matrix[valid], dense[valid], rtol=1e-6)
+
+    rounded = distance_matrix.memmap_distance_matrix(instance_data, str(tmp_path), "uint16", block_bytes)
+    assert rounded.dtype == np.uint16
+    np.testing.assert_array_equal(rounded[valid], np.floor(dense[valid] + 0.5))
+    assert not rounded[~valid].any()
+    assert sorted(path.suffix for path in tmp_path.iterdir()) == [".npy", ".npy"]
+
+
+def test_memmap_reuses_the_file(tmp_path, monkeypatch):
+    instance_data = read_instance(INSTANCE)
+    first = distance_matrix.memmap_distance_matrix(instance_data, str(tmp_path))
+
+    def fail(*args):
+        raise AssertionError("The memory-mapped matrix was rebuilt.")
+
+    monkeypatch.setattr(distance_matrix, "_compute_rows", fail)
+    second = distance_matrix.memmap_distance_matrix(instance_data, str(tmp_path))
+    assert second.filename == first.filename
+    np.testing.assert_array_equal(second, first)
+
+
+def test_memmap_rejects_bad_dtypes(tmp_path):
+    with pytest.raises(ValueError):
+        distance_matrix.memmap_distance_matrix({"nodes": {1: (0, 0), 2: (3, 4)}}, str(tmp_path), "float64")
+    with pytest.raises(ValueError):
+        distance_matrix.memmap_distance_matrix({"nodes": {1: (0, 0), 2: (70000, 0)}}, str(tmp_path), "uint16")
+    # Failed builds leave no temporary file behind.
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_storage_above_the_memory_limit(tmp_path, storage):
+    instance_data = read_instance(INSTANCE)
+    dense = distance_matrix.compute_distance_matrix(distance_matrix.node_coordinates(instance_data["nodes"]))
+    size = dense.nbytes
+
+    distance_matrix.configure_storage(memory_limit=size)
+    assert isinstance(distance_matrix.get_distance_matrix(instance_data), np.ndarray)
+
+    distance_matrix.clear_cache()
+    distance_matrix.configure_storage(memory_limit=size - 1, memmap_dir=str(tmp_path))
+    assert isinstance(distance_matrix.get_distance_matrix(instance_data), np.memmap)
+
+    distance_matrix.clear_cache()
+    distance_matrix.configure_storage(memory_limit=0)
+    assert isinstance(distance_matrix.get_distance_matrix(instance_data), OnTheFlyDistances)
+
+    distance_matrix.clear_cache()
+    distance_matrix.configure_storage(memory_limit=0, provider="lazy", provider_options={"cache_rows": 4})
+    matrix = distance_matrix.get_distance_matrix(instance_data)
+    assert isinstance(matrix, LazyDistances) and matrix.cache_rows == 4
+
+    with pytest.raises(ValueError):
+        distance_matrix.configure_storage(memmap_dtype="float64")
+    with pytest.raises(ValueError):
+        distance_matrix.configure_storage(provider="dense")
@@ -0,0 +1,56 @@
+import random
+
+import numpy as np
+import pytest
+
+from template_code.distance_matrix import compute_distance_matrix
+from template_code.intra_route import optimize_route, optimize_routes
+
+
+def _route_cost(route, distance_matrix, depot=0):
+    nodes = [depot] + route + [depot]
+    return sum(distance_matrix[a, b] for a, b in zip(nodes, nodes[1:]))
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_optimize_route_never_worse(seed):
+    rng = random.Random(seed)
+    size = rng.randint(0, 40)
+    coords = np.array([[rng.uniform(0, 100), rng.uniform(0, 100)] for _ in range(size + 1)])
+    distance_matrix = compute_distance_matrix(coords)
+    route = list(range(1, size + 1))
+    rng.shuffle(route)
+    k = rng.choice([3, 10, 40])
+
+    improved, cost = optimize_route(route, distance_matrix, k=k)
+    assert sorted(improved) == sorted(route)
+    assert cost == pytest.approx(_route_cost(improved, distance_matrix))
+    assert cost <= _route_cost(route, distance_matrix) + 1e-9
+
+
+def test_optimize_route_keeps_an_optimal_route():
+    # Customers on a circle around the depot, visited in angular order.
+    angles = np.linspace(0, 2 * np.pi, 13)[:-1]
+    coords = np.vstack([[[0, 10]], np.column_stack([10 * np.cos(angles), 10 + 10 * np.sin(angles)])])
+    distance_matrix = compute_distance_matrix(coords)
+    route = list(range(1, 13))
+    _, cost = optimize_route(route, distance_matrix)
+    assert cost == pytest.approx(_route_cost(route, distance_matrix))
+
+
+def test_optimize_routes_with_another_depot():
+    rng = np.random.default_rng(0)
+    coords = rng.uniform(0, 100, size=(31, 2))
+    distance_matrix = compute_distance_matrix(coords)
+    routes = [list(range(1, 11)), list(range(11, 30)), [30]]
+    improved, total_cost = optimize_routes(routes, distance_matrix, depot=0)
+    assert [sorted(route) for route in improved] == [sorted(route) for route in routes]
+    assert total_cost == pytest.approx(sum(_route_cost(route, distance_matrix) for route in improved))
+    assert total_cost <= sum(_route_cost(route, distance_matrix) for route in routes)
+
+    # Depot stored in the last row (team2 convention).
+    moved = np.roll(np.roll(distance_matrix, -1, axis=0), -1, axis=1)
+    shifted = [[node - 1 for node in route] for route in routes]
+    improved, shifted_cost = optimize_routes(shifted, moved, depot=-1)
+    assert shifted_cost == pytest.approx(sum(_route_cost(route, moved, -1) for route in improved))
+    assert shifted_cost <= sum(_route_cost(route, moved, -1) for route in shifted)
@@ -0,0 +1,75 @@
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from template_code.distance_matrix import compute_distance_matrix
+from template_code.moves import MOVE_KINDS, RouteState
+from template_code.spatial_index import nearest_neighbor_lists
+
+
+def _random_instance(seed, num_customers=25, num_routes=5):
+    rng = np.random.default_rng(seed)
+    coords = rng.uniform(0, 100, size=(num_customers + 1, 2))
+    demands = {node: int(rng.integers(1, 10)) for node in range(num_customers + 1)}
+    demands[0] = 0
+    customers = list(range(1, num_customers + 1))
+    random.Random(seed).shuffle(customers)
+    cuts = sorted(random.Random(seed + 1).sample(range(1, num_customers), num_routes - 1))
+    routes = [customers[start:stop] for start, stop in zip([0] + cuts, cuts + [num_customers])]
+    return compute_distance_matrix(coords), demands, routes
+
+
+def _edges(routes, depot=0):
+    edges = Counter()
+    for route in routes:
+        nodes = [depot] + route + [depot]
+        edges.update((min(a, b), max(a, b)) for a, b in zip(nodes, nodes[1:]) if a != b)
+    return edges
+
+
+def _check_cached_arrays(state):
+    for index, route in enumerate(state.routes):
+        expected = RouteState([route], state.distance_matrix, state.demands, state.capacity, state.depot)
+        assert route
+        assert state.loads[index] == expected.loads[0]
+        assert state.costs[index] == pytest.approx(expected.costs[0])
+        assert state.prefix_loads[index] == expected.prefix_loads[0]
+        assert state.prefix_distances[index] == pytest.approx(expected.prefix_distances[0])
+        for pos, node in enumerate(route):
+            assert state.where[node] == (index, pos)
+    assert state.overloaded == sum(load > state.capacity for load in state.loads)
+
+
+@pytest.mark.parametrize("granular", [False, True])
+@pytest.mark.parametrize("kind", MOVE_KINDS)
+def test_delta_matches_recomputed_cost(kind, granular):
+    distance_matrix, demands, routes = _random_instance(len(kind) + granular)
+    neighbors = nearest_neighbor_lists(distance_matrix, range(1, len(demands)), 5) if granular else None
+    state = RouteState(routes, distance_matrix, demands, capacity=40, neighbors=neighbors)
+    rng = random.Random(0)
+    applied = 0
+    for _ in range(2000):
+        move = state.random_move(kinds=(kind,), rng=rng)
+        if move is None:
+            continue
+        assert move.kind == kind
+        assert state.is_valid(move)
+        candidate = state.candidate_routes(move)
+        delta = state.delta(move)
+        assert state.total_cost + delta == pytest.approx(sum(state.route_cost(route) for route in candidate))
+        removed, added = state.move_attributes(move)
+        assert not Counter(removed) - _edges(state.routes)
+        assert _edges(state.routes) - Counter(removed) + Counter(added) == _edges(candidate)
+        if len(candidate) < len(state.routes) and len(state.routes) <= 3:
+            continue  # Keep enough routes for inter-route moves.
+        keeps_feasible = state.keeps_feasible(move)
+        state.apply(move)
+        applied += 1
+        assert state.routes == candidate
+        if keeps_feasible:
+            assert state.overloaded == 0
+        _check_cached_arrays(state)
+    assert applied > 100
+    assert sorted(node for route in state.routes for node in route) == list(range(1, len(demands)))
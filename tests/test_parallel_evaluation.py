@@ -0,0 +1,60 @@
+from functools import partial
+
+import pytest
+
+from template_code import distance_matrix
+from template_code.parallel_evaluation import Job, compute_metrics, load_instances, run_jobs
+from template_code.solvers import SOLVERS
+
+INSTANCE = "data/B/B-n34-k5.vrp"
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("The distance matrix was rebuilt in the worker.")
+
+
+def _solve_without_rebuild(name, instance_data, parameter, rng=None):
+    """Runs a solver with `compute_distance_matrix` disabled in the current process."""
+    compute = distance_matrix.compute_distance_matrix
+    distance_matrix.compute_distance_matrix = _fail
+    try:
+        return SOLVERS[name](instance_data, parameter, rng=rng)
+    finally:
+        distance_matrix.compute_distance_matrix = compute
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("name", ["tabu", "local", "annealing", "greedy", "savings"])
+def test_workers_reuse_the_instance_matrix(name, workers):
+    instances = load_instances([INSTANCE])
+    distance_matrix.clear_cache()
+    jobs = [Job(INSTANCE, partial(_solve_without_rebuild, name), None, seed) for seed in range(2)]
+    records = run_jobs(jobs, instances, workers=workers)
+    assert [record.get('error') for record in records] == [None, None]
+    assert all(record['cost'] > 0 and 'verified_cost' in record for record in records)
+
+
+def _record(cost, valid, verified_cost=None, proximity=0.0):
+    return {'instance': INSTANCE, 'parameter': 5, 'cost': cost, 'valid': valid,
+            'verified_cost': cost if verified_cost is None else verified_cost, 'exec_time': 1.0,
+            'proximity': proximity}
+
+
+def test_metrics_over_completed_runs():
+    records = [_record(120, False), _record(100, True), {'instance': INSTANCE, 'parameter': 5, 'error': "boom"}]
+    metrics = compute_metrics(records, total_simulations=3)
+    assert metrics['average_cost'] == 110
+    assert (metrics['min_cost'], metrics['max_cost']) == (100, 120)
+    assert metrics['valid_percentage'] == pytest.approx(100 / 3)
+
+
+def test_metrics_over_valid_runs_only():
+    records = [_record(120, False, proximity=20.0), _record(100, True, 101, proximity=0.0), _record(110, True, 111)]
+    metrics = compute_metrics(records, total_simulations=3, valid_only=True)
+    assert metrics['average_cost'] == 106
+    assert (metrics['min_cost'], metrics['max_cost']) == (101, 111)
+    assert metrics['convergence_rate'] == 0
+    assert metrics['valid_percentage'] == pytest.approx(200 / 3)
+    # Execution times and proximities still cover every completed run.
+    assert metrics['average_proximity'] == pytest.approx(20 / 3)
+    assert compute_metrics([_record(120, False)], total_simulations=1, valid_only=True) is None
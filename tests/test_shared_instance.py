@@ -0,0 +1,42 @@
+import pytest
+
+from template_code import distance_matrix, solvers
+from template_code.read_instances import read_instance
+from template_code.shared_instance import SharedInstance, neighbor_array, neighbor_lists
+from template_code.spatial_index import nearest_neighbor_lists
+
+INSTANCE = "data/B/B-n34-k5.vrp"
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("Instance data rebuilt in a worker process.")
+
+
+def test_shared_neighbor_lists_match_spatial_index():
+    instance_data = read_instance(INSTANCE)
+    matrix = distance_matrix.get_distance_matrix(instance_data)
+    customers = list(range(2, len(instance_data["demands"]) + 1))
+    with SharedInstance(instance_data, neighbor_k=6, customers=customers) as shared:
+        attached = shared.attach()
+        assert neighbor_lists(attached["neighbor_array"], customers) == nearest_neighbor_lists(matrix, customers, 6)
+    assert neighbor_array(matrix, customers, 6).shape == (len(matrix), 6)
+
+
+@pytest.mark.parametrize("name", ["islands", "tempering"])
+def test_parallel_solvers_use_shared_data(name, monkeypatch):
+    instance_data = read_instance(INSTANCE)
+    distance_matrix.get_distance_matrix(instance_data)
+    module = solvers._team2("rechercheTabouImpl.py" if name == "islands" else "recuitParalleleImpl.py")
+    # Worker processes are forked with the matrix construction and neighbor search disabled.
+    monkeypatch.setattr(distance_matrix, "compute_distance_matrix", _fail)
+    monkeypatch.setattr(module, "nearest_neighbor_lists", _fail, raising=False)
+
+    solve = getattr(module, "island_tabu_search" if name == "islands" else "parallel_tempering")
+    if name == "islands":
+        nodes = instance_data["nodes"]
+        solution, cost = solve(dict(nodes), instance_data["demands"], instance_data["capacity"], 50, nodes[1],
+                               num_islands=2, granular_k=6, rng=0,
+                               distance_matrix=distance_matrix.get_distance_matrix(instance_data), depot_node=1)
+    else:
+        solution, cost = solve(instance_data, 1000, 5, num_chains=2, max_exchanges=5, granular_k=6, rng=0)
+    assert solution and cost > 0
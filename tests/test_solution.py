@@ -0,0 +1,18 @@
+from template_code.solution import Solution
+
+
+def test_clone_copies_on_write_once():
+    original = Solution.from_routes([[1, 2], [3]])
+    clone = original.clone()
+    assert clone.tour is original.tour
+
+    clone.set_route(0, [2, 1])
+    assert original.to_routes() == [[1, 2], [3]]
+    assert clone.to_routes() == [[2, 1], [3]]
+
+    # The other copy is now the only holder of the buffers: writes no longer copy them.
+    tour = original.tour
+    original.set_route(1, [3, 4])
+    assert original.tour is tour
+    assert original.to_routes() == [[1, 2], [3, 4]]
+    assert clone.to_routes() == [[2, 1], [3]]
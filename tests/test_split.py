@@ -0,0 +1,66 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from template_code.distance_matrix import compute_distance_matrix
+from template_code.split import split_tour
+
+
+def _routes_cost(routes, distance_matrix):
+    cost = 0.0
+    for route in routes:
+        nodes = [0] + route + [0]
+        cost += sum(distance_matrix[a, b] for a, b in zip(nodes, nodes[1:]))
+    return cost
+
+
+def _brute_force(tour, distance_matrix, demands, capacity, max_routes=None, min_routes=None):
+    """Best split over every set of cut positions, or None if no split fits."""
+    best = None
+    for size in range(len(tour)):
+        for cuts in itertools.combinations(range(1, len(tour)), size):
+            bounds = [0] + list(cuts) + [len(tour)]
+            routes = [tour[start:stop] for start, stop in zip(bounds, bounds[1:])]
+            if max_routes is not None and not (min_routes or 1) <= len(routes) <= max_routes:
+                continue
+            if any(sum(demands[node] for node in route) > capacity for route in routes):
+                continue
+            cost = _routes_cost(routes, distance_matrix)
+            if best is None or cost < best:
+                best = cost
+    return best
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_split_matches_brute_force(seed):
+    rng = random.Random(seed)
+    size = rng.randint(1, 8)
+    coords = np.array([[rng.uniform(0, 100), rng.uniform(0, 100)] for _ in range(size + 1)])
+    distance_matrix = compute_distance_matrix(coords)
+    demands = {node: rng.randint(1, 10) for node in range(1, size + 1)}
+    capacity = rng.randint(10, 30)
+    tour = list(range(1, size + 1))
+    rng.shuffle(tour)
+    max_routes = rng.choice([None, rng.randint(1, size)])
+    min_routes = rng.choice([None, rng.randint(1, max_routes)]) if max_routes is not None else None
+
+    expected = _brute_force(tour, distance_matrix, demands, capacity, max_routes, min_routes)
+    if expected is None:
+        with pytest.raises(ValueError):
+            split_tour(tour, distance_matrix, demands, capacity, max_routes=max_routes, min_routes=min_routes)
+        return
+    routes, cost = split_tour(tour, distance_matrix, demands, capacity, max_routes=max_routes, min_routes=min_routes)
+    assert cost == pytest.approx(expected)
+    assert cost == pytest.approx(_routes_cost(routes, distance_matrix))
+    assert [node for route in routes for node in route] == tour
+    assert all(route and sum(demands[node] for node in route) <= capacity for route in routes)
+    if max_routes is not None:
+        assert (min_routes or 1) <= len(routes) <= max_routes
+
+
+def test_split_rejects_oversized_customer():
+    distance_matrix = compute_distance_matrix(np.zeros((3, 2)))
+    with pytest.raises(ValueError):
+        split_tour([1, 2], distance_matrix, {1: 5, 2: 50}, capacity=10)
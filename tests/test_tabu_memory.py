@@ -0,0 +1,24 @@
+import numpy as np
+
+from template_code.distance_matrix import compute_distance_matrix
+from template_code.moves import Move, RouteState
+from template_code.tabu_memory import TabuMemory
+
+
+def test_tabu_survives_dropped_routes():
+    coords = np.array([[0, 0], [1, 0], [2, 0], [3, 0], [0, 5], [0, 6]], dtype=float)
+    demands = {node: 1 for node in range(6)}
+    state = RouteState([[1], [2, 3], [4, 5]], compute_distance_matrix(coords), demands, capacity=10)
+    memory = TabuMemory(tenure=5)
+
+    # Moving customer 1 into the second route empties the first one, which renumbers the others.
+    move = Move("relocate", 0, 0, 1, 1, 1)
+    memory.add(state.move_attributes(move), iteration=0)
+    state.apply(move)
+    assert state.routes == [[2, 1, 3], [4, 5]]
+
+    # Moving 1 back next to the depot is tabu, moves keeping its edges removed are not.
+    undo = Move("relocate", 0, 1, 0, 0, 1)
+    assert memory.is_tabu(state.move_attributes(undo), iteration=1)
+    assert not memory.is_tabu(state.move_attributes(Move("swap", 0, 0, 1, 0, 1)), iteration=1)
+    assert not memory.is_tabu(state.move_attributes(undo), iteration=6)